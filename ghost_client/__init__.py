@@ -1 +1,3 @@
 from .api import Ghost, GhostException
+from .config import ClientConfig
+from .errors import CircuitOpenException
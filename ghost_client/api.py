@@ -1,15 +1,43 @@
 import os
-import mimetypes
 
 import six
-import requests
-import jwt	# pip install pyjwt
-import os
+from six.moves.urllib.parse import quote
+import threading
+import time
 from datetime import datetime as date
 
 from .models import Controller, PostController
-from .helpers import refresh_session_if_necessary
+from .helpers import refresh_session_if_necessary, reset_after_fork
 from .errors import GhostException
+from .config import ClientConfig
+from .metrics import Metrics
+
+# `requests`, `jwt` (pip install pyjwt), `mimetypes` and the optional
+# components are imported on first use, to keep the import of the
+# package and the construction of clients fast for short-lived processes
+
+
+_ANY_TOKEN = object()
+
+
+class _LazyController(object):
+    """
+    Creates the controller of a resource type
+    on the first access of it on a client.
+    """
+
+    def __init__(self, name, factory):
+        self.name = name
+        self.factory = factory
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        # cached on the instance, which takes precedence from now on
+        controller = instance.__dict__[self.name] = self.factory(instance)
+
+        return controller
 
 
 class Ghost(object):
@@ -65,10 +93,29 @@ class Ghost(object):
         print(posts.total)
         print(posts.pages)
 
+        # or only count them
+        print(ghost.posts.count(status='draft'))
+
+        # or walk a large listing with keyset (cursor) pagination
+        for post in ghost.posts.iterate(status='all', limit=50):
+            print(post.title)
+
+        # with the page size tuned to the measured latency and size of the pages
+        for post in ghost.posts.iterate(status='all', limit='auto'):
+            print(post.title)
+
         # update a post & tag
         updated_post = ghost.posts.update(post.id, title='Updated title')
         updated_tag = ghost.tags.update(tag.id, name='Updated tag')
 
+        # or change fields on a fetched item and send only those
+        post.title = 'Changed title'
+        post.save()
+
+        # create or update by slug, skipping the write when nothing changed
+        result = ghost.posts.upsert('custom-slug', title='Example post', markdown='')
+        print(result.action)  # created, updated or skipped
+
         # note: creating, updating and deleting a user is not allowed by the API
 
         # access fields as properties
@@ -89,6 +136,13 @@ class Ghost(object):
     The logged in credentials will be saved in memory and
     on HTTP 401 errors the client will attempt
     to re-authenticate once automatically.
+    A single client can be shared between threads:
+    connections are pooled (see `pool_size`), and only one
+    thread re-authenticates when the access token expires.
+    After a fork, the child process gets new connections and locks
+    but keeps the server version and the access token, and clients
+    can be pickled to send them to the workers of a process pool
+    (see `config()`).
 
     Responses are wrapped in `models.ModelList` and `models.Model`
     types to allow pagination and retrieving fields as properties.
@@ -99,11 +153,27 @@ class Ghost(object):
     The default version to report when cannot be fetched.
     """
 
+    TOKEN_REFRESH_MARGIN = 30
+    """
+    The number of seconds before its expiry to replace the access token at.
+    """
+
     def __init__(
             self, base_url, version='auto',
             client_id=None, client_secret=None,
             access_token=None,
-            admin_key=None
+            admin_key=None,
+            cache=None,
+            circuit_breaker=None,
+            hedging=None,
+            scheduler=None,
+            pool_size=10,
+            transport=None,
+            metrics=None,
+            accept_encoding=None,
+            compress_requests=None,
+            projection=None,
+            images=None
     ):
         """
         Creates a new Ghost API client.
@@ -112,19 +182,93 @@ class Ghost(object):
         :param version: The server version to use (default: `auto`)
         :param access_token: Self-supplied access token (optional)
         :param admin_key: admin API key
+        :param cache: A `cache.ResponseCache` for GET responses, or a
+            `shared_cache.SharedResponseCache` to share them between processes (optional)
+        :param circuit_breaker: A `breaker.CircuitBreaker` to send requests through,
+            or `True` to use the one shared for the server (optional)
+        :param hedging: A `hedging.HedgingPolicy` for GET requests,
+            or `True` to use one with the default settings (optional)
+        :param scheduler: A `scheduler.Scheduler` to prioritize requests with,
+            or `True` to use one with the default settings (optional)
+        :param pool_size: The number of connections to keep open to the server
+        :param transport: The `transport.Transport` to send requests with, for example
+            one shared with other clients (default: a `transport.RequestsTransport`)
+        :param metrics: A `metrics.Metrics` registry shared with other clients (optional)
+        :param accept_encoding: The response encodings to accept in order of preference
+            (default: `zstd`, `br`, `gzip` and `deflate` when they can be decoded)
+        :param compress_requests: The minimum size in bytes of JSON request bodies
+            to compress with gzip, or `None` to never compress them
+        :param projection: A `projection.AdaptiveProjection` to request only the fields
+            read from listed items with, or `True` to use one with the default settings (optional)
+        :param images: An `images.ImageOptimizer` to prepare uploaded images with,
+            or `True` to use one with the default settings (optional)
         """
 
+        self.site_url = base_url
         self.base_url = '%s/ghost/api/admin' % base_url
         self._version = version
 
         self._client_id = client_id
         self._client_secret = client_secret
         self._access_token = access_token
+        self._token_expires_at = None
         self._admin_key = admin_key
 
-        self.posts = PostController(self)
-        self.tags = Controller(self, 'tags')
-        self.users = Controller(self, 'users')
+        self.pool_size = pool_size
+
+        if transport is None:
+            from .transport import RequestsTransport
+            transport = RequestsTransport(pool_size=pool_size)
+
+        self.transport = transport
+
+        self._after_fork()
+        reset_after_fork(self)
+
+        from .compression import accept_encoding as accepted
+
+        self.accept_encoding = accepted(accept_encoding)
+        self.compress_requests = compress_requests
+
+        self.cache = cache
+        self.metrics = metrics or Metrics()
+
+        if circuit_breaker is True:
+            from .breaker import CircuitBreaker
+            circuit_breaker = CircuitBreaker.for_url(self.base_url, metrics=self.metrics)
+
+        if circuit_breaker is not None:
+            circuit_breaker.register(self.metrics)
+
+        self.circuit_breaker = circuit_breaker
+
+        if hedging is True:
+            from .hedging import HedgingPolicy
+            hedging = HedgingPolicy(metrics=self.metrics)
+
+        self.hedging = hedging
+
+        if scheduler is True:
+            from .scheduler import Scheduler
+            scheduler = Scheduler(metrics=self.metrics)
+
+        self.scheduler = scheduler
+
+        if projection is True:
+            from .projection import AdaptiveProjection
+            projection = AdaptiveProjection()
+
+        self.projection = projection
+
+        if images is True:
+            from .images import ImageOptimizer
+            images = ImageOptimizer()
+
+        self.images = images
+
+    posts = _LazyController('posts', PostController)
+    tags = _LazyController('tags', lambda ghost: Controller(ghost, 'tags'))
+    users = _LazyController('users', lambda ghost: Controller(ghost, 'users'))
 
     @classmethod
     def from_sqlite(cls, database_path, base_url, version='auto', client_id='ghost-admin'):
@@ -167,6 +311,45 @@ class Ghost(object):
         finally:
             connection.close()
 
+    @classmethod
+    def from_config(cls, config):
+        """
+        Initialize a new Ghost API client from picklable settings.
+
+        :param config: The `config.ClientConfig` settings
+        :return: A new Ghost API client instance
+        """
+
+        return config.create()
+
+    def config(self):
+        """
+        :return: The picklable `config.ClientConfig` settings of this client,
+            to create equivalent clients in other processes with
+        """
+
+        return ClientConfig(
+            self.site_url, version=self._version,
+            client_id=self._client_id, client_secret=self._client_secret,
+            access_token=self._access_token, token_expires_at=self._token_expires_at,
+            admin_key=self._admin_key,
+            cache_ttl=self.cache.ttl if self.cache is not None else None,
+            cache=self.cache,
+            transport=self.transport,
+            circuit_breaker=self.circuit_breaker is not None,
+            hedging=self.hedging is not None,
+            scheduler=self.scheduler is not None,
+            pool_size=self.pool_size,
+            accept_encoding=self.accept_encoding,
+            compress_requests=self.compress_requests,
+            projection=self.projection is not None,
+            images=self.images is not None
+        )
+
+    def __reduce__(self):
+        # pickled as its settings, see `config()`
+        return ClientConfig.create, (self.config(),)
+
     @property
     def version(self):
         """
@@ -177,33 +360,44 @@ class Ghost(object):
         if self._version != 'auto':
             return self._version
 
-        if self._version == 'auto':
-            try:
-                data = self.execute_get('site/')
-                self._version = data['site']['version']
-            except GhostException:
-                return self.DEFAULT_VERSION
+        with self._version_lock:
+            if self._version == 'auto':
+                try:
+                    data = self.execute_get('site/')
+                    self._version = data['site']['version']
+                except GhostException:
+                    return self.DEFAULT_VERSION
 
         return self._version
 
-
-    def refresh_session(self):
+    def refresh_session(self, stale_token=_ANY_TOKEN):
         """
         Re-authenticate using the refresh token if available.
         Otherwise log in using the username and password
         if it was used to authenticate initially.
 
+        Only one thread re-authenticates at a time, and when the
+        `stale_token` that failed was already replaced by another
+        thread in the meantime, the new token is used as it is.
+
+        :param stale_token: The token that was found to be invalid (optional)
         :return: The authentication response or `None` if not available
         """
 
-        return self._authenticate(
-            grant_type='refresh_token',
-            client_id=self._client_id,
-            client_secret=self._client_secret,
-            admin_key=self._admin_key
-        )
+        with self._auth_lock:
+            # compared by identity, as tokens issued within the same second are equal
+            if stale_token is not _ANY_TOKEN and stale_token is not self._access_token:
+                return self._access_token  # refreshed by another thread
+
+            return self._authenticate(
+                grant_type='refresh_token',
+                client_id=self._client_id,
+                client_secret=self._client_secret,
+                admin_key=self._admin_key
+            )
 
     def _authenticate(self, **kwargs):
+        import jwt
 
         # Split the key into ID and SECRET
         id, secret = self._admin_key.split(':')
@@ -222,26 +416,22 @@ class Ghost(object):
         token = jwt.encode(payload, bytes.fromhex(secret), algorithm='HS256', headers=header)
         #print(token)
 
-        if os.name == 'nt':
-            # Windows version
-            token_str = token
-        else:
-            # Linux version
-            # print('Ghost {}'.format(token.decode("utf-8")))
+        if isinstance(token, bytes):
+            # older versions of PyJWT
             token_str = token.decode("utf-8")
+        else:
+            token_str = token
 
-
+        self._token_expires_at = payload['exp']
         self._access_token = token_str
 
         return token_str
 
-
-
-
     def upload(self, file_obj=None, file_path=None, name=None, data=None):
         """
         Upload an image and return its path on the server.
         Either `file_obj` or `file_path` or `name` and `data` has to be specified.
+        Images are optimized before uploading when the client has an `images` optimizer.
 
         :param file_obj: A file object to upload
         :param file_path: A file path to upload from
@@ -270,9 +460,16 @@ class Ghost(object):
             )
 
         try:
+            upload = content
+
+            if self.images is not None:
+                upload = self._optimize_image(file_name, content)
+
+            import mimetypes  # loads the types database on the first upload
+
             content_type, _ = mimetypes.guess_type(file_name)
 
-            file_arg = (file_name, content, content_type)
+            file_arg = (file_name, upload, content_type)
 
             response = self.execute_post('uploads/', files={'uploadimage': file_arg})
 
@@ -282,6 +479,15 @@ class Ghost(object):
             if close:
                 content.close()
 
+    def _optimize_image(self, file_name, content):
+        data = content if isinstance(content, bytes) else content.read()
+        optimized = self.images.optimize(file_name, data)
+
+        self.metrics.increment('images.bytes', len(data), stage='source')
+        self.metrics.increment('images.bytes', len(optimized), stage='optimized')
+
+        return optimized
+
     @refresh_session_if_necessary
     def execute_get(self, resource, **kwargs):
         """
@@ -298,6 +504,7 @@ class Ghost(object):
         headers = kwargs.pop('headers', dict())
 
         headers['Accept'] = 'application/json'
+        headers['Accept-Encoding'] = self.accept_encoding
         headers['Content-Type'] = 'application/json'
 
         if kwargs:
@@ -305,24 +512,38 @@ class Ghost(object):
 
             for key, value in kwargs.items():
                 if hasattr(value, '__iter__') and type(value) not in six.string_types:
-                    url = '%s%s%s=%s' % (url, separator, key, ','.join(value))
+                    value = ','.join(value)
 
-                else:
-                    url = '%s%s%s=%s' % (url, separator, key, value)
+                url = '%s%s%s=%s' % (url, separator, key, quote(str(value), safe=',:'))
 
                 separator = '&'
 
-        if self._access_token:
-            headers['Authorization'] = 'Ghost %s' % self._access_token
+        if self.cache is not None:
+            cached = self.cache.get(url)
+
+            if cached is not None:
+                return cached
+
+        token = self._current_token()
 
-        response = requests.get(url, headers=headers)
+        if token:
+            headers['Authorization'] = 'Ghost %s' % token
+
+        response = self._schedule(self._hedged_send, self.transport.get, url, headers=headers)
+
+        self._count_transfer(response)
 
         # print(response.content)
 
         if response.status_code // 100 != 2:
             raise GhostException(response.status_code, response.json().get('errors', []))
 
-        return response.json()
+        data = response.json()
+
+        if self.cache is not None:
+            self.cache.set(url, resource, response.content, data)
+
+        return data
 
     def execute_post(self, resource, **kwargs):
         """
@@ -334,7 +555,7 @@ class Ghost(object):
         :return: The HTTP response as JSON or `GhostException` if unsuccessful
         """
 
-        return self._request(resource, requests.post, **kwargs).json()
+        return self._request(resource, self.transport.post, **kwargs).json()
 
     def execute_put(self, resource, **kwargs):
         """
@@ -346,7 +567,7 @@ class Ghost(object):
         :return: The HTTP response as JSON or `GhostException` if unsuccessful
         """
 
-        return self._request(resource, requests.put, **kwargs).json()
+        return self._request(resource, self.transport.put, **kwargs).json()
 
     def execute_delete(self, resource, **kwargs):
         """
@@ -358,7 +579,7 @@ class Ghost(object):
         :param kwargs: Additional parameters for the HTTP call (`request` library)
         """
 
-        self._request(resource, requests.delete, **kwargs)
+        self._request(resource, self.transport.delete, **kwargs)
 
     @refresh_session_if_necessary
     def _request(self, resource, request, **kwargs):
@@ -374,18 +595,90 @@ class Ghost(object):
 
         #if 'json' in kwargs:
         headers['Accept'] = 'application/json'
+        headers['Accept-Encoding'] = self.accept_encoding
         headers['Content-Type'] = 'application/json'
 
-        if self._access_token:
-            headers['Authorization'] = 'Ghost %s' % self._access_token
+        body_size = None
+
+        if 'json' in kwargs and self.compress_requests is not None:
+            from .compression import encode_json
+
+            body, encoding, body_size = encode_json(kwargs.pop('json'), threshold=self.compress_requests)
+
+            if encoding:
+                headers['Content-Encoding'] = encoding
+
+            kwargs['data'] = body
+
+        token = self._current_token()
+
+        if token:
+            headers['Authorization'] = 'Ghost %s' % token
 
         #print(url)
 
-        response = request(url, headers=headers, **kwargs)
+        response = self._schedule(self._send, request, url, headers=headers, **kwargs)
+
+        self._count_transfer(response, body_size)
 
         #print(response.content)
 
         if response.status_code // 100 != 2:
             raise GhostException(response.status_code, response.json().get('errors', []))
 
+        if self.cache is not None:
+            # drop what this change may have made stale
+            parts = resource.strip('/').split('/')
+            self.cache.invalidate(parts[0], id=parts[1] if len(parts) > 1 else None)
+
         return response
+
+    def _count_transfer(self, response, body_size=None):
+        # `wire` counts the bytes as transferred, `body` as (de)compressed
+        received = self.transport.received_bytes(response)
+
+        if received is not None:
+            self.metrics.increment('transfer.received', received, stage='wire')
+
+        self.metrics.increment('transfer.received', len(response.content), stage='body')
+        self._local.response_size = len(response.content)
+
+        sent = self.transport.sent_bytes(response)
+
+        if sent is not None:
+            self.metrics.increment('transfer.sent', sent, stage='wire')
+            self.metrics.increment('transfer.sent', sent if body_size is None else body_size, stage='body')
+
+    def _current_token(self):
+        token, expires_at = self._access_token, self._token_expires_at
+
+        if token and expires_at is not None and time.time() >= expires_at - self.TOKEN_REFRESH_MARGIN:
+            # refresh ahead of the expiry instead of waiting for 401s
+            token = self.refresh_session(stale_token=token)
+
+        return token
+
+    def _after_fork(self):
+        # keeps the version and the token, which are still valid,
+        # the transport replaces its connections itself
+        self._auth_lock = threading.Lock()
+        self._version_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _schedule(self, send, *args, **kwargs):
+        if self.scheduler is not None:
+            return self.scheduler.call(send, *args, **kwargs)
+
+        return send(*args, **kwargs)
+
+    def _hedged_send(self, request, url, **kwargs):
+        if self.hedging is not None:
+            return self.hedging.call(self._send, request, url, **kwargs)
+
+        return self._send(request, url, **kwargs)
+
+    def _send(self, request, url, **kwargs):
+        if self.circuit_breaker is not None:
+            return self.circuit_breaker.call(request, url, **kwargs)
+
+        return request(url, **kwargs)
@@ -0,0 +1,229 @@
+import os
+import threading
+import time
+from collections import deque
+
+from .errors import CircuitOpenException
+from .helpers import reset_after_fork
+from .metrics import Metrics
+
+
+class CircuitBreaker(object):
+    """
+    Circuit breaker for the requests sent to a Ghost server.
+
+    The outcomes of the recent requests are kept in a sliding window.
+    When the rate of failures (connection errors, timeouts and 5xx
+    responses) in it reaches `failure_rate`, the circuit opens and
+    requests fail fast with `errors.CircuitOpenException` without
+    reaching the server. After `reset_timeout` seconds the circuit
+    becomes half-open, and lets a few probe requests through:
+    it closes again if they succeed, and re-opens if any fails.
+    Requests sent before the circuit became half-open do not count as
+    probes when they complete.
+
+    The state is reported as a gauge to the metrics of each client
+    using the breaker (see `register`), the counters of calls,
+    rejections and transitions to the `metrics` of the breaker,
+    which are shared by the clients of the server with `for_url`.
+
+    Sample usage:
+
+        ghost = Ghost('http://localhost:2368', admin_key='...', circuit_breaker=True)
+
+        # or with custom settings, shared by the clients of the same server
+        breaker = CircuitBreaker.for_url('http://localhost:2368', failure_rate=0.3)
+        ghost = Ghost('http://localhost:2368', admin_key='...', circuit_breaker=breaker)
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    _registry = dict()
+    _registry_lock = threading.Lock()
+
+    def __init__(
+            self, url, failure_rate=0.5, window=20, min_calls=10,
+            reset_timeout=30, probes=1, metrics=None
+    ):
+        """
+        Creates a new circuit breaker.
+
+        :param url: The base URL of the server
+        :param failure_rate: The ratio of failed requests to open the circuit at
+        :param window: The number of recent requests to calculate the ratio from
+        :param min_calls: The minimum number of requests before the circuit can open
+        :param reset_timeout: The number of seconds to wait before probing the server
+        :param probes: The number of successful probes needed to close the circuit
+        :param metrics: The `metrics.Metrics` to report to (optional)
+        """
+
+        self.url = url
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.probes = probes
+        self.metrics = metrics or Metrics()
+
+        self._outcomes = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = None
+        self._probing = 0
+        self._succeeded_probes = 0
+        self._transitions = 0
+        self._lock = threading.Lock()
+        reset_after_fork(self)
+
+        self.register(self.metrics)
+
+    @classmethod
+    def for_url(cls, url, **kwargs):
+        """
+        Get the circuit breaker shared by the clients
+        of a server, creating it on first use.
+
+        :param url: The base URL of the server
+        :param kwargs: The settings to create it with (see the constructor)
+        :return: The circuit breaker for the server
+        """
+
+        with cls._registry_lock:
+            if url not in cls._registry:
+                cls._registry[url] = cls(url, **kwargs)
+
+            return cls._registry[url]
+
+    def register(self, metrics):
+        """
+        Report the state of the circuit to the metrics of a client.
+
+        :param metrics: The `metrics.Metrics` of the client
+        """
+
+        metrics.gauge('circuit_breaker.state', lambda: self.state, url=self.url)
+
+    @property
+    def state(self):
+        """
+        :return: The current state: `closed`, `open` or `half-open`
+        """
+
+        with self._lock:
+            return self._current_state()
+
+    def call(self, request, *args, **kwargs):
+        """
+        Send a request through the circuit breaker.
+
+        :param request: The function sending the request (ie. `requests.get`)
+        :param args: The positional arguments of the function
+        :param kwargs: The keyword arguments of the function
+        :return: The response of the request
+        """
+
+        import requests
+
+        probe = self._before()
+        success = None
+
+        try:
+            response = request(*args, **kwargs)
+            success = getattr(response, 'status_code', 200) < 500
+
+        except requests.RequestException:
+            success = False
+            raise
+
+        finally:
+            if success is None:
+                # not an outcome of the server (ie. interrupted), only the probe is released
+                self._release(probe)
+
+            else:
+                self._after(success, probe)
+
+        return response
+
+    def _after_fork(self):
+        # the state is kept, as the server is the same
+        self._lock = threading.Lock()
+        self._probing = 0
+
+    @classmethod
+    def _reset_registry_lock(cls):
+        cls._registry_lock = threading.Lock()
+
+    def _current_state(self):
+        if self._state == self.OPEN and time.time() - self._opened_at >= self.reset_timeout:
+            self._transition(self.HALF_OPEN)
+
+        return self._state
+
+    def _before(self):
+        # returns the number of the half-open period a probe was admitted in, or `None`
+        with self._lock:
+            state = self._current_state()
+
+            if state == self.OPEN or (state == self.HALF_OPEN and self._probing >= self.probes):
+                self.metrics.increment('circuit_breaker.rejected', url=self.url)
+
+                retry_after = self.reset_timeout - (time.time() - self._opened_at) \
+                    if state == self.OPEN else 0.0
+
+                raise CircuitOpenException(self.url, max(retry_after, 0.0))
+
+            if state == self.HALF_OPEN:
+                self._probing += 1
+                return self._transitions
+
+    def _release(self, probe):
+        with self._lock:
+            if probe is not None and probe == self._transitions and self._state == self.HALF_OPEN:
+                self._probing -= 1
+
+    def _after(self, success, probe=None):
+        with self._lock:
+            self.metrics.increment(
+                'circuit_breaker.calls', url=self.url, outcome='success' if success else 'failure'
+            )
+
+            # probes of an earlier half-open period are counted like other requests
+            if probe is not None and probe == self._transitions and self._state == self.HALF_OPEN:
+                self._probing -= 1
+
+                if not success:
+                    self._open()
+
+                else:
+                    self._succeeded_probes += 1
+
+                    if self._succeeded_probes >= self.probes:
+                        self._outcomes.clear()
+                        self._transition(self.CLOSED)
+
+                return
+
+            self._outcomes.append(success)
+
+            if self._state == self.CLOSED and len(self._outcomes) >= self.min_calls:
+                failures = self._outcomes.count(False)
+
+                if failures >= self.failure_rate * len(self._outcomes):
+                    self._open()
+
+    def _open(self):
+        self._opened_at = time.time()
+        self._transition(self.OPEN)
+
+    def _transition(self, state):
+        self._state = state
+        self._probing = 0
+        self._succeeded_probes = 0
+        self._transitions += 1
+
+        self.metrics.increment('circuit_breaker.transitions', url=self.url, state=state)
+
+
+if hasattr(os, 'register_at_fork'):  # Python 3.7+
+    os.register_at_fork(after_in_child=CircuitBreaker._reset_registry_lock)
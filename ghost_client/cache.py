@@ -0,0 +1,326 @@
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .errors import GhostException
+from .helpers import reset_after_fork
+
+
+class ResponseCache(object):
+    """
+    In-memory cache for the responses of `Ghost.execute_get`.
+
+    Entries are kept for `ttl` seconds and are tagged with the
+    type, IDs and slugs of the resources they contain (including the
+    ones related to them, like the tags of posts), so that they can be
+    invalidated precisely when a resource changes, for example by
+    a `webhooks.WebhookReceiver`.
+
+    The responses are kept deserialized and returned without a copy,
+    so hits do not parse them again. The controllers wrap each item
+    in a new `models.Model`, so changing the fields of the items does
+    not change the cached responses, but the nested values (like the
+    `tags` of posts) are shared, and are to be replaced, not modified.
+
+    Sample usage:
+
+        ghost = Ghost('http://localhost:2368', admin_key='...',
+                      cache=ResponseCache(ttl=3600))
+    """
+
+    RELATED_TYPES = ('tags', 'authors', 'author', 'primary_tag', 'primary_author')
+    """
+    Fields of the responses holding related resources.
+    """
+
+    _RESOURCE = re.compile(r'^(?P<type>[^/]+)/(?:slug/(?P<slug>[^/]+)/|(?P<id>[^/]+)/)?$')
+
+    def __init__(self, ttl=60, max_entries=1024):
+        """
+        Creates a new cache.
+
+        :param ttl: The number of seconds to keep entries for
+        :param max_entries: The maximum number of entries
+            to keep before evicting the least recently used ones
+        """
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._after_fork()
+        reset_after_fork(self)
+
+    def get(self, key):
+        """
+        :param key: The key of the entry (the URL of the request)
+        :return: The cached response or `None` if missing or expired
+        """
+
+        return self.get_with_age(key)[0]
+
+    def get_with_age(self, key):
+        """
+        :param key: The key of the entry (the URL of the request)
+        :return: The cached response and its age in seconds,
+            or `(None, None)` if missing or expired
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None, None
+
+            age = time.time() - entry[0]
+
+            if age > self.ttl:
+                del self._entries[key]
+                return None, None
+
+            self._entries.move_to_end(key)
+
+        return entry[1], age
+
+    def set(self, key, resource, body, data):
+        """
+        Store a response.
+
+        :param key: The key of the entry (the URL of the request)
+        :param resource: The resource the request was sent for
+        :param body: The serialized response body (not kept by this cache)
+        :param data: The deserialized response, kept as it is
+        """
+
+        tags = self._tags(resource, data)
+
+        with self._lock:
+            self._entries[key] = (time.time(), data, tags)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        """
+        Drop a single entry if present.
+
+        :param key: The key of the entry (the URL of the request)
+        """
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self, type_name=None, id=None, slug=None):
+        """
+        Drop the entries containing the given resource, and the
+        listings of its type, which may now have different results.
+        Drops everything when no type is given.
+
+        :param type_name: The type of the resource (ie. `posts`)
+        :param id: The ID of the resource
+        :param slug: The slug of the resource
+        """
+
+        with self._lock:
+            if type_name is None:
+                self._entries.clear()
+                return
+
+            targets = set([(type_name, None)])
+
+            if id:
+                targets.add((type_name, 'id:%s' % id))
+
+            if slug:
+                targets.add((type_name, 'slug:%s' % slug))
+
+            for key in [k for k, entry in self._entries.items() if entry[2] & targets]:
+                del self._entries[key]
+
+    def clear(self):
+        """
+        Drop all entries.
+        """
+
+        self.invalidate()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __reduce__(self):
+        # pickled as its settings, empty in the other process
+        return type(self), (self.ttl, self.max_entries)
+
+    def _after_fork(self):
+        # the entries are kept warm for the child process
+        self._lock = threading.Lock()
+
+    def _tags(self, resource, data):
+        match = self._RESOURCE.match(resource)
+
+        if not match:
+            return frozenset()
+
+        type_name = match.group('type')
+        tags = set()
+
+        if match.group('id'):
+            tags.add((type_name, 'id:%s' % match.group('id')))
+
+        elif match.group('slug'):
+            tags.add((type_name, 'slug:%s' % match.group('slug')))
+
+        else:
+            tags.add((type_name, None))
+
+        for item in data.get(type_name, []) if isinstance(data, dict) else []:
+            tags.update(self._item_tags(type_name, item))
+
+            for field in self.RELATED_TYPES:
+                related = item.get(field)
+                related_type = 'tags' if 'tag' in field else 'users'
+
+                for other in related if isinstance(related, list) else [related]:
+                    tags.update(self._item_tags(related_type, other))
+
+        return frozenset(tags)
+
+    @staticmethod
+    def _item_tags(type_name, item):
+        if isinstance(item, dict):
+            if item.get('id'):
+                yield type_name, 'id:%s' % item['id']
+
+            if item.get('slug'):
+                yield type_name, 'slug:%s' % item['slug']
+
+
+class StaleWhileRevalidate(object):
+    """
+    Read policy for controllers (see `models.Controller.with_read_policy`)
+    that keeps serving the last known good responses while the server
+    is slow or unavailable.
+
+    Responses younger than `soft_ttl` are served from memory.
+    Older ones are still returned immediately and refreshed on a
+    background thread, or with `background=False`, refreshed when
+    read, serving the stale response if that fails with a connection
+    error or a 5xx response. Responses older than `hard_ttl`
+    are never served.
+
+    Sample usage:
+
+        posts = ghost.posts.with_read_policy(
+            StaleWhileRevalidate(soft_ttl=30, hard_ttl=3600)
+        )
+
+        post = posts.get(slug='welcome')
+    """
+
+    def __init__(self, soft_ttl=60, hard_ttl=3600, background=True, max_entries=1024, workers=2):
+        """
+        Creates a new read policy.
+
+        :param soft_ttl: The number of seconds after which responses are refreshed
+        :param hard_ttl: The number of seconds after which responses are not served anymore
+        :param background: Whether to refresh stale responses on a background thread,
+            otherwise they are refreshed when read, falling back to them on errors
+        :param max_entries: The maximum number of responses to keep
+        :param workers: The number of background threads refreshing responses
+        """
+
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.background = background
+
+        self.cache = ResponseCache(ttl=hard_ttl, max_entries=max_entries)
+
+        self.workers = workers
+
+        self._after_fork()
+        reset_after_fork(self)
+
+    def fetch(self, resource, params, load):
+        """
+        Read a response through the policy.
+
+        :param resource: The resource the request is for
+        :param params: The parameters of the request
+        :param load: A callable fetching the response from the server
+        :return: The fresh or stale response
+        """
+
+        key = '%s?%s' % (resource, json.dumps(params, sort_keys=True, default=list))
+
+        data, age = self.cache.get_with_age(key)
+
+        if data is None:
+            return self._load(key, resource, load)
+
+        if age > self.soft_ttl:
+            if self.background:
+                self._refresh_later(key, resource, load)
+
+            else:
+                try:
+                    return self._load(key, resource, load)
+
+                except Exception as ex:
+                    if not self._is_transient(ex):
+                        raise
+
+        return data
+
+    def invalidate(self, type_name=None, id=None, slug=None):
+        """
+        Drop the responses containing a resource
+        (see `ResponseCache.invalidate`).
+        """
+
+        self.cache.invalidate(type_name, id=id, slug=slug)
+
+    def _after_fork(self):
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers) if self.background else None
+
+    def _load(self, key, resource, load):
+        data = load()
+        self.cache.set(key, resource, None, data)
+        return data
+
+    def _refresh_later(self, key, resource, load):
+        with self._lock:
+            if key in self._refreshing:
+                return
+
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._load(key, resource, load)
+
+            except Exception as ex:
+                if not self._is_transient(ex):
+                    self.cache.discard(key)  # like deleted resources
+
+                # otherwise keep serving the stale response
+
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._pool.submit(refresh)
+
+    @staticmethod
+    def _is_transient(ex):
+        if isinstance(ex, GhostException):
+            return isinstance(ex.code, int) and ex.code >= 500
+
+        return isinstance(ex, (requests.ConnectionError, requests.Timeout))
@@ -0,0 +1,291 @@
+import base64
+import gzip
+import hashlib
+import json
+import threading
+import time
+
+from six.moves.urllib.parse import urlsplit
+
+from .helpers import reset_after_fork
+from .transport import Transport
+
+
+CASSETTE_VERSION = 1
+"""
+The version of the cassette format written by `RecordingTransport`.
+"""
+
+
+class RecordingTransport(Transport):
+    """
+    Records the requests sent through another transport and their
+    responses, with the time each one took, to replay them later
+    with a `ReplayTransport` without a server.
+
+    The cassette is a gzipped file of JSON lines. The requests are
+    recorded with the path and query of their URL, so they can be
+    replayed against any base URL, but without their headers, so
+    access tokens are not written to disk. Request bodies are kept
+    as their size and a hash. Connection errors and timeouts are
+    recorded as well.
+
+    Sample usage:
+
+        transport = RecordingTransport('slow-listing.cassette')
+        ghost = Ghost('https://blog.example.com', admin_key='...', transport=transport)
+
+        for post in ghost.posts.iterate(limit='auto'):
+            ...
+
+        transport.save()
+    """
+
+    def __init__(self, path, transport=None):
+        """
+        Creates a new recording transport.
+
+        :param path: The file to save the cassette to
+        :param transport: The transport to send the requests with
+            (default: a new `transport.RequestsTransport`)
+        """
+
+        if transport is None:
+            from .transport import RequestsTransport
+            transport = RequestsTransport()
+
+        self.path = path
+        self.transport = transport
+
+        self.entries = list()
+        """ The recorded requests and responses """
+
+        self._after_fork()
+        reset_after_fork(self)
+
+    def request(self, method, url, **kwargs):
+        entry = {
+            'method': method,
+            'url': _path(url),
+            'request': _digest(kwargs)
+        }
+
+        started = time.time()
+
+        try:
+            response = self.transport.request(method, url, **kwargs)
+
+        except Exception as ex:
+            entry['elapsed'] = time.time() - started
+            entry['error'] = type(ex).__name__
+            entry['message'] = str(ex)
+
+            self._add(entry)
+            raise
+
+        entry['elapsed'] = time.time() - started
+        entry['status'] = response.status_code
+        entry['headers'] = dict(
+            (name, value) for name, value in response.headers.items()
+            if name.lower() not in ('content-encoding', 'content-length', 'set-cookie', 'transfer-encoding')
+        )
+        entry['body'] = base64.b64encode(response.content).decode('ascii')
+        entry['received'] = self.transport.received_bytes(response)
+        entry['sent'] = self.transport.sent_bytes(response)
+
+        self._add(entry)
+
+        return response
+
+    def received_bytes(self, response):
+        return self.transport.received_bytes(response)
+
+    def sent_bytes(self, response):
+        return self.transport.sent_bytes(response)
+
+    def save(self, path=None):
+        """
+        Write the recorded requests to the cassette.
+
+        :param path: The file to write to (default: `path`)
+        """
+
+        with self._lock:
+            entries = list(self.entries)
+
+        with gzip.open(path or self.path, 'wb') as cassette:
+            cassette.write(_line({'version': CASSETTE_VERSION}))
+
+            for entry in entries:
+                cassette.write(_line(entry))
+
+    def close(self):
+        """
+        Save the cassette and close the connections.
+        """
+
+        self.save()
+        self.transport.close()
+
+    def __reduce__(self):
+        # the recording stays in this process, others send through the wrapped transport
+        return self.transport.__reduce__()
+
+    def _add(self, entry):
+        with self._lock:
+            self.entries.append(entry)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+
+class ReplayTransport(Transport):
+    """
+    Serves the responses recorded by a `RecordingTransport`.
+
+    Requests are matched by their method and the path and query of
+    their URL (and optionally their body), and the responses recorded
+    for them are served in their recorded order, the last one repeated
+    when the request is sent more times than it was recorded.
+    Responses are returned at once, or after the recorded time
+    multiplied by `latency_scale`, so the overhead of the client, and
+    the effect of concurrency changes, can be measured repeatably.
+
+    Sample usage:
+
+        transport = ReplayTransport('slow-listing.cassette', latency_scale=1.0)
+        ghost = Ghost('https://blog.example.com', admin_key='...', transport=transport)
+
+        for post in ghost.posts.iterate(limit='auto'):
+            ...
+    """
+
+    def __init__(self, path, latency_scale=None, match_body=False):
+        """
+        Creates a new replaying transport.
+
+        :param path: The cassette to replay
+        :param latency_scale: The multiplier of the recorded times to wait
+            before responding, like `1.0` for the recorded latency,
+            or `None` to respond immediately
+        :param match_body: Whether to match the bodies of requests too
+        """
+
+        self.path = path
+        self.latency_scale = latency_scale
+        self.match_body = match_body
+
+        self._recorded = dict()
+        self._served = dict()
+
+        with gzip.open(path, 'rb') as cassette:
+            header = json.loads(cassette.readline().decode('utf-8'))
+
+            if header.get('version') != CASSETTE_VERSION:
+                from .errors import GhostException
+                raise GhostException(500, 'Unsupported cassette version: %s' % header.get('version'))
+
+            for line in cassette:
+                entry = json.loads(line.decode('utf-8'))
+                self._recorded.setdefault(self._key(entry), list()).append(entry)
+
+        self._after_fork()
+        reset_after_fork(self)
+
+    def request(self, method, url, **kwargs):
+        entry = self._next({'method': method, 'url': _path(url), 'request': _digest(kwargs)})
+
+        if self.latency_scale:
+            time.sleep(entry['elapsed'] * self.latency_scale)
+
+        if 'error' in entry:
+            import requests
+            raise getattr(requests, entry['error'], requests.RequestException)(entry['message'])
+
+        return ReplayedResponse(entry)
+
+    def received_bytes(self, response):
+        return response.entry.get('received')
+
+    def sent_bytes(self, response):
+        return response.entry.get('sent')
+
+    def __reduce__(self):
+        return ReplayTransport, (self.path, self.latency_scale, self.match_body)
+
+    def _next(self, request):
+        key = self._key(request)
+
+        with self._lock:
+            entries = self._recorded.get(key)
+
+            if not entries:
+                from .errors import GhostException
+                raise GhostException(500, 'No recorded response for %s %s' % (request['method'], request['url']))
+
+            index = self._served.get(key, 0)
+            self._served[key] = index + 1
+
+            return entries[min(index, len(entries) - 1)]
+
+    def _key(self, entry):
+        if self.match_body:
+            return entry['method'], entry['url'], entry['request']['sha1']
+
+        return entry['method'], entry['url']
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+
+class ReplayedResponse(object):
+    """
+    A response served by a `ReplayTransport`.
+    """
+
+    def __init__(self, entry):
+        from requests.structures import CaseInsensitiveDict
+
+        self.entry = entry
+        self.status_code = entry['status']
+        self.headers = CaseInsensitiveDict(entry['headers'])
+        self.content = base64.b64decode(entry['body'])
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+    def __repr__(self):
+        return '<ReplayedResponse [%d]>' % self.status_code
+
+
+def _path(url):
+    parts = urlsplit(url)
+    return '%s?%s' % (parts.path, parts.query) if parts.query else parts.path
+
+
+def _digest(kwargs):
+    if 'json' in kwargs:
+        body = json.dumps(kwargs['json'], sort_keys=True).encode('utf-8')
+
+    elif isinstance(kwargs.get('data'), bytes):
+        body = kwargs['data']
+
+    elif 'files' in kwargs:
+        # the names and sizes of the uploaded files
+        body = json.dumps(sorted(
+            (field, value[0], len(value[1]) if isinstance(value[1], bytes) else None)
+            for field, value in kwargs['files'].items()
+        )).encode('utf-8')
+
+    else:
+        body = b''
+
+    return {'size': len(body), 'sha1': hashlib.sha1(body).hexdigest()}
+
+
+def _line(entry):
+    return json.dumps(entry, sort_keys=True, separators=(',', ':')).encode('utf-8') + b'\n'
@@ -0,0 +1,66 @@
+import gzip
+import json
+
+import six
+
+
+PREFERRED_ENCODINGS = ('zstd', 'br', 'gzip', 'deflate')
+"""
+The content encodings to accept by default, in order of preference,
+when the libraries to decode them are available.
+"""
+
+
+def supported_encodings():
+    """
+    :return: The content encodings the HTTP library can decode on the fly,
+        `br` needs `brotli` (pip install brotli) and `zstd` needs
+        `zstandard` (pip install zstandard) to be installed
+    """
+
+    from urllib3.util.request import ACCEPT_ENCODING
+
+    return [encoding.strip() for encoding in ACCEPT_ENCODING.split(',')]
+
+
+def accept_encoding(encodings=None):
+    """
+    Build the `Accept-Encoding` header for the given encodings.
+
+    :param encodings: The encodings to accept in order of preference
+        (default: `PREFERRED_ENCODINGS`), unsupported ones are left out
+    :return: The value of the header
+    """
+
+    if encodings is None:
+        encodings = PREFERRED_ENCODINGS
+
+    elif isinstance(encodings, six.string_types):
+        encodings = [encoding.strip() for encoding in encodings.split(',')]
+
+    supported = supported_encodings()
+    selected = [encoding for encoding in encodings if encoding in supported]
+
+    return ', '.join(selected) or 'identity'
+
+
+def encode_json(value, threshold=None):
+    """
+    Serialize a request body as JSON, compressing it with gzip
+    when it is at least `threshold` bytes long.
+
+    :param value: The JSON-serializable body
+    :param threshold: The minimum size in bytes to compress at,
+        or `None` to never compress
+    :return: The `(body, encoding, size)` tuple, where `encoding` is `None`
+        when the body is not compressed, and `size` is the uncompressed size
+    """
+
+    body = json.dumps(value).encode('utf-8')
+
+    if threshold is None or len(body) < threshold:
+        return body, None, len(body)
+
+    # fast compression, as the body is sent only once
+    return gzip.compress(body, compresslevel=5), 'gzip', len(body)
+
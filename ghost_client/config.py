@@ -0,0 +1,114 @@
+class ClientConfig(object):
+    """
+    Picklable settings of a `Ghost` client, to create
+    equivalent clients in other processes, like the workers
+    of a `multiprocessing.Pool` or a `ProcessPoolExecutor`.
+
+    The server version and the access token are carried over while
+    the token is valid, so the new clients do not need to fetch or
+    request them again. Components given as `True` to the client are
+    recreated with their default settings, custom instances of them
+    are not carried over, as their locks and threads cannot be pickled.
+    The cache and the transport are recreated with their settings:
+    a `cache.ResponseCache` starts empty (a `shared_cache.SharedResponseCache`
+    opens the same file), and transports that cannot be recreated in
+    another process are replaced by a `transport.RequestsTransport`
+    (see `transport.Transport`).
+
+    Sample usage:
+
+        config = ghost.config()
+
+        with ProcessPoolExecutor() as pool:
+            pool.map(process_post, [(config, post_id) for post_id in post_ids])
+
+        def process_post(args):
+            config, post_id = args
+            ghost = config.create()
+            ...
+    """
+
+    def __init__(
+            self, base_url, version='auto',
+            client_id=None, client_secret=None,
+            access_token=None, token_expires_at=None,
+            admin_key=None, cache_ttl=None,
+            circuit_breaker=False, hedging=False, scheduler=False,
+            pool_size=10, accept_encoding=None, compress_requests=None,
+            http2=False, projection=False, images=False,
+            cache=None, transport=None
+    ):
+        """
+        Creates new client settings, see `Ghost` for the parameters.
+
+        :param token_expires_at: The expiry of `access_token` as a UNIX timestamp
+        :param cache_ttl: The TTL of a `cache.ResponseCache`
+            in seconds, or `None` to not cache responses
+        :param http2: Whether to send requests with a `transport.HTTPXTransport`
+        :param projection: Whether to use a `projection.AdaptiveProjection`
+        :param images: Whether to use an `images.ImageOptimizer`
+        :param cache: The cache to recreate in the new process with its settings,
+            instead of a `cache.ResponseCache` with `cache_ttl`
+        :param transport: The `transport.Transport` to recreate
+            in the new process with its settings, instead of `http2`
+        """
+
+        self.base_url = base_url
+        self.version = version
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.access_token = access_token
+        self.token_expires_at = token_expires_at
+        self.admin_key = admin_key
+        self.cache_ttl = cache_ttl
+        self.circuit_breaker = circuit_breaker
+        self.hedging = hedging
+        self.scheduler = scheduler
+        self.pool_size = pool_size
+        self.accept_encoding = accept_encoding
+        self.compress_requests = compress_requests
+        self.http2 = http2
+        self.projection = projection
+        self.images = images
+        self.cache = cache
+        self.transport = transport
+
+    def create(self):
+        """
+        :return: A new `Ghost` client with these settings
+        """
+
+        from .api import Ghost
+        from .cache import ResponseCache
+        from .transport import HTTPXTransport
+
+        cache, transport = self.cache, self.transport
+
+        if cache is None and self.cache_ttl is not None:
+            cache = ResponseCache(ttl=self.cache_ttl)
+
+        if transport is None and self.http2:
+            transport = HTTPXTransport(max_connections=self.pool_size)
+
+        ghost = Ghost(
+            self.base_url, version=self.version,
+            client_id=self.client_id, client_secret=self.client_secret,
+            access_token=self.access_token, admin_key=self.admin_key,
+            cache=cache,
+            circuit_breaker=self.circuit_breaker or None,
+            hedging=self.hedging or None,
+            scheduler=self.scheduler or None,
+            pool_size=self.pool_size,
+            accept_encoding=self.accept_encoding,
+            compress_requests=self.compress_requests,
+            projection=self.projection or None,
+            images=self.images or None,
+            transport=transport
+        )
+
+        ghost._token_expires_at = self.token_expires_at
+
+        return ghost
+
+    def __repr__(self):
+        return 'ClientConfig(%s, version=%s)' % (self.base_url, self.version)
@@ -14,3 +14,25 @@ class GhostException(Exception):
         super(GhostException, self).__init__(code, errors)
         self.code = code
         self.errors = errors
+
+
+class CircuitOpenException(GhostException):
+    """
+    Raised without sending the request when the circuit breaker
+    of the server is open after too many failed requests.
+    """
+
+    def __init__(self, url, retry_after):
+        """
+        Constructor.
+
+        :param url: The base URL of the server
+        :param retry_after: The number of seconds until the server is probed again
+        """
+
+        super(CircuitOpenException, self).__init__(503, [{
+            'errorType': 'CircuitOpenError',
+            'message': 'Requests to %s are suspended for %.1f seconds' % (url, retry_after)
+        }])
+        self.url = url
+        self.retry_after = retry_after
@@ -0,0 +1,261 @@
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import requests
+from six.moves.urllib.parse import urljoin, urlparse
+
+from . import ndjson
+from .errors import GhostException
+from .helpers import keyset_filter
+
+
+class Exporter(object):
+    """
+    Exports the content of a site into compressed NDJSON files,
+    one file per resource type with one item per line.
+
+    Items are walked in the order they were created with keyset
+    pagination (see `models.Controller.iterate`), so items created or
+    deleted during a long export do not shift the pages, and each page
+    is written as soon as it arrives, so only one page is held in memory
+    at a time. Each page is written as a self-contained compressed chunk
+    and recorded in a checkpoint file with the position of its last item,
+    so an interrupted export continues after it when started again.
+    Images are downloaded in parallel through the transport of the client,
+    and the ones still pending are recorded in the checkpoint too.
+
+    Sample usage:
+
+        from ghost_client.exporter import Exporter
+
+        exporter = Exporter(ghost, '/backups/site', compression='gzip', images=True)
+        counts = exporter.export()
+
+        print(counts)  # {'posts': 1234, 'tags': 56, 'users': 7, 'images': 890}
+    """
+
+    RESOURCES = ('posts', 'tags', 'users')
+    """
+    The resource types exported by default.
+    """
+
+    KEY = 'created_at'
+    """
+    The field the items are walked by, which does not change when they are edited.
+    """
+
+    DEFAULT_LIST_KWARGS = {
+        'posts': {'status': 'all', 'formats': 'mobiledoc,html', 'include': 'tags,authors'},
+        'tags': {},
+        'users': {}
+    }
+    """
+    The default request parameters used to list each resource type.
+    """
+
+    CHECKPOINT_FILE = 'export.checkpoint.json'
+    """
+    The name of the checkpoint file within the target directory.
+    """
+
+    IMAGE_FIELDS = ('feature_image', 'og_image', 'twitter_image', 'profile_image', 'cover_image')
+    """
+    The fields that may reference images uploaded to the site.
+    """
+
+    _IMAGE_SOURCE = re.compile(r'<img[^>]+src="([^"]+)"')
+
+    def __init__(
+            self, ghost, directory, compression='gzip',
+            workers=4, limit=100, images=False, list_kwargs=None
+    ):
+        """
+        Creates a new exporter.
+
+        :param ghost: An instance of the API client
+        :param directory: The directory to write the files into
+        :param compression: The compression type (`gzip`, `zstd` or `None`)
+        :param workers: The number of images to download in parallel
+        :param limit: The number of items to fetch per page
+        :param images: Whether to download the images referenced by the content
+        :param list_kwargs: Request parameters per resource type
+            to use instead of `DEFAULT_LIST_KWARGS`
+        """
+
+        self.ghost = ghost
+        self.directory = directory
+        self.compression = compression
+        self.workers = workers
+        self.limit = limit
+        self.images = images
+
+        self._list_kwargs = dict(self.DEFAULT_LIST_KWARGS)
+        self._list_kwargs.update(list_kwargs or dict())
+
+        self._site_url = ghost.base_url.rsplit('/ghost/api/', 1)[0]
+        self._checkpoint_path = os.path.join(directory, self.CHECKPOINT_FILE)
+
+    def export(self, resources=RESOURCES):
+        """
+        Export the given resource types, continuing
+        from the last checkpoint if there is one.
+
+        :param resources: The resource types to export
+        :return: The number of exported items per resource type
+            (and the number of downloaded images if enabled)
+        """
+
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        checkpoint = self._load_checkpoint()
+        counts = dict()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as image_pool:
+            image_futures = dict() if self.images else None
+
+            if self.images:
+                # the ones of the checkpointed pages that were not downloaded yet
+                self._download(checkpoint.get('images', []), image_pool, image_futures)
+
+            for name in resources:
+                counts[name] = self._export_resource(name, checkpoint, image_pool, image_futures)
+
+            if self.images:
+                counts['images'] = sum(1 for future in image_futures.values() if future.result())
+
+                checkpoint['images'] = []
+                self._save_checkpoint(checkpoint)
+
+        return counts
+
+    def _export_resource(self, name, checkpoint, image_pool, image_futures):
+        state = checkpoint.setdefault(name, {'cursor': None, 'offset': 0, 'items': 0, 'complete': False})
+
+        if state['complete']:
+            return state['items']
+
+        path = os.path.join(self.directory, ndjson.file_name(name, self.compression))
+
+        with open(path, 'r+b' if state['offset'] and os.path.exists(path) else 'wb') as output:
+            # drop anything written after the last checkpoint
+            output.truncate(state['offset'])
+            output.seek(state['offset'])
+
+            items = self._iterate(name, state['cursor'])
+
+            while True:
+                page = list(islice(items, self.limit))
+
+                if not page:
+                    break
+
+                if self.images:
+                    # before the checkpoint, which records them as pending
+                    self._download_images(page, image_pool, image_futures)
+
+                self._write(output, page, state, checkpoint, image_futures)
+
+        state['complete'] = True
+        self._save_checkpoint(checkpoint)
+
+        return state['items']
+
+    def _iterate(self, name, cursor):
+        kwargs = dict(self._list_kwargs.get(name, dict()))
+        kwargs.pop('order', None)
+
+        if cursor:
+            after = keyset_filter(self.KEY, cursor[0], cursor[1], descending=False)
+            kwargs['filter'] = '(%s)+%s' % (kwargs['filter'], after) if kwargs.get('filter') else after
+
+        return getattr(self.ghost, name).iterate(key=self.KEY, descending=False, limit=self.limit, **kwargs)
+
+    def _write(self, output, items, state, checkpoint, image_futures):
+        output.write(ndjson.encode(items, self.compression))
+        output.flush()
+        os.fsync(output.fileno())
+
+        last = dict(items[-1])
+
+        state['cursor'] = [last[self.KEY], last['id']]
+        state['items'] += len(items)
+        state['offset'] = output.tell()
+
+        if image_futures is not None:
+            checkpoint['images'] = sorted(url for url, future in image_futures.items() if not future.done())
+
+        self._save_checkpoint(checkpoint)
+
+    def _load_checkpoint(self):
+        if os.path.exists(self._checkpoint_path):
+            with open(self._checkpoint_path) as checkpoint_file:
+                return json.load(checkpoint_file)
+
+        return dict()
+
+    def _save_checkpoint(self, checkpoint):
+        temporary = '%s.tmp' % self._checkpoint_path
+
+        with open(temporary, 'w') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+
+        os.replace(temporary, self._checkpoint_path)
+
+    def _download_images(self, items, pool, futures):
+        self._download([url for item in items for url in self._image_urls(item)], pool, futures)
+
+    def _download(self, urls, pool, futures):
+        for url in urls:
+            if url not in futures:
+                futures[url] = pool.submit(self._download_image, url)
+
+    def _image_urls(self, item):
+        for field in self.IMAGE_FIELDS:
+            if item.get(field):
+                yield item[field]
+
+        if item.get('html'):
+            for source in self._IMAGE_SOURCE.findall(item['html']):
+                yield source
+
+    def _download_image(self, url):
+        url = urljoin(self._site_url + '/', url)
+
+        if not url.startswith(self._site_url):
+            return False  # hosted elsewhere
+
+        target = os.path.join(self.directory, 'images', urlparse(url).path.lstrip('/'))
+
+        if os.path.exists(target):
+            return True  # downloaded by a previous run
+
+        if not os.path.isdir(os.path.dirname(target)):
+            try:
+                os.makedirs(os.path.dirname(target))
+            except OSError:
+                pass  # created concurrently
+
+        temporary = '%s.part' % target
+
+        try:
+            # through the transport and the circuit breaker of the client, without its API headers
+            response = self.ghost._send(self.ghost.transport.get, url)
+
+        except (requests.RequestException, GhostException):
+            return False
+
+        self.ghost._count_transfer(response)
+
+        if response.status_code // 100 != 2:
+            return False
+
+        with open(temporary, 'wb') as image_file:
+            image_file.write(response.content)
+
+        os.replace(temporary, target)
+
+        return True
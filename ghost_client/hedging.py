@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .helpers import reset_after_fork
+from .metrics import Metrics
+
+
+class HedgingPolicy(object):
+    """
+    Sends a duplicate (hedged) request when the response for an
+    idempotent request has not arrived within the usual time,
+    and uses whichever response arrives first.
+
+    The delay before hedging is the given percentile of the recent
+    response times, so only the slowest requests are duplicated,
+    and the number of hedged requests is capped at `max_ratio`
+    of all requests. Requests are sent on the thread of the caller,
+    unless they may be hedged: then they are sent, and duplicated,
+    on idle threads of the pool, which never queues them, so the
+    pool does not limit the throughput and the delay is counted
+    from the time the request is sent.
+    The `hedging.requests`, `hedging.hedged` and
+    `hedging.won` counters report how many requests were sent,
+    duplicated, and answered first by the duplicate.
+
+    Sample usage:
+
+        ghost = Ghost('http://localhost:2368', admin_key='...', hedging=True)
+
+        # or with custom settings
+        ghost = Ghost('http://localhost:2368', admin_key='...',
+                      hedging=HedgingPolicy(percentile=90, max_ratio=0.1))
+    """
+
+    def __init__(
+            self, percentile=95, initial_delay=1.0, min_delay=0.01,
+            max_ratio=0.05, window=200, workers=16, metrics=None
+    ):
+        """
+        Creates a new hedging policy.
+
+        :param percentile: The percentile of recent response times to hedge after
+        :param initial_delay: The delay in seconds to use until enough responses were timed
+        :param min_delay: The minimum delay in seconds before hedging
+        :param max_ratio: The maximum ratio of hedged requests to all requests
+        :param window: The number of recent response times to keep
+        :param workers: The number of threads sending the requests
+            that may be hedged and their duplicates
+        :param metrics: The `metrics.Metrics` to report to (optional)
+        """
+
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self.metrics = metrics or Metrics()
+
+        self._latencies = deque(maxlen=window)
+        self._requests = 0
+        self._hedged = 0
+        self._busy = 0
+        self.workers = workers
+
+        self._after_fork()
+        reset_after_fork(self)
+
+    @property
+    def delay(self):
+        """
+        :return: The number of seconds to wait for a response before hedging
+        """
+
+        with self._lock:
+            if len(self._latencies) < 20:
+                return self.initial_delay
+
+            ordered = sorted(self._latencies)
+
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100.0))
+
+        return max(self.min_delay, ordered[index])
+
+    def call(self, request, *args, **kwargs):
+        """
+        Send a request, hedging it if it is slow.
+
+        :param request: The function sending the request
+        :param args: The positional arguments of the function
+        :param kwargs: The keyword arguments of the function
+        :return: The first successful response
+        """
+
+        with self._lock:
+            self._requests += 1
+            hedgeable = self._can_hedge()
+
+            if hedgeable:
+                self._busy += 1
+
+        self.metrics.increment('hedging.requests')
+
+        if not hedgeable:
+            return self._timed(request, args, kwargs)
+
+        sent = threading.Event()
+        primary = self._pool.submit(self._pooled, sent, request, args, kwargs)
+
+        sent.wait()
+        done, _ = wait([primary], timeout=self.delay)
+
+        if done or not self._allow_hedge():
+            return primary.result()
+
+        self.metrics.increment('hedging.hedged')
+
+        hedge = self._pool.submit(self._pooled, None, request, args, kwargs)
+        pending = set([primary, hedge])
+        failed = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future.exception() is not None or future.result().status_code >= 500:
+                    failed = future
+                    continue
+
+                if future is hedge:
+                    self.metrics.increment('hedging.won')
+
+                return future.result()
+
+        return failed.result()  # both failed
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+
+    def _can_hedge(self):
+        # within the budget, and with an idle thread to send the request from
+        return self._hedged + 1 <= self.max_ratio * self._requests and self._busy < self.workers
+
+    def _allow_hedge(self):
+        with self._lock:
+            if not self._can_hedge():
+                return False
+
+            self._hedged += 1
+            self._busy += 1
+            return True
+
+    def _pooled(self, sent, request, args, kwargs):
+        try:
+            if sent is not None:
+                sent.set()  # the delay starts now, not when the request was queued
+
+            return self._timed(request, args, kwargs)
+
+        finally:
+            with self._lock:
+                self._busy -= 1
+
+    def _timed(self, request, args, kwargs):
+        started = time.time()
+        response = request(*args, **kwargs)
+
+        with self._lock:
+            self._latencies.append(time.time() - started)
+
+        return response
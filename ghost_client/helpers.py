@@ -1,4 +1,10 @@
 import functools
+import hashlib
+import json
+import os
+import weakref
+
+import six
 
 
 def refresh_session_if_necessary(f):
@@ -12,11 +18,14 @@ def refresh_session_if_necessary(f):
 
     @functools.wraps(f)
     def wrapped(self, *args, **kwargs):
+        token = self._access_token
+
         try:
             result = f(self, *args, **kwargs)
         except Exception as ex:
             if hasattr(ex, 'code') and ex.code in (401, 403):
-                self.refresh_session()
+                # only one of the concurrently failing calls re-authenticates
+                self.refresh_session(stale_token=token)
                 # retry now
                 result = f(self, *args, **kwargs)
             else:
@@ -25,3 +34,97 @@ def refresh_session_if_necessary(f):
         return result
 
     return wrapped
+
+
+def keyset_filter(key, value, id, descending=True):
+    """
+    Build a Ghost filter expression selecting the resources
+    that come after the given `(key, id)` position
+    in a listing ordered by `key` and then `id`.
+
+    :param key: The name of the field the listing is ordered by
+    :param value: The value of the `key` field on the last seen item
+    :param id: The ID of the last seen item
+    :param descending: Whether the listing is in descending order
+    :return: The filter expression for the next page
+    """
+
+    operator = '<' if descending else '>'
+
+    return "(%s:%s%s,(%s:%s+id:%s%s))" % (
+        key, operator, _quote_filter_value(value),
+        key, _quote_filter_value(value),
+        operator, _quote_filter_value(id)
+    )
+
+
+def _quote_filter_value(value):
+    if not isinstance(value, six.string_types):
+        value = str(value)
+
+    return "'%s'" % value.replace("'", "\\'")
+
+
+def fingerprint(value):
+    """
+    Calculate a stable hash of a JSON-serializable value,
+    independent of the order of keys in dictionaries.
+
+    :param value: The value to hash
+    :return: The hash as a hexadecimal string
+    """
+
+    canonical = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def project(stored, outgoing):
+    """
+    Reduce a stored value to the shape of an outgoing one,
+    keeping only the (nested) keys that are present in the latter.
+
+    :param stored: The value as returned by the API
+    :param outgoing: The value about to be sent to the API
+    :return: The comparable part of the stored value
+    """
+
+    if isinstance(outgoing, dict):
+        if not isinstance(stored, dict):
+            return stored
+
+        return dict((key, project(stored.get(key), value)) for key, value in outgoing.items())
+
+    elif isinstance(outgoing, (list, tuple)):
+        if not isinstance(stored, (list, tuple)) or len(stored) != len(outgoing):
+            return stored
+
+        return [project(s, o) for s, o in zip(stored, outgoing)]
+
+    return stored
+
+
+_fork_aware = weakref.WeakSet()
+
+
+def reset_after_fork(obj):
+    """
+    Register an object to have its `_after_fork()` method called in
+    the child process after a fork, to replace the locks, thread pools
+    and connections that cannot be shared with the parent process.
+
+    :param obj: The object to register
+    :return: The same object
+    """
+
+    _fork_aware.add(obj)
+    return obj
+
+
+def _after_fork_in_child():
+    for obj in list(_fork_aware):
+        obj._after_fork()
+
+
+if hasattr(os, 'register_at_fork'):  # Python 3.7+
+    os.register_at_fork(after_in_child=_after_fork_in_child)
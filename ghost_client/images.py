@@ -0,0 +1,172 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+from .helpers import reset_after_fork
+
+
+class ImageOptimizer(object):
+    """
+    Prepares images for `Ghost.upload`: resizes them to fit within
+    `max_width` and `max_height`, strips their metadata (EXIF, ICC
+    profiles and comments), and re-encodes JPEG, PNG and WebP images
+    with the configured quality, using Pillow (pip install Pillow).
+
+    The encoding runs in a `ProcessPoolExecutor`, so it does not hold
+    up the threads sending requests. The outputs are cached by the
+    hash of the source image and the settings, so uploading the same
+    image again does not encode it again. When the optimized image
+    would not be smaller, or the file is not a supported image, the
+    original is uploaded.
+
+    Sample usage:
+
+        ghost = Ghost('http://localhost:2368', admin_key='...', images=ImageOptimizer(max_width=1600))
+
+        ghost.upload(file_path='/path/to/camera.jpeg')  # sends a resized copy
+    """
+
+    FORMATS = {
+        '.jpg': 'JPEG', '.jpeg': 'JPEG',
+        '.png': 'PNG',
+        '.webp': 'WEBP'
+    }
+    """
+    The supported image formats by file extension.
+    """
+
+    def __init__(
+            self, max_width=2000, max_height=2000, quality=85,
+            min_bytes=64 * 1024, workers=None, cache_size=256
+    ):
+        """
+        Creates a new image optimizer.
+
+        :param max_width: The maximum width of the images in pixels
+        :param max_height: The maximum height of the images in pixels
+        :param quality: The JPEG and WebP quality to encode with (1-100)
+        :param min_bytes: The size of the images in bytes to leave as they are below
+        :param workers: The number of processes to encode with (default: the number of CPUs)
+        :param cache_size: The number of optimized images to keep in memory
+        """
+
+        try:
+            import PIL
+
+        except ImportError:
+            from .errors import GhostException
+            raise GhostException(500, 'The image optimizer needs Pillow: pip install Pillow')
+
+        self.max_width = max_width
+        self.max_height = max_height
+        self.quality = quality
+        self.min_bytes = min_bytes
+        self.workers = workers
+        self.cache_size = cache_size
+
+        self._cache = OrderedDict()
+
+        self._after_fork()
+        reset_after_fork(self)
+
+    def optimize(self, file_name, data):
+        """
+        Optimize an image.
+
+        :param file_name: The name of the image file, its extension selects the format
+        :param data: The content of the image
+        :return: The content to upload, the optimized image
+            when it is smaller than the original, or `data` otherwise
+        """
+
+        image_format = self.FORMATS.get(os.path.splitext(file_name)[1].lower())
+
+        if image_format is None or len(data) < self.min_bytes:
+            return data
+
+        settings = (image_format, self.max_width, self.max_height, self.quality)
+        key = (hashlib.sha256(data).hexdigest(),) + settings
+
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key] or data
+
+        optimized = self._executor().submit(_optimize, data, *settings).result()
+
+        if optimized is not None and len(optimized) >= len(data):
+            optimized = None
+
+        with self._cache_lock:
+            self._cache[key] = optimized
+
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return optimized or data
+
+    def close(self):
+        """
+        Stop the worker processes.
+        """
+
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _executor(self):
+        with self._pool_lock:
+            if self._pool is None:
+                from concurrent.futures import ProcessPoolExecutor
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+            return self._pool
+
+    def _after_fork(self):
+        # the worker processes of the parent are not usable in the child
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+
+
+def _optimize(data, image_format, max_width, max_height, quality):
+    # runs in the worker processes
+    from PIL import Image, ImageOps
+
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.load()
+
+    except (IOError, SyntaxError, ValueError):
+        return None  # not a valid image
+
+    if getattr(image, 'is_animated', False):
+        return None
+
+    image = ImageOps.exif_transpose(image)  # keep the orientation without the EXIF data
+    image.thumbnail((max_width, max_height), Image.LANCZOS)
+
+    options = dict()
+
+    if image_format == 'JPEG':
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+
+        options.update(quality=quality, optimize=True, progressive=True)
+
+    elif image_format == 'PNG':
+        options.update(optimize=True)
+
+    else:
+        options.update(quality=quality, method=6)
+
+    # the encoders only write the metadata (like ICC profiles) found in `info`
+    image.info = dict()
+
+    output = io.BytesIO()
+    image.save(output, format=image_format, **options)
+
+    return output.getvalue()
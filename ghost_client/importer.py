@@ -0,0 +1,193 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import ndjson
+from .errors import GhostException
+
+
+class Importer(object):
+    """
+    Imports posts from NDJSON files (as written by `exporter.Exporter`)
+    using a pool of concurrent writers.
+
+    The items are read lazily, so only the ones being written are
+    held in memory. Tags are resolved by their slug, and the missing
+    ones are created once. Every imported item is recorded in a
+    checkpoint file, so a crashed run can be started again without
+    creating duplicate posts.
+
+    Sample usage:
+
+        from ghost_client.importer import Importer
+
+        importer = Importer(ghost, '/backups/site/import.checkpoint', workers=8)
+        result = importer.import_posts('/backups/site/posts.ndjson.gz')
+
+        print(result)  # {'created': 1230, 'skipped': 4, 'failed': []}
+    """
+
+    READ_ONLY_FIELDS = (
+        'id', 'uuid', 'url', 'comment_id', 'excerpt', 'reading_time',
+        'created_at', 'created_by', 'updated_at', 'updated_by', 'published_by',
+        'primary_tag', 'primary_author', 'author', 'count'
+    )
+    """
+    Fields of exported posts that are not sent when creating them.
+    """
+
+    def __init__(self, ghost, checkpoint_path, workers=4):
+        """
+        Creates a new importer.
+
+        :param ghost: An instance of the API client
+        :param checkpoint_path: The path of the checkpoint file
+        :param workers: The number of posts to create concurrently
+        """
+
+        self.ghost = ghost
+        self.checkpoint_path = checkpoint_path
+        self.workers = workers
+
+        self._lock = threading.Lock()
+        self._resolve_lock = threading.Lock()
+        self._tags = None
+        self._users = None
+
+    def import_posts(self, path):
+        """
+        Import the posts from an NDJSON file,
+        skipping the ones imported by a previous run.
+
+        :param path: The path of the (optionally compressed) NDJSON file
+        :return: The number of created and skipped posts,
+            and the `(key, exception)` pairs for the failed ones
+        """
+
+        done, started = self._load_checkpoint()
+        result = {'created': 0, 'skipped': 0, 'failed': []}
+
+        self.ghost.version  # resolve it once before the workers need it
+
+        in_flight = threading.BoundedSemaphore(self.workers * 2)
+
+        with open(self.checkpoint_path, 'a') as checkpoint, \
+                ThreadPoolExecutor(max_workers=self.workers) as pool:
+
+            for line_number, item in enumerate(ndjson.read(path)):
+                key = item.get('id') or item.get('slug') or 'line-%d' % line_number
+
+                if key in done:
+                    result['skipped'] += 1
+                    continue
+
+                in_flight.acquire()
+
+                future = pool.submit(
+                    self._import_post, item, key, key in started, checkpoint, result
+                )
+                future.add_done_callback(lambda _: in_flight.release())
+
+        return result
+
+    def _import_post(self, item, key, verify, checkpoint, result):
+        try:
+            if verify and item.get('slug') and self._exists(item['slug']):
+                # created by the crashed run before it could record it
+                self._record(checkpoint, 'done', key)
+                self._count(result, 'skipped')
+                return
+
+            self._record(checkpoint, 'started', key)
+
+            self.ghost.posts.create(**self._prepare(item))
+
+            self._record(checkpoint, 'done', key)
+            self._count(result, 'created')
+
+        except Exception as ex:
+            with self._lock:
+                result['failed'].append((key, ex))
+
+    def _prepare(self, item):
+        post = dict((k, v) for k, v in item.items() if k not in self.READ_ONLY_FIELDS)
+
+        if 'mobiledoc' in post and 'markdown' in post:
+            post.pop('mobiledoc')  # converted from markdown instead
+
+        if post.get('tags'):
+            post['tags'] = [{'id': self._resolve_tag(tag)} for tag in post['tags']]
+
+        if 'authors' in post:
+            authors = [self._resolve_author(author) for author in post['authors']]
+            post['authors'] = [{'id': author} for author in authors if author]
+
+            if not post['authors']:
+                post.pop('authors')  # defaults to the owner
+
+        return post
+
+    def _resolve_tag(self, tag):
+        if not isinstance(tag, dict):
+            tag = {'slug': tag, 'name': tag}
+
+        with self._resolve_lock:
+            if self._tags is None:
+                self._tags = dict(
+                    (existing.slug, existing.id)
+                    for existing in self.ghost.tags.list(limit='all', fields='id,slug')
+                )
+
+            if tag['slug'] not in self._tags:
+                created = self.ghost.tags.create(
+                    **dict((k, tag[k]) for k in ('name', 'slug', 'description') if tag.get(k))
+                )
+
+                self._tags[tag['slug']] = created.id
+
+            return self._tags[tag['slug']]
+
+    def _resolve_author(self, author):
+        slug = author.get('slug') if isinstance(author, dict) else author
+
+        with self._resolve_lock:
+            if self._users is None:
+                self._users = dict(
+                    (existing.slug, existing.id)
+                    for existing in self.ghost.users.list(limit='all', fields='id,slug')
+                )
+
+            return self._users.get(slug)
+
+    def _exists(self, slug):
+        try:
+            self.ghost.posts.get(slug=slug, status='all', fields='id')
+            return True
+
+        except GhostException as ex:
+            if ex.code == 404:
+                return False
+
+            raise
+
+    def _count(self, result, name):
+        with self._lock:
+            result[name] += 1
+
+    def _record(self, checkpoint, state, key):
+        with self._lock:
+            checkpoint.write('%s %s\n' % (state, key))
+            checkpoint.flush()
+            os.fsync(checkpoint.fileno())
+
+    def _load_checkpoint(self):
+        done, started = set(), set()
+
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as checkpoint:
+                for line in checkpoint:
+                    if line.strip():
+                        state, key = line.strip().split(' ', 1)
+                        (done if state == 'done' else started).add(key)
+
+        return done, started - done
@@ -0,0 +1,106 @@
+from .errors import GhostException
+
+
+class PostIndex(object):
+    """
+    Base class of the local indexes of posts, like `search.SearchIndex`
+    and `relations.RelationIndex`, keeping them up-to-date incrementally.
+
+    `refresh` only fetches the posts updated since the last one,
+    `prune` removes the posts deleted on the server, and `invalidate`
+    follows the changes reported by a `webhooks.WebhookReceiver`.
+    Subclasses store the posts in `add`, drop them in `remove`,
+    and report what they hold with `_indexed_ids` and `_last_updated`.
+    """
+
+    _FETCH_KWARGS = {}
+    """
+    The parameters to fetch posts with, like the formats and relations the index needs.
+    """
+
+    _REFRESH_TYPES = ()
+    """
+    The types of resources whose changes show up as updated posts.
+    """
+
+    def add(self, posts):
+        """
+        Add or replace posts in the index.
+
+        :param posts: The posts as returned by `posts.list`, `posts.iterate` or `posts.get`
+        :return: The number of posts indexed
+        """
+
+        raise NotImplementedError()
+
+    def remove(self, id):
+        """
+        Remove a post from the index.
+
+        :param id: The ID of the post
+        :return: `True` if the post was in the index
+        """
+
+        raise NotImplementedError()
+
+    def refresh(self, limit=50):
+        """
+        Index the posts created or updated since the last refresh.
+
+        :param limit: The number of posts to fetch per request
+        :return: The number of posts indexed
+        """
+
+        kwargs = dict(self._FETCH_KWARGS, status='all', limit=limit)
+        since = self._last_updated()
+
+        if since:
+            # inclusive, as more posts may have been updated in the same second
+            kwargs['filter'] = "updated_at:>='%s'" % since
+
+        return self.add(self.ghost.posts.iterate(key='updated_at', descending=False, **kwargs))
+
+    def prune(self):
+        """
+        Remove the posts that were deleted on the server from the index.
+
+        :return: The number of posts removed
+        """
+
+        existing = set(post.id for post in self.ghost.posts.list(status='all', fields='id', limit='all'))
+
+        return sum(1 for id in self._indexed_ids() if id not in existing and self.remove(id))
+
+    def invalidate(self, type_name=None, id=None, slug=None):
+        """
+        Follow a change on the server, with the same parameters
+        as the subscribers of a `webhooks.WebhookReceiver`.
+
+        :param type_name: The type of the changed resource (ie. `posts`),
+            or `None` when the whole site changed
+        :param id: The ID of the changed resource
+        :param slug: The slug of the changed resource
+        """
+
+        if type_name is None:
+            self.refresh()
+            self.prune()
+
+        elif type_name == 'posts' and id:
+            try:
+                self.add(self.ghost.posts.get(id, status='all', **self._FETCH_KWARGS))
+
+            except GhostException as ex:
+                if ex.code != 404:
+                    raise
+
+                self.remove(id)
+
+        elif type_name in self._REFRESH_TYPES:
+            self.refresh()
+
+    def _indexed_ids(self):
+        raise NotImplementedError()
+
+    def _last_updated(self):
+        raise NotImplementedError()
@@ -0,0 +1,129 @@
+import threading
+
+from .helpers import reset_after_fork
+
+
+class Metrics(object):
+    """
+    Thread-safe registry of counters, gauges and timings
+    collected by the client and its components.
+
+    Metrics are identified by their name and optional labels,
+    and `snapshot()` returns them keyed as `name{label=value}`.
+
+    Sample usage:
+
+        ghost.metrics.increment('requests', method='GET')
+        ghost.metrics.observe('request.time', 0.25)
+
+        print(ghost.metrics.snapshot())
+    """
+
+    def __init__(self):
+        """
+        Creates a new, empty registry.
+        """
+
+        self._counters = dict()
+        self._timings = dict()
+        self._gauges = dict()
+        self._lock = threading.Lock()
+
+        reset_after_fork(self)
+
+    def increment(self, name, value=1, **labels):
+        """
+        Increase a counter.
+
+        :param name: The name of the counter
+        :param value: The amount to increase it with
+        :param labels: Additional labels for the counter
+        """
+
+        key = self._key(name, labels)
+
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """
+        Record a measurement, like a duration in seconds.
+
+        :param name: The name of the timing
+        :param value: The measured value
+        :param labels: Additional labels for the timing
+        """
+
+        key = self._key(name, labels)
+
+        with self._lock:
+            timing = self._timings.get(key)
+
+            if timing is None:
+                self._timings[key] = {'count': 1, 'sum': value, 'min': value, 'max': value}
+
+            else:
+                timing['count'] += 1
+                timing['sum'] += value
+                timing['min'] = min(timing['min'], value)
+                timing['max'] = max(timing['max'], value)
+
+    def gauge(self, name, value, **labels):
+        """
+        Set a gauge to a value, or to a callable
+        that returns the current value when collected.
+
+        :param name: The name of the gauge
+        :param value: The value or a callable returning it
+        :param labels: Additional labels for the gauge
+        """
+
+        with self._lock:
+            self._gauges[self._key(name, labels)] = value
+
+    def counter(self, name, **labels):
+        """
+        :param name: The name of the counter
+        :param labels: The labels of the counter
+        :return: The current value of the counter
+        """
+
+        with self._lock:
+            return self._counters.get(self._key(name, labels), 0)
+
+    def timing(self, name, **labels):
+        """
+        :param name: The name of the timing
+        :param labels: The labels of the timing
+        :return: The `count`, `sum`, `min` and `max` of the
+            recorded values, or `None` if there are none
+        """
+
+        with self._lock:
+            timing = self._timings.get(self._key(name, labels))
+            return dict(timing) if timing else None
+
+    def snapshot(self):
+        """
+        :return: The current values of all metrics
+        """
+
+        with self._lock:
+            result = dict(self._counters)
+            result.update((key, dict(timing)) for key, timing in self._timings.items())
+            gauges = list(self._gauges.items())
+
+        for key, value in gauges:
+            result[key] = value() if callable(value) else value
+
+        return result
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        if not labels:
+            return name
+
+        return '%s{%s}' % (name, ','.join('%s=%s' % item for item in sorted(labels.items())))
@@ -1,20 +1,103 @@
+import copy
 import json
+import time
+from collections import namedtuple
+
+import six
 
 from .errors import GhostException
+from .helpers import keyset_filter, fingerprint, project
+
+
+UpsertResult = namedtuple('UpsertResult', 'action item')
+"""
+The result of `Controller.upsert`, where `action` is
+one of `created`, `updated` or `skipped`.
+"""
 
 
 class Model(dict):
     """
     Wrapper around the response objects
     to allow accessing fields as properties.
+    Keeps track of the fields changed after it was
+    received, so that `save()` can send only those.
+    With `projection.AdaptiveProjection`, the fields read
+    are recorded, and missing ones are fetched on access.
+    Shallow copies can still be saved, while deep copies and
+    pickled items (like ones returned by process pool workers)
+    keep only the fields and the changes.
     """
 
+    def __init__(self, *args, **kwargs):
+        super(Model, self).__init__(*args, **kwargs)
+        object.__setattr__(self, '_controller', None)
+        object.__setattr__(self, '_changed', set())
+        object.__setattr__(self, '_site', None)
+
     def __getattr__(self, item):
+        if item.startswith('_'):
+            # private state and special methods, like the ones `copy` and `pickle` look up
+            raise AttributeError(item)
+
         return self.get(item)
 
+    def __copy__(self):
+        model = type(self)(self)
+        model.__dict__.update(self.__dict__)
+        object.__setattr__(model, '_changed', set(self._changed))
+        return model
+
+    def __reduce__(self):
+        # deep copies and pickles are detached from the controller and the projection
+        return type(self), (dict(self),), {'_changed': set(self._changed)}
+
+    def __getitem__(self, item):
+        site = self.__dict__.get('_site')
+
+        if site is not None:
+            site.access(self, item)
+
+        return super(Model, self).__getitem__(item)
+
+    def get(self, key, default=None):
+        site = self.__dict__.get('_site')
+
+        if site is not None:
+            site.access(self, key)
+
+        return super(Model, self).get(key, default)
+
     def __setattr__(self, key, value):
         self[key] = value
 
+    def __setitem__(self, key, value):
+        super(Model, self).__setitem__(key, value)
+
+        if '_changed' in self.__dict__:  # not tracking before __init__
+            self._changed.add(key)
+
+    def changes(self):
+        """
+        :return: The fields changed since the item was received, with their values
+        """
+
+        return dict((key, dict.__getitem__(self, key)) for key in self._changed if key in self)
+
+    def save(self):
+        """
+        Send the changed fields to the API (see `Controller.save`).
+
+        :return: This item, updated with the response
+        """
+
+        if self._controller is None:
+            raise GhostException(
+                500, 'Only items returned by a controller can be saved'
+            )
+
+        return self._controller.save(self)
+
 
 class Post(Model):
     """
@@ -63,7 +146,9 @@ class ModelList(list):
         :param model_type: The model type of the items
         """
 
-        super(ModelList, self).__init__(map(model_type, data[type_name]))
+        super(ModelList, self).__init__(
+            controller._wrap(item, model_type) for item in data[type_name]
+        )
         self.meta = data['meta']['pagination']
         self._controller = controller
         self._list_kwargs = list_kwargs
@@ -125,6 +210,19 @@ class Controller(object):
     The API controller dealing with requests for a specific type.
     """
 
+    _cursor_key = 'updated_at'
+
+    _upsert_get_kwargs = {}
+
+    _json_fields = ()
+
+    _auto_limit = None
+
+    COUNT_TTL = 10
+    """
+    The number of seconds to reuse the counts of `count_grouped` for.
+    """
+
     def __init__(self, ghost, type_name, model_type=Model):
         """
         Initializes a new controller.
@@ -137,6 +235,21 @@ class Controller(object):
         self.ghost = ghost
         self._type_name = type_name
         self._model_type = model_type
+        self._read_policy = None
+        self._counts = dict()
+
+    def with_read_policy(self, policy):
+        """
+        Create a copy of this controller that reads
+        through the given policy, like `cache.StaleWhileRevalidate`.
+
+        :param policy: The read policy to use
+        :return: The new controller
+        """
+
+        controller = copy.copy(self)
+        controller._read_policy = policy
+        return controller
 
     def list(self, **kwargs):
         """
@@ -148,11 +261,188 @@ class Controller(object):
             wrapped as `Model` objects with pagination by `ModelList`
         """
 
-        return ModelList(
-            self.ghost.execute_get('%s/' % self._type_name, **kwargs),
+        projection = getattr(self.ghost, 'projection', None)
+
+        if projection is None:
+            return ModelList(
+                self._execute_get('%s/' % self._type_name, **kwargs),
+                self._type_name, self, kwargs, model_type=self._model_type
+            )
+
+        site, request_kwargs = projection.prepare(self, kwargs)
+
+        local = getattr(self.ghost, '_local', None)
+
+        if local is not None:
+            local.response_size = None  # set by the client, unless cached
+
+        items = ModelList(
+            self._execute_get('%s/' % self._type_name, **request_kwargs),
             self._type_name, self, kwargs, model_type=self._model_type
         )
 
+        projection.track(site, items, request_kwargs, getattr(local, 'response_size', None))
+
+        return items
+
+    def count(self, **kwargs):
+        """
+        Count the resources matching the query, fetching
+        only the ID of a single item along with the total.
+
+        :param kwargs: Parameters for the request, like `filter` or `status`
+            (see from and below https://api.ghost.org/docs/limit)
+        :return: The number of matching items
+        """
+
+        kwargs['limit'] = 1
+        kwargs['fields'] = 'id'
+
+        response = self._execute_get('%s/' % self._type_name, **kwargs)
+
+        return response['meta']['pagination']['total']
+
+    def count_grouped(self, groups, workers=8, ttl=None, **kwargs):
+        """
+        Count the resources for each combination of the given parameter
+        values concurrently (see `count`), like for each status and tag:
+
+            ghost.posts.count_grouped([
+                ('status', ['draft', 'published']),
+                ('filter', ['tag:news', 'tag:releases'])
+            ])
+            # {('draft', 'tag:news'): 2, ('draft', 'tag:releases'): 0, ...}
+
+        The counts are reused for `ttl` seconds, or until a resource
+        is created, updated or deleted through this controller.
+
+        :param groups: The `(parameter, values)` pairs to group by,
+            or a dictionary of them
+        :param workers: The number of counts to request concurrently
+        :param ttl: The number of seconds to reuse the counts for (default: `COUNT_TTL`)
+        :param kwargs: Parameters for all requests
+        :return: The counts by the tuples of parameter values,
+            in the order of `groups`
+        """
+
+        groups = list(groups.items()) if hasattr(groups, 'items') else list(groups)
+        names = [name for name, _ in groups]
+        ttl = self.COUNT_TTL if ttl is None else ttl
+
+        combinations = [()]
+
+        for _, values in groups:
+            combinations = [combination + (value,) for combination in combinations for value in values]
+
+        def process(combination):
+            params = dict(kwargs, **dict(zip(names, combination)))
+            key = repr(sorted(params.items()))
+
+            cached = self._counts.get(key)
+
+            if cached is not None and cached[0] > time.time():
+                return combination, cached[1]
+
+            total = self.count(**params)
+            self._counts[key] = (time.time() + ttl, total)
+
+            return combination, total
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(pool.map(process, combinations))
+
+    def iterate(self, key=None, descending=True, limit=15, **kwargs):
+        """
+        Iterate over all resources matching the query using
+        keyset (cursor) pagination instead of page numbers.
+        Each page is selected by a filter on the `(key, id)` position
+        of the last item seen, so the cost of fetching a page does not
+        grow with the depth of the listing, and items are not skipped
+        or repeated when resources are added or removed mid-walk.
+
+        :param key: The field to order by, which has to be set on all
+            items, unlike `published_at` on drafts (default: `updated_at`,
+            or `created_at` for posts)
+        :param descending: Whether to walk from the newest to the oldest
+        :param limit: The number of items to fetch per request, or `auto`
+            (or a `paging.AdaptivePageSize`) to tune it to the measured
+            latency and size of the pages, as reported in the
+            `paging.limit` metric, or `all` to fetch them in one request
+        :param kwargs: Parameters for the request
+            (see from and below https://api.ghost.org/docs/limit)
+        :return: A generator of the items returned by the API
+            wrapped as `Model` objects
+        """
+
+        key = key or self._cursor_key
+        direction = 'desc' if descending else 'asc'
+
+        base_filter = kwargs.pop('filter', None)
+        kwargs.pop('page', None)
+
+        kwargs['order'] = '%s %s,id %s' % (key, direction, direction)
+
+        sizer = None
+
+        if limit == 'auto':
+            from .paging import AdaptivePageSize
+            sizer = AdaptivePageSize(initial=self._auto_limit or 15)
+
+        elif hasattr(limit, 'record'):
+            sizer = limit
+
+        if 'fields' in kwargs:
+            fields = kwargs['fields']
+
+            if isinstance(fields, six.string_types):
+                fields = fields.split(',')
+
+            kwargs['fields'] = list(fields) + [f for f in (key, 'id') if f not in fields]
+
+        if limit == 'all':
+            if base_filter:
+                kwargs['filter'] = base_filter
+
+            for item in self.list(limit='all', **kwargs):
+                yield item
+
+            return
+
+        cursor = None
+
+        while True:
+            params = dict(kwargs)
+            params['limit'] = size = sizer.size if sizer else limit
+            filters = [f for f in (base_filter, cursor) if f]
+
+            if filters:
+                params['filter'] = '+'.join('(%s)' % f for f in filters)
+
+            if sizer:
+                page = self._timed_page(sizer, params)
+
+            else:
+                page = self.list(**params)
+
+            for item in page:
+                yield item
+
+            if len(page) < size:
+                return
+
+            # read as plain dictionaries, not to count as reads of the caller with projection
+            last = dict(page[-1])
+
+            if last.get(key) is None:
+                raise GhostException(
+                    400, 'Cannot continue iterating after an item without `%s`, '
+                         'iterate by a field set on all items instead' % key
+                )
+
+            cursor = keyset_filter(key, last[key], last['id'], descending=descending)
+
     def get(self, id=None, slug=None, **kwargs):
         """
         Fetch a resource from the API.
@@ -167,17 +457,17 @@ class Controller(object):
         """
 
         if id:
-            items = self.ghost.execute_get('%s/%s/' % (self._type_name, id), **kwargs)
+            items = self._execute_get('%s/%s/' % (self._type_name, id), **kwargs)
 
         elif slug:
-            items = self.ghost.execute_get('%s/slug/%s/' % (self._type_name, slug), **kwargs)
+            items = self._execute_get('%s/slug/%s/' % (self._type_name, slug), **kwargs)
 
         else:
             raise GhostException(
                 500, 'Either the ID or the Slug of the resource needs to be specified'
             )
 
-        return self._model_type(items[self._type_name][0])
+        return self._wrap(items[self._type_name][0])
 
     def create(self, **kwargs):
         """
@@ -188,13 +478,15 @@ class Controller(object):
             wrapped as a `Model` object
         """
 
+        self._counts.clear()
+
         response = self.ghost.execute_post('%s/' % self._type_name, json={
             self._type_name: [
                 kwargs
             ]
         })
 
-        return self._model_type(response.get(self._type_name)[0])
+        return self._wrap(response.get(self._type_name)[0])
 
     def update(self, id, **kwargs):
         """
@@ -206,13 +498,158 @@ class Controller(object):
             wrapped as a `Model` object
         """
 
+        self._counts.clear()
+
         response = self.ghost.execute_put('%s/%s/' % (self._type_name, id), json={
             self._type_name: [
                 kwargs
             ]
         })
 
-        return self._model_type(response.get(self._type_name)[0])
+        return self._wrap(response.get(self._type_name)[0])
+
+    def save(self, model):
+        """
+        Updates an existing resource with the fields changed
+        on the item since it was received (see `Model.changes`),
+        along with its `updated_at` for collision detection.
+        The item is refreshed in place with the response.
+
+        :param model: The item to save
+        :return: The same item, updated with the response
+        """
+
+        changes = model.changes()
+
+        if not changes:
+            return model
+
+        # read as a plain dictionary, not to count as reads of the caller with projection
+        fields = dict(model)
+
+        if fields.get('updated_at'):
+            changes.setdefault('updated_at', fields['updated_at'])
+
+        updated = self.update(fields['id'], **changes)
+
+        dict.update(model, updated)
+        model._changed.clear()
+
+        return model
+
+    def upsert(self, slug, **kwargs):
+        """
+        Creates or updates the resource with the given slug,
+        skipping the write when the stored resource already
+        has the same content as the one being sent.
+
+        :param slug: The slug of the resource
+        :param kwargs: The properties of the resource
+        :return: An `UpsertResult` with the action taken
+            and the stored or written item
+        """
+
+        outgoing = self._prepare_upsert(dict(kwargs, slug=slug))
+
+        try:
+            existing = self.get(slug=slug, **self._upsert_get_kwargs)
+
+        except GhostException as ex:
+            if ex.code != 404:
+                raise
+
+            return UpsertResult('created', self.create(**outgoing))
+
+        if self._fingerprint(outgoing) == self._fingerprint(project(existing, outgoing)):
+            return UpsertResult('skipped', existing)
+
+        if existing.get('updated_at'):
+            # required by the collision detection of the API
+            outgoing.setdefault('updated_at', existing['updated_at'])
+
+        return UpsertResult('updated', self.update(existing['id'], **outgoing))
+
+    def upsert_many(self, items, workers=4):
+        """
+        Creates or updates many resources concurrently (see `upsert`).
+
+        :param items: The properties of the resources, each including the `slug`
+        :param workers: The number of resources to process concurrently
+        :return: The created, updated and skipped items by action,
+            and the `(slug, exception)` pairs for the failed ones
+        """
+
+        report = {'created': [], 'updated': [], 'skipped': [], 'failed': []}
+
+        def process(item):
+            item = dict(item)
+            slug = item.pop('slug')
+
+            try:
+                return slug, self.upsert(slug, **item)
+
+            except GhostException as ex:
+                return slug, ex
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for slug, result in pool.map(process, items):
+                if isinstance(result, GhostException):
+                    report['failed'].append((slug, result))
+
+                else:
+                    report[result.action].append(result.item)
+
+        return report
+
+    def _timed_page(self, sizer, params):
+        local = getattr(self.ghost, '_local', None)
+
+        if local is not None:
+            local.response_size = None  # set by the client, unless cached
+
+        started = time.time()
+        page = self.list(**params)
+        elapsed = time.time() - started
+
+        sizer.record(len(page), elapsed, getattr(local, 'response_size', None))
+
+        if sizer.best_size:
+            self._auto_limit = sizer.best_size  # to start from on the next walk
+
+        metrics = getattr(self.ghost, 'metrics', None)
+
+        if metrics is not None:
+            metrics.gauge('paging.limit', sizer.size, resource=self._type_name)
+            metrics.observe('paging.items_per_second', len(page) / max(elapsed, 1e-6), resource=self._type_name)
+
+        return page
+
+    def _prepare_upsert(self, kwargs):
+        return kwargs
+
+    def _execute_get(self, resource, **kwargs):
+        if self._read_policy is not None:
+            return self._read_policy.fetch(
+                resource, kwargs, lambda: self.ghost.execute_get(resource, **kwargs)
+            )
+
+        return self.ghost.execute_get(resource, **kwargs)
+
+    def _wrap(self, data, model_type=None):
+        model = (model_type or self._model_type)(data)
+        object.__setattr__(model, '_controller', self)
+        return model
+
+    def _fingerprint(self, values):
+        values = dict(values)
+
+        for key in self._json_fields:
+            if isinstance(values.get(key), six.string_types):
+                values[key] = json.loads(values[key])
+
+        return fingerprint(values)
 
     def delete(self, id):
         """
@@ -222,6 +659,8 @@ class Controller(object):
         :param id: The ID of the resource
         """
 
+        self._counts.clear()
+
         self.ghost.execute_delete('%s/%s/' % (self._type_name, id))
 
 
@@ -230,6 +669,12 @@ class PostController(Controller):
     Controller extension for managing posts.
     """
 
+    _cursor_key = 'created_at'  # `published_at` is not set on drafts
+
+    _upsert_get_kwargs = {'status': 'all', 'formats': 'mobiledoc', 'include': 'tags,authors'}
+
+    _json_fields = ('mobiledoc',)
+
     def __init__(self, ghost):
         """
         Initialize a new controller for posts.
@@ -264,6 +709,9 @@ class PostController(Controller):
 
         return super(PostController, self).update(id, **self._with_markdown(kwargs))
 
+    def _prepare_upsert(self, kwargs):
+        return self._with_markdown(kwargs)
+
     def _with_markdown(self, kwargs):
         markdown = kwargs.pop('markdown', None)
 
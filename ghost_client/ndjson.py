@@ -0,0 +1,105 @@
+import gzip
+import io
+import json
+
+try:
+    import zstandard  # optional: pip install zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+from .errors import GhostException
+
+
+EXTENSIONS = {
+    None: '',
+    'gzip': '.gz',
+    'zstd': '.zst'
+}
+"""
+File name extensions used for the supported compression types.
+"""
+
+
+def file_name(base_name, compression):
+    """
+    :param base_name: The name of the file without extensions
+    :param compression: The compression type (`gzip`, `zstd` or `None`)
+    :return: The file name for an NDJSON file with the given compression
+    """
+
+    _check_compression(compression)
+
+    return '%s.ndjson%s' % (base_name, EXTENSIONS[compression])
+
+
+def encode(items, compression):
+    """
+    Serialize items as NDJSON and compress them as a single,
+    self-contained gzip member or zstd frame.
+    Chunks encoded this way can be appended to each other
+    and still be read back as one file.
+
+    :param items: The items to serialize
+    :param compression: The compression type (`gzip`, `zstd` or `None`)
+    :return: The encoded chunk as bytes
+    """
+
+    _check_compression(compression)
+
+    data = b''.join(
+        json.dumps(item, sort_keys=True).encode('utf-8') + b'\n' for item in items
+    )
+
+    if compression == 'gzip':
+        return gzip.compress(data)
+
+    elif compression == 'zstd':
+        return zstandard.ZstdCompressor().compress(data)
+
+    return data
+
+
+def read(path):
+    """
+    Lazily read items from an NDJSON file,
+    detecting the compression from the file name.
+
+    :param path: The path of the file to read
+    :return: A generator of the deserialized items
+    """
+
+    for line in _open_lines(path):
+        line = line.strip()
+
+        if line:
+            yield json.loads(line.decode('utf-8'))
+
+
+def _open_lines(path):
+    if path.endswith(EXTENSIONS['gzip']):
+        with gzip.open(path, 'rb') as stream:
+            for line in stream:
+                yield line
+
+    elif path.endswith(EXTENSIONS['zstd']):
+        _check_compression('zstd')
+
+        with open(path, 'rb') as raw:
+            reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+
+            for line in io.BufferedReader(reader):
+                yield line
+
+    else:
+        with open(path, 'rb') as stream:
+            for line in stream:
+                yield line
+
+
+def _check_compression(compression):
+    if compression not in EXTENSIONS:
+        raise GhostException(400, 'Unsupported compression: %s' % compression)
+
+    if compression == 'zstd' and zstandard is None:
+        raise GhostException(500, 'The `zstandard` package is required for zstd compression')
+
@@ -0,0 +1,95 @@
+class AdaptivePageSize(object):
+    """
+    Chooses the page size of a full listing (see `Controller.iterate`)
+    from the measured latency and size of the pages fetched so far.
+
+    The page size is doubled while the number of items fetched per
+    second keeps improving, then it stays at the best size found.
+    It never grows beyond what the latency and size per item predict
+    to fit within `max_latency` seconds and `max_bytes` per page,
+    and it shrinks when a page exceeds either of them.
+
+    Sample usage:
+
+        for post in ghost.posts.iterate(limit='auto'):
+            ...
+
+        # or with custom limits
+        for post in ghost.posts.iterate(limit=AdaptivePageSize(max_latency=2.0)):
+            ...
+    """
+
+    def __init__(
+            self, initial=15, minimum=5, maximum=1000,
+            max_latency=5.0, max_bytes=8 * 1024 * 1024, tolerance=0.05
+    ):
+        """
+        Creates a new page size tuner.
+
+        :param initial: The size of the first page
+        :param minimum: The smallest page size to use
+        :param maximum: The largest page size to use
+        :param max_latency: The maximum number of seconds to wait for a page
+        :param max_bytes: The maximum size of a page in bytes
+        :param tolerance: The relative improvement in items per
+            second needed to keep growing the page size
+        """
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.max_latency = max_latency
+        self.max_bytes = max_bytes
+        self.tolerance = tolerance
+
+        self.size = max(minimum, min(maximum, initial))
+        """ The size of the next page """
+
+        self.best_size = None
+        """ The page size with the most items fetched per second """
+
+        self.best_rate = None
+        """ The number of items fetched per second with `best_size` """
+
+        self.converged = False
+        """ Whether the page size stopped growing """
+
+    def record(self, items, elapsed, size_bytes=None):
+        """
+        Record the measurements of a fetched page and choose the next page size.
+
+        :param items: The number of items on the page
+        :param elapsed: The number of seconds it took to fetch the page
+        :param size_bytes: The size of the response in bytes (optional)
+        :return: The size of the next page
+        """
+
+        if items <= 0 or elapsed <= 0:
+            return self.size
+
+        requested, rate = self.size, items / float(elapsed)
+
+        # the largest page predicted to fit within the limits
+        ceiling = min(self.maximum, int(self.max_latency * items / float(elapsed)))
+
+        if size_bytes:
+            ceiling = min(ceiling, int(self.max_bytes * items / float(size_bytes)))
+
+        if elapsed > self.max_latency or (size_bytes or 0) > self.max_bytes:
+            self.converged = True
+            self.best_size, self.best_rate = None, None
+            size = requested // 2
+
+        elif items < requested:
+            size = requested  # the last, partial page
+
+        elif self.best_rate is None or rate > self.best_rate * (1 + self.tolerance):
+            self.best_size, self.best_rate = requested, rate
+            size = requested if self.converged else requested * 2
+
+        else:
+            self.converged = True
+            size = self.best_size
+
+        self.size = max(self.minimum, min(size, ceiling))
+
+        return self.size
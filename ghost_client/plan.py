@@ -0,0 +1,302 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .errors import GhostException
+
+
+class Ref(object):
+    """
+    Reference to the output of a step in a `Plan`,
+    or to a field of it, resolved when the step completes.
+    """
+
+    def __init__(self, step, path=()):
+        """
+        Creates a new reference.
+
+        :param step: The name of the step
+        :param path: The fields to look up in the output of the step
+        """
+
+        self.step = step
+        self.path = tuple(path)
+
+    def __getattr__(self, item):
+        if item.startswith('_'):
+            raise AttributeError(item)
+
+        return Ref(self.step, self.path + (item,))
+
+    def __getitem__(self, item):
+        return Ref(self.step, self.path + (item,))
+
+    def resolve(self, outputs):
+        """
+        :param outputs: The outputs of the completed steps by name
+        :return: The referenced value
+        """
+
+        value = outputs[self.step]
+
+        for item in self.path:
+            value = value[item] if isinstance(value, (dict, list)) else getattr(value, item)
+
+        return value
+
+    def __repr__(self):
+        return 'Ref(%s)' % '.'.join((self.step,) + tuple(str(p) for p in self.path))
+
+
+class PlanResult(object):
+    """
+    The outcome of running a `Plan`.
+    """
+
+    def __init__(self):
+        self.outputs = dict()
+        """ The outputs of the successful steps by name """
+
+        self.errors = dict()
+        """ The exceptions of the failed steps by name """
+
+        self.skipped = list()
+        """ The names of the steps not run because a dependency failed """
+
+        self.timings = dict()
+        """ The number of seconds each step that ran took, by name """
+
+    @property
+    def succeeded(self):
+        """
+        :return: `True` if all steps succeeded
+        """
+
+        return not self.errors and not self.skipped
+
+    def __getitem__(self, item):
+        return self.outputs[item]
+
+
+class Plan(object):
+    """
+    A batch of operations with dependencies between them,
+    executed as a graph: operations run concurrently as soon as
+    the ones they depend on complete, and the outputs of completed
+    operations are passed into the parameters of dependent ones.
+
+    Dependencies are declared either explicitly with `after`,
+    or implicitly by using a reference to the output of another
+    step (see `ref`) anywhere in the parameters of a step.
+    When a step fails, the steps depending on it are skipped,
+    and the independent ones still run.
+
+    Sample usage:
+
+        plan = Plan(ghost)
+
+        plan.create('tag', 'tags', name='Release notes')
+        plan.upload('image', file_path='/path/to/cover.png')
+        plan.create('post', 'posts',
+                    title='Version 2.0', markdown='...',
+                    feature_image=plan.ref('image'),
+                    tags=[{'id': plan.ref('tag').id}])
+
+        result = plan.run()
+
+        print(result['post'].id, result.timings)
+    """
+
+    def __init__(self, ghost, workers=4):
+        """
+        Creates a new, empty plan.
+
+        :param ghost: An instance of the API client
+        :param workers: The maximum number of steps to run concurrently
+        """
+
+        self.ghost = ghost
+        self.workers = workers
+
+        self._steps = dict()
+        self._order = list()
+
+    @staticmethod
+    def ref(step):
+        """
+        :param step: The name of the step
+        :return: A reference to the output of the step
+        """
+
+        return Ref(step)
+
+    def add(self, name, operation, args=(), kwargs=None, after=()):
+        """
+        Add a step calling an arbitrary function.
+
+        :param name: The unique name of the step
+        :param operation: The function to call
+        :param args: The positional arguments of the function
+        :param kwargs: The keyword arguments of the function
+        :param after: The names of additional steps to wait for
+        :return: A reference to the output of the step
+        """
+
+        if name in self._steps:
+            raise GhostException(400, 'Duplicate step in the plan: %s' % name)
+
+        kwargs = kwargs or dict()
+        dependencies = set(after)
+        self._collect_refs((args, kwargs), dependencies)
+
+        self._steps[name] = (operation, args, kwargs, dependencies)
+        self._order.append(name)
+
+        return Ref(name)
+
+    def create(self, name, type_name, after=(), **kwargs):
+        """
+        Add a step creating a resource (see `models.Controller.create`).
+
+        :param name: The unique name of the step
+        :param type_name: The type of the resource (ie. `posts`)
+        :param after: The names of additional steps to wait for
+        :param kwargs: The properties of the resource
+        :return: A reference to the created resource
+        """
+
+        return self.add(name, getattr(self.ghost, type_name).create, kwargs=kwargs, after=after)
+
+    def update(self, name, type_name, id, after=(), **kwargs):
+        """
+        Add a step updating a resource (see `models.Controller.update`).
+
+        :param name: The unique name of the step
+        :param type_name: The type of the resource (ie. `posts`)
+        :param id: The ID of the resource (or a reference to it)
+        :param after: The names of additional steps to wait for
+        :param kwargs: The properties of the resource to change
+        :return: A reference to the updated resource
+        """
+
+        return self.add(name, getattr(self.ghost, type_name).update, args=(id,), kwargs=kwargs, after=after)
+
+    def upload(self, name, after=(), **kwargs):
+        """
+        Add a step uploading an image (see `Ghost.upload`).
+
+        :param name: The unique name of the step
+        :param after: The names of additional steps to wait for
+        :param kwargs: The parameters of the upload
+        :return: A reference to the path of the uploaded image
+        """
+
+        return self.add(name, self.ghost.upload, kwargs=kwargs, after=after)
+
+    def run(self):
+        """
+        Execute the steps of the plan.
+
+        :return: The `PlanResult` with the outputs, errors and timings
+        """
+
+        self._validate()
+
+        result = PlanResult()
+        remaining = list(self._order)
+        running = dict()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while remaining or running:
+                for name in list(remaining):
+                    dependencies = self._steps[name][3]
+
+                    if any(d in result.errors or d in result.skipped for d in dependencies):
+                        remaining.remove(name)
+                        result.skipped.append(name)
+
+                    elif all(d in result.outputs for d in dependencies):
+                        remaining.remove(name)
+                        running[pool.submit(self._run_step, name, result.outputs)] = name
+
+                if not running:
+                    continue  # only skipped steps were left
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name = running.pop(future)
+                    output, elapsed, error = future.result()
+
+                    result.timings[name] = elapsed
+
+                    if error is None:
+                        result.outputs[name] = output
+
+                    else:
+                        result.errors[name] = error
+
+        return result
+
+    def _run_step(self, name, outputs):
+        operation, args, kwargs, _ = self._steps[name]
+        started = time.time()
+
+        try:
+            output = operation(*self._resolve(args, outputs), **self._resolve(kwargs, outputs))
+            return output, time.time() - started, None
+
+        except Exception as ex:
+            return None, time.time() - started, ex
+
+    def _validate(self):
+        for name in self._order:
+            for dependency in self._steps[name][3]:
+                if dependency not in self._steps:
+                    raise GhostException(
+                        400, 'Step %s depends on an unknown step: %s' % (name, dependency)
+                    )
+
+        visited, visiting = set(), set()
+
+        def visit(name):
+            if name in visiting:
+                raise GhostException(400, 'The plan has a dependency cycle at step: %s' % name)
+
+            if name not in visited:
+                visiting.add(name)
+
+                for dependency in self._steps[name][3]:
+                    visit(dependency)
+
+                visiting.remove(name)
+                visited.add(name)
+
+        for name in self._order:
+            visit(name)
+
+    def _collect_refs(self, value, refs):
+        if isinstance(value, Ref):
+            refs.add(value.step)
+
+        elif isinstance(value, dict):
+            for item in value.values():
+                self._collect_refs(item, refs)
+
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                self._collect_refs(item, refs)
+
+    def _resolve(self, value, outputs):
+        if isinstance(value, Ref):
+            return value.resolve(outputs)
+
+        elif isinstance(value, dict):
+            return dict((k, self._resolve(v, outputs)) for k, v in value.items())
+
+        elif isinstance(value, list):
+            return [self._resolve(v, outputs) for v in value]
+
+        elif isinstance(value, tuple):
+            return tuple(self._resolve(v, outputs) for v in value)
+
+        return value
@@ -0,0 +1,264 @@
+import os
+import sys
+import threading
+
+
+class AdaptiveProjection(object):
+    """
+    Learns which fields each call site of `Controller.list` reads
+    from the returned items, and requests only those fields with
+    `fields` (and `formats`) on the later calls from the same site.
+
+    Accessing a field that was not requested on a projected item
+    fetches it for all items of the same listing, with a request
+    per `BACKFILL_IDS` items, and the field is requested from that
+    site from then on. Fields the resource does not have are neither
+    requested nor fetched. Calls that pass `fields` explicitly
+    are left as they are. `report()` shows the fields requested by
+    each site, and the average size of the items with and without
+    projection, from the size of the responses received.
+
+    Sample usage:
+
+        ghost = Ghost('http://localhost:2368', admin_key='...', projection=True)
+
+        for _ in range(10):
+            for post in ghost.posts.list(limit='all'):
+                print(post.id, post.title)  # only `title` is requested after the first call
+
+        print(ghost.projection.report())
+    """
+
+    FORMATS = ('html', 'mobiledoc', 'plaintext')
+    """
+    The fields of posts requested with `formats` instead of `fields`.
+    """
+
+    BACKFILL_IDS = 100
+    """
+    The number of items to backfill per request, to keep the URLs short.
+    """
+
+    def __init__(self, always=('id', 'slug', 'updated_at'), learn_calls=1):
+        """
+        Creates a new, empty projection.
+
+        :param always: The fields to always request
+        :param learn_calls: The number of calls to observe
+            from a site before projecting its calls
+        """
+
+        self.always = frozenset(always)
+        self.learn_calls = learn_calls
+
+        self._sites = dict()
+        self._lock = threading.Lock()
+
+    def prepare(self, controller, kwargs):
+        """
+        :param controller: The controller listing the items
+        :param kwargs: The parameters of the listing
+        :return: The `(site, parameters)` to send the request with,
+            the site is `None` when the call is not observed
+        """
+
+        if 'fields' in kwargs:
+            return None, kwargs
+
+        site = self._site(controller)
+
+        with site.lock:
+            if site.calls < self.learn_calls:
+                return site, kwargs
+
+            fields = self.always | site.fields | set([controller._cursor_key])
+
+        kwargs = dict(kwargs)
+        formats = [f for f in self.FORMATS if f in fields]
+
+        if formats and 'formats' not in kwargs:
+            kwargs['formats'] = formats
+
+        kwargs['fields'] = sorted(fields)
+
+        return site, kwargs
+
+    def track(self, site, items, kwargs, size=None):
+        """
+        Observe the field access on the listed items.
+
+        :param site: The site returned by `prepare`
+        :param items: The listed items
+        :param kwargs: The parameters the items were requested with
+        :param size: The size of the response in bytes,
+            or `None` when it was not received from the server (ie. cached)
+        """
+
+        if site is None:
+            return
+
+        projected = frozenset(kwargs['fields']) if 'fields' in kwargs else None
+
+        with site.lock:
+            site.calls += 1
+
+            if projected is None:
+                if size is not None:
+                    site.full_bytes += size
+                    site.full_items += len(items)
+
+                # the fields the resource has, to not request or backfill others
+                for item in items:
+                    site.known.update(dict.keys(item))
+
+            else:
+                site.projected_calls += 1
+
+                if size is not None:
+                    site.projected_bytes += size
+                    site.projected_items += len(items)
+
+        listing = _Listing(site, items[0]._controller, items, projected, kwargs, self.BACKFILL_IDS) if items else None
+
+        for item in items:
+            object.__setattr__(item, '_site', listing)
+
+    def report(self):
+        """
+        :return: The requested fields, the number of calls and backfills,
+            and the average item sizes in bytes with and without
+            projection by call site (`<type>@<file>:<line>`)
+        """
+
+        with self._lock:
+            sites = list(self._sites.values())
+
+        report = dict()
+
+        for site in sites:
+            with site.lock:
+                full = float(site.full_bytes) / site.full_items if site.full_items else None
+                projected = float(site.projected_bytes) / site.projected_items if site.projected_items else None
+
+                report[site.name] = {
+                    'fields': sorted(site.fields),
+                    'calls': site.calls,
+                    'projected_calls': site.projected_calls,
+                    'backfills': site.backfills,
+                    'full_item_bytes': full,
+                    'projected_item_bytes': projected,
+                    'reduction': 1 - projected / full if full and projected is not None else None
+                }
+
+        return report
+
+    def _site(self, controller):
+        frame = sys._getframe(1)
+
+        # the first caller outside of this package
+        while frame is not None and frame.f_code.co_filename.startswith(_PACKAGE_DIR):
+            frame = frame.f_back
+
+        location = (frame.f_code.co_filename, frame.f_lineno) if frame is not None else ('?', 0)
+        key = (controller._type_name,) + location
+
+        with self._lock:
+            site = self._sites.get(key)
+
+            if site is None:
+                site = self._sites[key] = _Site('%s@%s:%d' % key, controller._type_name)
+
+            return site
+
+
+class _Site(object):
+    """
+    The fields read from the items listed by a call site.
+    """
+
+    def __init__(self, name, type_name):
+        self.name = name
+        self.type_name = type_name
+        self.fields = set()
+        self.known = set()
+        self.calls = 0
+        self.projected_calls = 0
+        self.backfills = 0
+        self.full_bytes = 0
+        self.full_items = 0
+        self.projected_bytes = 0
+        self.projected_items = 0
+        self.lock = threading.Lock()
+
+    def has_field(self, field):
+        with self.lock:
+            if field in self.known:
+                return True
+
+        return self.type_name == 'posts' and field in AdaptiveProjection.FORMATS
+
+
+class _Listing(object):
+    """
+    The items of a single listing from a call site, backfilled together
+    when a field that was not requested is read from one of them.
+    """
+
+    def __init__(self, site, controller, items, projected, kwargs, chunk_size):
+        self.site = site
+        self.controller = controller
+        self.items = list(items)
+        self.projected = projected
+        self.kwargs = dict((k, v) for k, v in kwargs.items() if k in ('include', 'status', 'formats'))
+        self.chunk_size = chunk_size
+        self.lock = threading.Lock()
+
+    def access(self, model, field):
+        if not self.site.has_field(field):
+            return  # never returned for this resource
+
+        with self.site.lock:
+            self.site.fields.add(field)
+
+        if self.projected is None or field in self.projected or dict.__contains__(model, field):
+            return
+
+        with self.lock:
+            if field not in self.projected:
+                self._backfill(self.projected | set([field]))
+
+    def _backfill(self, fields):
+        # the items of the listing by their IDs, in chunks to keep the URLs short
+        kwargs = dict(self.kwargs)
+        formats = [f for f in AdaptiveProjection.FORMATS if f in fields]
+
+        if formats:
+            kwargs['formats'] = formats
+
+        kwargs['fields'] = sorted(fields)
+
+        type_name = self.controller._type_name
+        ids = [dict.__getitem__(item, 'id') for item in self.items]
+        full = dict()
+
+        for start in range(0, len(ids), self.chunk_size):
+            chunk = ids[start:start + self.chunk_size]
+
+            kwargs['filter'] = 'id:[%s]' % ','.join(chunk)
+            kwargs['limit'] = len(chunk)
+
+            response = self.controller._execute_get('%s/' % type_name, **kwargs)
+            full.update((item['id'], item) for item in response.get(type_name, []))
+
+        for item in self.items:
+            for key, value in full.get(dict.__getitem__(item, 'id'), {}).items():
+                if not dict.__contains__(item, key):
+                    dict.__setitem__(item, key, value)
+
+        self.projected = frozenset(fields)
+
+        with self.site.lock:
+            self.site.backfills += 1
+
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
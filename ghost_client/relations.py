@@ -0,0 +1,197 @@
+import bisect
+import threading
+
+from .errors import GhostException
+from .indexing import PostIndex
+
+
+class RelationIndex(PostIndex):
+    """
+    In-memory index of the posts of each tag and author, to render
+    archive pages without a filtered request to the server each time.
+
+    For each tag and author (by ID or slug), the index keeps the IDs of
+    its posts in a sorted list, so a page of posts is a slice of that
+    list, answered in time proportional to the size of the page.
+    The index is fed from listings of posts with `include='tags,authors'`
+    (see `add`), and kept up-to-date incrementally (see `indexing.PostIndex`).
+
+    Sample usage:
+
+        index = RelationIndex(ghost)
+        index.add(ghost.posts.list(limit='all', include='tags,authors'))
+
+        for post in index.posts(tag='releases', page=2, limit=10):
+            print(post.title)
+
+        print(index.total(author='jane'))
+
+        # to follow changes
+        receiver.subscribe(index.invalidate)
+    """
+
+    _FETCH_KWARGS = {'include': 'tags,authors'}
+
+    _REFRESH_TYPES = ('tags', 'users')  # renamed tags and authors show up as updated posts
+
+    def __init__(self, ghost, status='published', key='published_at'):
+        """
+        Creates a new, empty index.
+
+        :param ghost: An instance of the API client
+        :param status: The status of the posts to index
+            (`published`, `draft` or `all`)
+        :param key: The field to order the posts by, newest first
+        """
+
+        self.ghost = ghost
+        self.status = status
+        self.key = key
+
+        self._posts = dict()
+        self._related = dict()
+        self._lists = {'tags': dict(), 'authors': dict()}
+        self._slugs = {'tags': dict(), 'authors': dict()}
+        self._since = None
+        self._lock = threading.Lock()
+
+    def add(self, posts):
+        """
+        Add or replace posts in the index.
+        Posts with a different status than the one of the index are removed.
+
+        :param posts: The posts as returned by `posts.list`, `posts.iterate`
+            or `posts.get` with `include='tags,authors'`
+        :return: The number of posts indexed
+        """
+
+        if isinstance(posts, dict):
+            posts = [posts]
+
+        count = 0
+
+        for post in posts:
+            # locked for each post, so reads are not blocked while fetching
+            with self._lock:
+                self._delete(post['id'])
+
+                if post.get('updated_at') and post['updated_at'] > (self._since or ''):
+                    self._since = post['updated_at']
+
+                if self.status != 'all' and post.get('status', 'published') != self.status:
+                    continue
+
+                self._store(post)
+                count += 1
+
+        return count
+
+    def remove(self, id):
+        """
+        Remove a post from the index.
+
+        :param id: The ID of the post
+        :return: `True` if the post was in the index
+        """
+
+        with self._lock:
+            return self._delete(id)
+
+    def posts(self, tag=None, author=None, page=1, limit=15):
+        """
+        Fetch a page of the posts of a tag or an author from the index.
+
+        :param tag: The ID or slug of the tag
+        :param author: The ID or slug of the author
+        :param page: The number of the page, starting from 1
+        :param limit: The number of posts per page
+        :return: The list of posts on the page, newest first
+        """
+
+        with self._lock:
+            entries = self._entries(tag, author)
+
+            end = len(entries) - (page - 1) * limit
+            start = max(0, end - limit)
+
+            if end <= 0:
+                return []
+
+            return [self._posts[id] for _, id in reversed(entries[start:end])]
+
+    def total(self, tag=None, author=None):
+        """
+        :param tag: The ID or slug of the tag
+        :param author: The ID or slug of the author
+        :return: The number of posts of the tag or the author
+        """
+
+        with self._lock:
+            return len(self._entries(tag, author))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._posts)
+
+    def _indexed_ids(self):
+        with self._lock:
+            return list(self._posts)
+
+    def _last_updated(self):
+        with self._lock:
+            return self._since
+
+    def _entries(self, tag, author):
+        if (tag is None) == (author is None):
+            raise GhostException(500, 'Either the tag or the author needs to be specified')
+
+        kind, value = ('tags', tag) if tag is not None else ('authors', author)
+        value = self._slugs[kind].get(value, value)
+
+        return self._lists[kind].get(value, ())
+
+    def _store(self, post):
+        entry = (post.get(self.key) or '', post['id'])
+        related = list()
+
+        for kind, items in (('tags', post.get('tags')), ('authors', self._authors(post))):
+            for item in items or ():
+                if not item.get('id') or (kind, item['id']) in related:
+                    continue
+
+                if item.get('slug'):
+                    self._slugs[kind][item['slug']] = item['id']
+
+                bisect.insort(self._lists[kind].setdefault(item['id'], list()), entry)
+                related.append((kind, item['id']))
+
+        self._posts[post['id']] = post
+        self._related[post['id']] = (entry, related)
+
+    def _delete(self, id):
+        if id not in self._posts:
+            return False
+
+        del self._posts[id]
+        entry, related = self._related.pop(id)
+
+        for kind, related_id in related:
+            entries = self._lists[kind][related_id]
+            position = bisect.bisect_left(entries, entry)
+
+            if position < len(entries) and entries[position] == entry:
+                del entries[position]
+
+            if not entries:
+                del self._lists[kind][related_id]
+
+        return True
+
+    @staticmethod
+    def _authors(post):
+        if post.get('authors'):
+            return post['authors']
+
+        # a single, included author on older versions
+        author = post.get('author')
+        return [author] if isinstance(author, dict) else []
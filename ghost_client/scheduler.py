@@ -0,0 +1,233 @@
+import contextlib
+import threading
+import time
+from collections import deque
+
+from .errors import GhostException
+from .helpers import reset_after_fork
+from .metrics import Metrics
+
+
+class Scheduler(object):
+    """
+    Schedules the requests sent by a client by priority class.
+
+    Each class has a bound on its concurrent requests, and the total
+    number of concurrent requests can be bounded too. When requests
+    are waiting for a free slot, the ones in the class with the
+    highest priority are sent first, so interactive requests do not
+    queue up behind a background listing of thousands of items.
+    Each class keeps its waiting requests in order, and a freed slot
+    is handed to the first one that can take it, waking only its thread.
+
+    The priority class is set per thread with `priority()`,
+    and the time spent waiting is recorded in the `scheduler.wait`
+    timing of `metrics`, labelled by class.
+
+    When one scheduler is shared by clients of different servers,
+    the concurrent requests to each server can be capped with
+    `per_host`, and the clients send their requests through the
+    view returned by `host()` for their server.
+
+    Sample usage:
+
+        ghost = Ghost('http://localhost:2368', admin_key='...', scheduler=Scheduler())
+
+        # in the background worker
+        with ghost.scheduler.priority('background'):
+            posts = ghost.posts.list(limit=100)
+
+            while posts:
+                posts = posts.next_page()
+
+        # in the request handler, using the default `interactive` class
+        ghost.posts.update(post_id, title='Changed')
+    """
+
+    DEFAULT_CLASSES = (('interactive', 8), ('background', 2))
+    """
+    The default priority classes with their concurrency limits, highest priority first.
+    """
+
+    def __init__(
+            self, classes=DEFAULT_CLASSES, max_concurrency=None,
+            default='interactive', per_host=None, metrics=None
+    ):
+        """
+        Creates a new scheduler.
+
+        :param classes: The `(name, concurrency limit)` pairs
+            of the priority classes, highest priority first
+        :param max_concurrency: The maximum number of concurrent requests
+            across all classes (default: the sum of the class limits)
+        :param default: The class of requests sent outside of `priority()`
+        :param per_host: The maximum number of concurrent requests
+            to a single server sent through `host()` views (optional)
+        :param metrics: The `metrics.Metrics` to report to (optional)
+        """
+
+        self.classes = [name for name, _ in classes]
+        self.limits = dict(classes)
+        self.max_concurrency = max_concurrency or sum(self.limits.values())
+        self.default = default
+        self.per_host = per_host
+        self.metrics = metrics or Metrics()
+
+        self._after_fork()
+        reset_after_fork(self)
+
+        for name in self.classes:
+            self.metrics.gauge('scheduler.queued', self._queued_counter(name), priority=name)
+
+    @contextlib.contextmanager
+    def priority(self, name):
+        """
+        Send the requests of the current thread with the given priority class.
+
+        :param name: The name of the priority class
+        """
+
+        if name not in self.limits:
+            raise GhostException(400, 'Unknown priority class: %s' % name)
+
+        previous = getattr(self._local, 'priority', None)
+        self._local.priority = name
+
+        try:
+            yield
+
+        finally:
+            self._local.priority = previous
+
+    @property
+    def current_priority(self):
+        """
+        :return: The priority class of the current thread
+        """
+
+        return getattr(self._local, 'priority', None) or self.default
+
+    def host(self, host):
+        """
+        :param host: The server address (ie. `blog.example.com:443`)
+        :return: A view of this scheduler that counts the requests
+            sent through it towards the `per_host` limit of the server
+        """
+
+        return _HostScheduler(self, host)
+
+    def call(self, request, *args, **kwargs):
+        """
+        Send a request when a slot is available for its class.
+
+        :param request: The function sending the request
+        :param args: The positional arguments of the function
+        :param kwargs: The keyword arguments of the function
+        :return: The response of the request
+        """
+
+        return self._call(None, request, args, kwargs)
+
+    def _call(self, host, request, args, kwargs):
+        name = self.current_priority
+
+        self._acquire(name, host)
+
+        try:
+            return request(*args, **kwargs)
+
+        finally:
+            self._release(name, host)
+
+    def _after_fork(self):
+        # requests in flight belong to the threads of the parent process
+        self._running = dict((name, 0) for name in self.classes)
+        self._total = 0
+        self._hosts = dict()
+        self._queues = dict((name, deque()) for name in self.classes)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _acquire(self, name, host=None):
+        started = time.time()
+        waiter = _Waiter(host)
+
+        with self._lock:
+            self._queues[name].append(waiter)
+            self._dispatch()
+
+        waiter.granted.wait()
+
+        self.metrics.observe('scheduler.wait', time.time() - started, priority=name)
+
+    def _release(self, name, host=None):
+        with self._lock:
+            self._running[name] -= 1
+            self._total -= 1
+
+            if host is not None:
+                self._hosts[host] -= 1
+
+                if not self._hosts[host]:
+                    del self._hosts[host]
+
+            self._dispatch()
+
+    def _dispatch(self):
+        # hands the free slots to the first waiting requests that can take them, by priority
+        for name in self.classes:
+            queue = self._queues[name]
+
+            while queue and self._total < self.max_concurrency and self._running[name] < self.limits[name]:
+                waiter = self._first_available(queue)
+
+                if waiter is None:
+                    break  # all waiting for busy servers
+
+                self._running[name] += 1
+                self._total += 1
+
+                if waiter.host is not None:
+                    self._hosts[waiter.host] = self._hosts.get(waiter.host, 0) + 1
+
+                waiter.granted.set()
+
+    def _first_available(self, queue):
+        for index, waiter in enumerate(queue):
+            if self._host_available(waiter.host):
+                del queue[index]
+                return waiter
+
+        return None
+
+    def _host_available(self, host):
+        return host is None or self.per_host is None or self._hosts.get(host, 0) < self.per_host
+
+    def _queued_counter(self, name):
+        return lambda: len(self._queues[name])
+
+
+class _Waiter(object):
+    """
+    A request waiting for a slot, woken when it is handed one.
+    """
+
+    def __init__(self, host):
+        self.host = host
+        self.granted = threading.Event()
+
+
+class _HostScheduler(object):
+    """
+    View of a `Scheduler` sending the requests of a single server.
+    """
+
+    def __init__(self, scheduler, host):
+        self.scheduler = scheduler
+        self.host = host
+
+    def call(self, request, *args, **kwargs):
+        return self.scheduler._call(self.host, request, args, kwargs)
+
+    def __getattr__(self, item):
+        return getattr(self.scheduler, item)
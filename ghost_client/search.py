@@ -0,0 +1,219 @@
+import re
+import sqlite3
+import threading
+from collections import namedtuple
+
+from .errors import GhostException
+from .indexing import PostIndex
+
+
+SearchHit = namedtuple('SearchHit', 'id slug title snippet rank')
+"""
+A post matching a search, with a `snippet` of the matching text
+and its `rank` (lower is better).
+"""
+
+
+class SearchIndex(PostIndex):
+    """
+    Local full-text search index of posts in SQLite FTS5,
+    answering ranked queries without a request to the server.
+
+    The index is fed from listings of posts (see `add`), and kept
+    up-to-date incrementally (see `indexing.PostIndex`).
+    Titles weigh more than excerpts and tags, which weigh more
+    than the text of the posts.
+
+    Sample usage:
+
+        index = SearchIndex(ghost, '/var/cache/ghost-search.db')
+        index.refresh()
+
+        for hit in index.search('release not'):
+            print(hit.title, hit.snippet)
+
+        # to follow changes
+        receiver.subscribe(index.invalidate)
+    """
+
+    _SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS documents ('
+        ' rowid INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL,'
+        ' slug TEXT, status TEXT, updated_at TEXT)',
+        'CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5('
+        ' title, custom_excerpt, tags, plaintext, tokenize=\'porter unicode61\')',
+        'CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)'
+    )
+
+    _WEIGHTS = (10.0, 4.0, 4.0, 1.0)
+
+    _FETCH_KWARGS = {'formats': 'plaintext', 'include': 'tags'}
+
+    _REFRESH_TYPES = ('tags',)  # renamed tags show up as updated posts
+
+    BATCH_SIZE = 100
+    """
+    The number of posts to write to the index in one transaction.
+    """
+
+    _TOKEN = re.compile(r'\w+', re.UNICODE)
+
+    def __init__(self, ghost, path=':memory:', status='published'):
+        """
+        Creates a new index, or opens an existing one.
+
+        :param ghost: An instance of the API client
+        :param path: The path of the SQLite database (default: in memory)
+        :param status: The status of the posts to return from searches
+            (`published`, `draft` or `all`)
+        """
+
+        self.ghost = ghost
+        self.path = path
+        self.status = status
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+
+        try:
+            with self._connection:
+                for statement in self._SCHEMA:
+                    self._connection.execute(statement)
+
+        except sqlite3.OperationalError as ex:
+            self._connection.close()
+            raise GhostException(500, 'Failed to create the search index (is FTS5 available?): %s' % ex)
+
+    def add(self, posts):
+        """
+        Add or replace posts in the index.
+
+        :param posts: The posts as returned by `posts.list`, `posts.iterate`
+            or `posts.get` with `formats='plaintext'` and `include='tags'`
+        :return: The number of posts indexed
+        """
+
+        if isinstance(posts, dict):
+            posts = [posts]
+
+        count, batch = 0, list()
+
+        for post in posts:
+            batch.append(post)
+
+            if len(batch) >= self.BATCH_SIZE:
+                count += self._write(batch)
+                batch = list()
+
+        return count + self._write(batch)
+
+    def remove(self, id):
+        """
+        Remove a post from the index.
+
+        :param id: The ID of the post
+        :return: `True` if the post was in the index
+        """
+
+        with self._lock, self._connection:
+            return self._delete(id)
+
+    def search(self, query, limit=10):
+        """
+        Find the posts matching all words of a query,
+        the last word also matching as a prefix.
+
+        :param query: The words to search for
+        :param limit: The maximum number of results
+        :return: The list of matching `SearchHit` items, best first
+        """
+
+        words = self._TOKEN.findall(query)
+
+        if not words:
+            return []
+
+        expression = ' '.join('"%s"' % word for word in words) + '*'
+
+        sql = (
+            'SELECT d.id, d.slug, s.title, snippet(search, 3, \'[\', \']\', \'...\', 12), '
+            ' bm25(search, %s) AS rank'
+            ' FROM search AS s JOIN documents AS d ON d.rowid = s.rowid'
+            ' WHERE search MATCH ?%s'
+            ' ORDER BY rank LIMIT ?'
+        ) % (
+            ', '.join(str(weight) for weight in self._WEIGHTS),
+            ' AND d.status = ?' if self.status != 'all' else ''
+        )
+
+        params = [expression] + ([self.status] if self.status != 'all' else []) + [limit]
+
+        with self._lock:
+            return [SearchHit(*row) for row in self._connection.execute(sql, params)]
+
+    def close(self):
+        """
+        Close the database of the index.
+        """
+
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+
+    def _write(self, posts):
+        # short transactions, so searches are not blocked while fetching
+        with self._lock, self._connection:
+            for post in posts:
+                self._store(post)
+
+        return len(posts)
+
+    def _store(self, post):
+        self._delete(post['id'])
+
+        cursor = self._connection.execute(
+            'INSERT INTO documents (id, slug, status, updated_at) VALUES (?, ?, ?, ?)',
+            (post['id'], post.get('slug'), post.get('status'), post.get('updated_at'))
+        )
+
+        tags = ' '.join(tag.get('name') or '' for tag in post.get('tags') or [])
+
+        self._connection.execute(
+            'INSERT INTO search (rowid, title, custom_excerpt, tags, plaintext) VALUES (?, ?, ?, ?, ?)',
+            (cursor.lastrowid, post.get('title') or '', post.get('custom_excerpt') or '',
+             tags, post.get('plaintext') or '')
+        )
+
+        if post.get('updated_at') and post['updated_at'] > (self._read_state('updated_at') or ''):
+            self._connection.execute(
+                'INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)', ('updated_at', post['updated_at'])
+            )
+
+    def _delete(self, id):
+        row = self._connection.execute('SELECT rowid FROM documents WHERE id = ?', (id,)).fetchone()
+
+        if row is None:
+            return False
+
+        self._connection.execute('DELETE FROM search WHERE rowid = ?', row)
+        self._connection.execute('DELETE FROM documents WHERE rowid = ?', row)
+
+        return True
+
+    def _indexed_ids(self):
+        with self._lock:
+            return [row[0] for row in self._connection.execute('SELECT id FROM documents')]
+
+    def _last_updated(self):
+        return self._get_state('updated_at')
+
+    def _get_state(self, key):
+        with self._lock:
+            return self._read_state(key)
+
+    def _read_state(self, key):
+        row = self._connection.execute('SELECT value FROM state WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
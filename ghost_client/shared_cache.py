@@ -0,0 +1,384 @@
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+from .cache import ResponseCache
+from .errors import GhostException
+from .helpers import reset_after_fork
+
+
+class SharedResponseCache(ResponseCache):
+    """
+    Cache for the responses of `Ghost.execute_get` in a memory-mapped
+    file, shared by all processes opening the same file, like the
+    workers of a web server on the same host, so they keep a single
+    warm copy of the responses instead of one each.
+
+    The responses are stored as their serialized bodies in a ring of
+    `size` bytes, the oldest overwritten first, and indexed by a table
+    of `slots` entries, where the least recently used entry of a group
+    of `WAYS` is replaced when the group is full. Reads do not take
+    locks: each entry has a sequence number, changed before and after
+    it is written, and reads that overlap a write are retried.
+    Writes and invalidations are serialized with a lock on the file
+    (with `fcntl`, so this cache is only available on POSIX systems).
+    Entries expire after `ttl` seconds and are tagged like the ones of
+    `ResponseCache`, so they can be invalidated the same way. The tags
+    are kept in the table as a small Bloom filter, so invalidations only
+    scan the table, without reading the responses, and lock it only to
+    drop the matching entries (and a few more, on false positives).
+
+    Sample usage:
+
+        cache = SharedResponseCache('/dev/shm/ghost-cache', ttl=300, size=256 * 1024 * 1024)
+        ghost = Ghost('http://localhost:2368', admin_key='...', cache=cache)
+    """
+
+    WAYS = 8
+    """
+    The number of slots a key can be stored in.
+    """
+
+    RETRIES = 3
+    """
+    The number of times to retry a read that overlapped a write.
+    """
+
+    _MAGIC = b'GHOSTRC2'
+    _HEADER = struct.Struct('<8sQQQ')  # magic, slots, size, write position
+    _HEADER_SIZE = 64
+    _SLOT = struct.Struct('<QQQQdd32s')  # sequence, key hash, offset, length, created, accessed, tags
+    _RECORD = struct.Struct('<II')  # key and body lengths
+
+    def __init__(self, path, ttl=60, size=64 * 1024 * 1024, slots=16384):
+        """
+        Opens a shared cache, creating it when the file does not exist yet.
+
+        :param path: The file to map, preferably on a memory
+            file system, like `/dev/shm` on Linux
+        :param ttl: The number of seconds to keep entries for
+        :param size: The number of bytes to keep responses in
+        :param slots: The maximum number of entries, a multiple of `WAYS`
+        """
+
+        if slots % self.WAYS:
+            raise GhostException(500, 'The number of slots needs to be a multiple of %d' % self.WAYS)
+
+        self.path = path
+        self.ttl = ttl
+        self.size = size
+        self.slots = slots
+        self.max_entries = slots
+
+        self._data_start = self._HEADER_SIZE + slots * self._SLOT.size
+
+        self._open()
+        reset_after_fork(self)
+
+    def get_with_age(self, key):
+        """
+        :param key: The key of the entry (the URL of the request)
+        :return: The cached response and its age in seconds,
+            or `(None, None)` if missing or expired
+        """
+
+        key = key.encode('utf-8')
+        key_hash = _hash(key)
+
+        for slot in self._bucket(key_hash):
+            found = self._read(slot, key_hash, key)
+
+            if found is not None:
+                body, created = found
+                age = time.time() - created
+
+                if age > self.ttl:
+                    return None, None
+
+                # not locked, the last access is only a hint for the eviction
+                struct.pack_into('<d', self._map, self._slot_offset(slot) + 40, time.time())
+
+                return json.loads(body.decode('utf-8')), age
+
+        return None, None
+
+    def set(self, key, resource, body, data):
+        """
+        Store a response.
+
+        :param key: The key of the entry (the URL of the request)
+        :param resource: The resource the request was sent for
+        :param body: The serialized response body
+        :param data: The deserialized response
+        """
+
+        if not isinstance(body, bytes):
+            body = body.encode('utf-8')
+
+        key = key.encode('utf-8')
+        tags = _tag_bits(self._tags(resource, data)).to_bytes(32, 'little')
+        record = self._RECORD.pack(len(key), len(body)) + key + body
+
+        if len(record) > self.size // 8:
+            return  # would push out too many others
+
+        key_hash = _hash(key)
+
+        with self._write_lock():
+            slot = self._choose_slot(key_hash)
+            offset = self._append(record)
+
+            now = time.time()
+            self._write_slot(slot, key_hash, offset, len(record), now, now, tags)
+
+    def discard(self, key):
+        """
+        Drop a single entry if present.
+
+        :param key: The key of the entry (the URL of the request)
+        """
+
+        key = key.encode('utf-8')
+        key_hash = _hash(key)
+
+        with self._write_lock():
+            for slot in self._bucket(key_hash):
+                if self._read(slot, key_hash, key) is not None:
+                    self._clear_slot(slot)
+
+    def invalidate(self, type_name=None, id=None, slug=None):
+        """
+        Drop the entries containing the given resource, and the
+        listings of its type, which may now have different results.
+        Drops everything when no type is given.
+
+        :param type_name: The type of the resource (ie. `posts`)
+        :param id: The ID of the resource
+        :param slug: The slug of the resource
+        """
+
+        if type_name is None:
+            with self._write_lock():
+                for slot in range(self.slots):
+                    self._clear_slot(slot)
+
+            return
+
+        targets = [_tag_bits([(type_name, None)])]
+
+        if id:
+            targets.append(_tag_bits([(type_name, 'id:%s' % id)]))
+
+        if slug:
+            targets.append(_tag_bits([(type_name, 'slug:%s' % slug)]))
+
+        # the table is scanned without the lock, and the matches checked again with it
+        table = self._map[self._HEADER_SIZE:self._data_start]
+        matches = [
+            slot for slot, entry in enumerate(self._SLOT.iter_unpack(table))
+            if entry[1] and _matches(entry[6], targets)
+        ]
+
+        if not matches:
+            return
+
+        with self._write_lock():
+            for slot in matches:
+                entry = self._SLOT.unpack_from(self._map, self._slot_offset(slot))
+
+                if entry[1] and _matches(entry[6], targets):
+                    self._clear_slot(slot)
+
+    def close(self):
+        """
+        Unmap the file, it is kept for the other processes.
+        """
+
+        self._map.close()
+        os.close(self._fd)
+
+    def __len__(self):
+        now = time.time()
+
+        return sum(1 for slot in range(self.slots) if self._read_record(slot, now) is not None)
+
+    def __reduce__(self):
+        # opens the same file in the other process
+        return type(self), (self.path, self.ttl, self.size, self.slots)
+
+    def _open(self):
+        self._lock = threading.Lock()
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+
+        total = self._data_start + self.size
+
+        with self._write_lock():
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, total)
+
+            self._map = mmap.mmap(self._fd, 0)
+            magic, slots, size, _ = self._HEADER.unpack_from(self._map, 0)
+
+            if magic == b'\0' * 8:
+                self._HEADER.pack_into(self._map, 0, self._MAGIC, self.slots, self.size, 0)
+                return
+
+        if (magic, slots, size) != (self._MAGIC, self.slots, self.size) or len(self._map) != total:
+            self.close()
+            raise GhostException(500, 'The shared cache in %s has a different format or size' % self.path)
+
+    def _after_fork(self):
+        # a new open file, as the locks on a shared one would not exclude the parent
+        self._map.close()
+        os.close(self._fd)
+        self._open()
+
+    def _write_lock(self):
+        return _FileLock(self._lock, self._fd)
+
+    def _bucket(self, key_hash):
+        first = (key_hash % (self.slots // self.WAYS)) * self.WAYS
+        return range(first, first + self.WAYS)
+
+    def _slot_offset(self, slot):
+        return self._HEADER_SIZE + slot * self._SLOT.size
+
+    def _write_position(self):
+        return self._HEADER.unpack_from(self._map, 0)[3]
+
+    def _read(self, slot, key_hash, key):
+        found = self._read_record(slot, key_hash=key_hash)
+
+        if found is not None and found[0] == key:
+            return found[1], found[2]
+
+    def _read_record(self, slot, now=None, key_hash=None):
+        # returns (key, body, created) of a valid entry, without locking
+        for _ in range(self.RETRIES):
+            sequence, stored_hash, offset, length, created, _, _ = self._SLOT.unpack_from(
+                self._map, self._slot_offset(slot)
+            )
+
+            if sequence & 1:
+                continue  # being written
+
+            if not stored_hash or (key_hash is not None and stored_hash != key_hash):
+                return None
+
+            start = self._data_start + offset % self.size
+            record = self._map[start:start + length]
+
+            if self._SLOT.unpack_from(self._map, self._slot_offset(slot))[0] != sequence:
+                continue  # changed while reading
+
+            if self._write_position() - offset > self.size:
+                return None  # overwritten by newer entries
+
+            if now is not None and now - created > self.ttl:
+                return None
+
+            key_length, body_length = self._RECORD.unpack_from(record, 0)
+            position = self._RECORD.size
+
+            key = record[position:position + key_length]
+            body = record[position + key_length:position + key_length + body_length]
+
+            return key, body, created
+
+        return None
+
+    def _choose_slot(self, key_hash):
+        # the slot of the same key, or an empty one, or the least recently used
+        now, chosen, oldest = time.time(), None, None
+
+        for slot in self._bucket(key_hash):
+            _, stored_hash, offset, _, created, accessed, _ = self._SLOT.unpack_from(self._map, self._slot_offset(slot))
+
+            if stored_hash == key_hash:
+                return slot
+
+            if not stored_hash or now - created > self.ttl or self._write_position() - offset > self.size:
+                accessed = 0.0
+
+            if oldest is None or accessed < oldest:
+                chosen, oldest = slot, accessed
+
+        return chosen
+
+    def _append(self, record):
+        position = self._write_position()
+
+        if position % self.size + len(record) > self.size:
+            position += self.size - position % self.size  # wrap around instead of splitting
+
+        # moved ahead first, so readers can tell when the data they read is overwritten
+        self._HEADER.pack_into(self._map, 0, self._MAGIC, self.slots, self.size, position + len(record))
+
+        start = self._data_start + position % self.size
+        self._map[start:start + len(record)] = record
+
+        return position
+
+    def _write_slot(self, slot, key_hash, offset, length, created, accessed, tags):
+        slot_offset = self._slot_offset(slot)
+        sequence = self._SLOT.unpack_from(self._map, slot_offset)[0]
+
+        struct.pack_into('<Q', self._map, slot_offset, sequence + 1)
+        self._SLOT.pack_into(self._map, slot_offset, sequence + 1, key_hash, offset, length, created, accessed, tags)
+        struct.pack_into('<Q', self._map, slot_offset, sequence + 2)
+
+    def _clear_slot(self, slot):
+        self._write_slot(slot, 0, 0, 0, 0.0, 0.0, _NO_TAGS)
+
+
+class _FileLock(object):
+    """
+    Excludes the other threads of this process, then the other processes.
+    """
+
+    def __init__(self, lock, fd):
+        self.lock = lock
+        self.fd = fd
+
+    def __enter__(self):
+        self.lock.acquire()
+
+        try:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+
+        except Exception:
+            self.lock.release()
+            raise
+
+    def __exit__(self, *args):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.lock.release()
+
+
+_NO_TAGS = b'\0' * 32
+
+
+def _hash(key):
+    # 64 bits, never 0, which marks empty slots
+    return struct.unpack('<Q', hashlib.blake2b(key, digest_size=8).digest())[0] or 1
+
+
+def _tag_bits(tags):
+    # a Bloom filter of 256 bits, with 2 bits set per tag
+    bits = 0
+
+    for tag in tags:
+        digest = hashlib.blake2b(json.dumps(tag).encode('utf-8'), digest_size=2).digest()
+        bits |= (1 << digest[0]) | (1 << digest[1])
+
+    return bits
+
+
+def _matches(tags, targets):
+    bits = int.from_bytes(tags, 'little')
+    return any(bits & target == target for target in targets)
@@ -0,0 +1,202 @@
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from six.moves.urllib.parse import urlparse
+
+from .api import Ghost
+from .errors import GhostException
+from .helpers import reset_after_fork
+from .metrics import Metrics
+from .scheduler import Scheduler
+from .transport import RequestsTransport
+
+
+SiteResult = namedtuple('SiteResult', 'site result error')
+"""
+The outcome of a call on one site in `SiteManager.fan_out`:
+its `result`, or the `error` it raised.
+"""
+
+
+class SiteManager(object):
+    """
+    Holds the credentials of many Ghost sites and creates
+    their clients lazily, on first use.
+
+    The clients share one transport, with at most `per_host`
+    connections to each server by default, and one `scheduler.Scheduler` that
+    caps the concurrent requests to each server the same way, so
+    a slow site cannot use up the capacity meant for the others.
+    The clients report to the shared `metrics` registry.
+
+    Sample usage:
+
+        sites = SiteManager(per_host=4)
+        sites.add('blog', 'https://blog.example.com', admin_key='...')
+        sites.add('docs', 'https://docs.example.com', admin_key='...')
+
+        print(sites['blog'].posts.list(limit=5))
+
+        # run the same call on every site, as the responses arrive
+        for site, posts, error in sites.fan_out('posts.list', kwargs={'filter': 'featured:true'}):
+            print(site, error or len(posts))
+    """
+
+    def __init__(self, per_host=4, max_hosts=1024, workers=16, scheduler=None, transport=None, **client_kwargs):
+        """
+        Creates a new, empty manager.
+
+        :param per_host: The maximum number of concurrent connections to a server
+        :param max_hosts: The maximum number of servers to keep connections open to
+        :param workers: The number of threads running `fan_out` calls
+        :param scheduler: The `scheduler.Scheduler` shared by the clients
+            (default: one with the `per_host` limit, and `workers` concurrent
+            requests in total, a quarter of them for the `background` class)
+        :param transport: The `transport.Transport` shared by the clients
+            (default: a `transport.RequestsTransport` with the `per_host` limit)
+        :param client_kwargs: Default parameters of the `Ghost` clients
+        """
+
+        self.per_host = per_host
+        self.max_hosts = max_hosts
+        self.workers = workers
+        self.metrics = Metrics()
+
+        if scheduler is None:
+            # only capped per server, the total is bounded by the `fan_out` workers
+            scheduler = Scheduler(
+                classes=(('interactive', workers), ('background', max(1, workers // 4))),
+                max_concurrency=workers, per_host=per_host, metrics=self.metrics
+            )
+
+        self.scheduler = scheduler
+        self.transport = transport or RequestsTransport(pool_size=per_host, max_hosts=max_hosts)
+        self.client_kwargs = client_kwargs
+
+        self._sites = dict()
+        self._clients = dict()
+
+        self._after_fork()
+        reset_after_fork(self)
+
+    def add(self, name, base_url, **kwargs):
+        """
+        Register a site, without connecting to it yet.
+
+        :param name: The unique name of the site
+        :param base_url: The base url of the server
+        :param kwargs: The credentials and other parameters
+            of the `Ghost` client (ie. `admin_key`)
+        """
+
+        with self._lock:
+            if name in self._sites:
+                raise GhostException(400, 'Duplicate site: %s' % name)
+
+            self._sites[name] = (base_url, kwargs)
+
+    def remove(self, name):
+        """
+        Unregister a site and drop its client.
+
+        :param name: The name of the site
+        """
+
+        with self._lock:
+            self._sites.pop(name, None)
+            self._clients.pop(name, None)
+
+    @property
+    def sites(self):
+        """
+        :return: The names of the registered sites
+        """
+
+        with self._lock:
+            return list(self._sites)
+
+    def get(self, name):
+        """
+        :param name: The name of the site
+        :return: The client of the site, created on the first call
+        """
+
+        with self._lock:
+            client = self._clients.get(name)
+
+            if client is None:
+                if name not in self._sites:
+                    raise GhostException(404, 'Unknown site: %s' % name)
+
+                client = self._clients[name] = self._create_client(*self._sites[name])
+
+            return client
+
+    def __getitem__(self, item):
+        return self.get(item)
+
+    def __contains__(self, item):
+        return item in self._sites
+
+    def __len__(self):
+        return len(self._sites)
+
+    def fan_out(self, call, args=(), kwargs=None, sites=None):
+        """
+        Run the same call on many sites concurrently,
+        and yield the outcomes in the order they complete.
+
+        :param call: The method of the client to call as a dotted path
+            (ie. `posts.list`), or a function taking the client as its
+            first parameter
+        :param args: The positional arguments of the call
+        :param kwargs: The keyword arguments of the call
+        :param sites: The names of the sites to call (default: all of them)
+        :return: A generator of `SiteResult` items
+        """
+
+        kwargs = kwargs or dict()
+        sites = self.sites if sites is None else list(sites)
+
+        futures = dict(
+            (self._pool.submit(self._run, name, call, args, kwargs), name)
+            for name in sites
+        )
+
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+
+        finally:
+            # when the caller stops early, do not start the remaining calls
+            for future in futures:
+                future.cancel()
+
+    def _run(self, name, call, args, kwargs):
+        try:
+            client = self.get(name)
+
+            if callable(call):
+                return SiteResult(name, call(client, *args, **kwargs), None)
+
+            target = client
+
+            for part in call.split('.'):
+                target = getattr(target, part)
+
+            return SiteResult(name, target(*args, **kwargs), None)
+
+        except Exception as ex:
+            return SiteResult(name, None, ex)
+
+    def _create_client(self, base_url, kwargs):
+        options = dict(self.client_kwargs)
+        options.update(kwargs)
+        options.setdefault('scheduler', self.scheduler.host(urlparse(base_url).netloc))
+
+        return Ghost(base_url, transport=self.transport, metrics=self.metrics, **options)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
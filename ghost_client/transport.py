@@ -0,0 +1,209 @@
+from .helpers import reset_after_fork
+
+
+class Transport(object):
+    """
+    Sends the HTTP requests of a client.
+
+    Implementations return responses with at least `status_code`,
+    `headers`, `content` and `json()`, and raise the exceptions of
+    `requests` for connection errors and timeouts, so the rest of
+    the client works the same with any of them.
+    They replace their connections in the child process after a fork.
+    Transports are pickled as their settings (see `config.ClientConfig`),
+    the ones that do not define `__reduce__` to recreate themselves are
+    replaced by a default `RequestsTransport` in the other process.
+    """
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request.
+
+        :param method: The HTTP method
+        :param url: The URL to send the request to
+        :param kwargs: The `headers`, `params`, `json`, `data` or `files` of the request
+        :return: The response
+        """
+
+        raise NotImplementedError()
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def received_bytes(self, response):
+        """
+        :param response: A response returned by this transport
+        :return: The number of bytes of the body as transferred
+            (before decompression), or `None` if not known
+        """
+
+        return None
+
+    def sent_bytes(self, response):
+        """
+        :param response: A response returned by this transport
+        :return: The number of bytes of the request body sent, or `None` if not known
+        """
+
+        return None
+
+    def close(self):
+        """
+        Close the open connections.
+        """
+
+    def __reduce__(self):
+        return RequestsTransport, ()
+
+    def _after_fork(self):
+        pass
+
+
+class RequestsTransport(Transport):
+    """
+    HTTP/1.1 transport using `requests`, with a pool of
+    connections for each server. This is the default one.
+    """
+
+    def __init__(self, pool_size=10, max_hosts=10):
+        """
+        Creates a new transport.
+
+        :param pool_size: The number of connections to keep open to each server
+        :param max_hosts: The number of servers to keep connections open to
+        """
+
+        self.pool_size = pool_size
+        self.max_hosts = max_hosts
+
+        self._after_fork()
+        reset_after_fork(self)
+
+    def request(self, method, url, **kwargs):
+        return self.session.request(method, url, **kwargs)
+
+    def received_bytes(self, response):
+        # the number of bytes read from the connection
+        return response.raw.tell() if hasattr(response.raw, 'tell') else None
+
+    def sent_bytes(self, response):
+        body = response.request.body
+        return len(body) if body is not None else None
+
+    def close(self):
+        self.session.close()
+
+    def __reduce__(self):
+        return RequestsTransport, (self.pool_size, self.max_hosts)
+
+    def _after_fork(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_hosts, pool_maxsize=self.pool_size)
+
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        self.session = session
+
+
+class HTTPXTransport(Transport):
+    """
+    HTTP/2 transport using `httpx` (pip install httpx[http2]),
+    which multiplexes concurrent requests as streams over
+    a single connection to each server.
+
+    HTTP/2 is negotiated with the server over TLS, so for `http://`
+    servers (like one behind a proxy terminating TLS) it is only used
+    with `http1=False`, when the server is known to support it.
+
+    Sample usage:
+
+        ghost = Ghost('https://blog.example.com', admin_key='...', transport=HTTPXTransport())
+    """
+
+    def __init__(self, http2=True, http1=True, max_connections=10, timeout=60.0):
+        """
+        Creates a new transport.
+
+        :param http2: Whether to use HTTP/2 when the server supports it
+        :param http1: Whether to allow HTTP/1.1, without it HTTP/2 is used
+            with prior knowledge, also for `http://` servers
+        :param max_connections: The maximum number of connections to keep open
+        :param timeout: The timeout of requests in seconds
+        """
+
+        try:
+            import httpx
+
+        except ImportError:
+            from .errors import GhostException
+            raise GhostException(500, 'The HTTP/2 transport needs httpx: pip install httpx[http2]')
+
+        self.http2 = http2
+        self.http1 = http1
+        self.max_connections = max_connections
+        self.timeout = timeout
+
+        self._httpx = httpx
+
+        self._after_fork()
+        reset_after_fork(self)
+
+    def request(self, method, url, **kwargs):
+        import requests
+
+        try:
+            return self.client.request(method, url, **self._convert(kwargs))
+
+        except self._httpx.TimeoutException as ex:
+            raise requests.Timeout(str(ex))
+
+        except self._httpx.TransportError as ex:
+            raise requests.ConnectionError(str(ex))
+
+    def received_bytes(self, response):
+        return response.num_bytes_downloaded
+
+    def sent_bytes(self, response):
+        # the body of multipart uploads is streamed and not kept
+        try:
+            return len(response.request.content)
+
+        except self._httpx.RequestNotRead:
+            return None
+
+    def close(self):
+        self.client.close()
+
+    def __reduce__(self):
+        return HTTPXTransport, (self.http2, self.http1, self.max_connections, self.timeout)
+
+    def _after_fork(self):
+        self.client = self._httpx.Client(
+            http1=self.http1, http2=self.http2, timeout=self.timeout,
+            limits=self._httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            )
+        )
+
+    @staticmethod
+    def _convert(kwargs):
+        # `data` holds raw bodies (see `compression`), which httpx expects in `content`
+        if isinstance(kwargs.get('data'), bytes):
+            kwargs = dict(kwargs)
+            kwargs['content'] = kwargs.pop('data')
+
+        return kwargs
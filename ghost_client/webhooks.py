@@ -0,0 +1,187 @@
+import hashlib
+import hmac
+import json
+import threading
+
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from six.moves.socketserver import ThreadingMixIn
+
+
+class WebhookReceiver(object):
+    """
+    Lightweight HTTP server receiving webhooks sent by Ghost
+    and turning them into invalidations of cached responses
+    and local replicas of the changed resources.
+
+    Configure the webhooks in Ghost to call
+    `<receiver url>/<event name>`, for example
+    `http://cache-host:8080/ghost/webhook/post.edited`.
+    Each subscriber is called with the type, ID and slug of the
+    changed resource (see `cache.ResponseCache.invalidate`),
+    and with no arguments when the whole site changed.
+
+    Sample usage:
+
+        cache = ResponseCache(ttl=3600)
+        ghost = Ghost('http://localhost:2368', admin_key='...', cache=cache)
+
+        receiver = WebhookReceiver(port=8080, secret='webhook secret')
+        receiver.subscribe(cache.invalidate)
+        receiver.start()
+    """
+
+    TYPES = {
+        'post': 'posts',
+        'page': 'pages',
+        'tag': 'tags',
+        'user': 'users',
+        'member': 'members'
+    }
+    """
+    The resource types of the API by the payload keys of the webhooks.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, path='/ghost/webhook', secret=None):
+        """
+        Creates a new receiver.
+
+        :param host: The host name to listen on
+        :param port: The port to listen on (default: any free port)
+        :param path: The path prefix of the webhook URLs
+        :param secret: The secret to validate the `X-Ghost-Signature` with (optional)
+        """
+
+        self.host = host
+        self.port = port
+        self.path = path.rstrip('/')
+        self.secret = secret
+
+        self._subscribers = list()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        :return: The URL prefix the webhooks should be sent to
+        """
+
+        return 'http://%s:%d%s' % (self.host, self.port, self.path)
+
+    def subscribe(self, subscriber):
+        """
+        Register a callable to be notified about changed resources.
+
+        :param subscriber: A callable accepting `type_name`, `id` and `slug`
+        """
+
+        self._subscribers.append(subscriber)
+
+    def start(self):
+        """
+        Start listening for webhooks on a background thread.
+
+        :return: The receiver itself
+        """
+
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                status = receiver._receive(self.path, body, self.headers.get('X-Ghost-Signature'))
+
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass  # keep quiet
+
+        self._server = _ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        """
+        Stop listening for webhooks.
+        """
+
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+
+            self._server = self._thread = None
+
+    def handle(self, event, payload):
+        """
+        Notify the subscribers about the resources changed in a webhook.
+        Can be called directly when the webhooks are received
+        by another web application.
+
+        :param event: The name of the event (ie. `post.published`)
+        :param payload: The deserialized body of the webhook
+        """
+
+        if event.startswith('site.') or not payload:
+            for subscriber in self._subscribers:
+                subscriber()
+
+            return
+
+        key = event.split('.')[0]
+        type_name = self.TYPES.get(key, '%ss' % key)
+
+        content = payload.get(key, dict())
+        current = content.get('current') or dict()
+        previous = content.get('previous') or dict()
+
+        changes = set([(current.get('id') or previous.get('id'), current.get('slug'))])
+
+        if previous.get('slug'):
+            changes.add((current.get('id') or previous.get('id'), previous['slug']))
+
+        for subscriber in self._subscribers:
+            for id, slug in changes:
+                subscriber(type_name, id=id, slug=slug)
+
+    def _receive(self, path, body, signature):
+        if not path.startswith(self.path + '/'):
+            return 404
+
+        if self.secret and not self._is_valid(body, signature):
+            return 401
+
+        try:
+            payload = json.loads(body.decode('utf-8')) if body else dict()
+
+        except ValueError:
+            return 400
+
+        self.handle(path[len(self.path) + 1:].split('?')[0], payload)
+
+        return 204
+
+    def _is_valid(self, body, signature):
+        if not signature:
+            return False
+
+        parts = dict(part.strip().split('=', 1) for part in signature.split(',') if '=' in part)
+
+        expected = hmac.new(
+            self.secret.encode('utf-8'),
+            body + parts.get('t', '').encode('utf-8'),
+            hashlib.sha256
+        ).hexdigest()
+
+        return hmac.compare_digest(expected, parts.get('sha256', ''))
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
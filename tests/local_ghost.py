@@ -0,0 +1,532 @@
+import binascii
+import gzip
+import io
+import json
+import os
+import re
+import socket
+import threading
+import time
+
+import jwt
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+except ImportError:
+    h2 = None  # only needed by `LocalHTTP2GhostServer`
+
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from six.moves.socketserver import ThreadingMixIn
+from six.moves.urllib.parse import urlparse, parse_qs
+
+
+class LocalGhostServer(object):
+    """
+    Minimal, in-memory stand-in for the Ghost Admin API
+    to test the client without a real server.
+    Supports listing, reading, creating, updating and deleting
+    posts, tags and users, uploads, and validates admin API tokens.
+    """
+
+    ADMIN_KEY = '5f3a0e0c8d1b2c0001a1b2c3:%s' % ('ab' * 32)
+
+    _PATH = re.compile(r'^/ghost/api/admin/(?P<type>[a-z]+)/(?:slug/(?P<slug>[^/]+)/|(?P<id>[^/]+)/)?$')
+
+    def __init__(self, latency=0.0, version='2.0.0', compress=False):
+        self.latency = latency
+        self.version = version
+        self.compress = compress
+
+        self.resources = {'posts': dict(), 'tags': dict(), 'users': dict()}
+        self.requests = list()
+        self.tokens = set()
+        self.revoked = set()
+        self.failures = list()
+        self.encodings = list()
+        self.uploads = list()
+        self.images = dict()
+        self.spans = list()
+        self.in_flight = 0
+        self.peak_requests = 0
+
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d' % self._server.server_address[1]
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server._handle(self, 'GET')
+
+            def do_POST(self):
+                server._handle(self, 'POST')
+
+            def do_PUT(self):
+                server._handle(self, 'PUT')
+
+            def do_DELETE(self):
+                server._handle(self, 'DELETE')
+
+            def log_message(self, *args):
+                pass
+
+        self._server = _ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def add(self, type_name, **item):
+        with self._lock:
+            return self._insert(type_name, item)
+
+    def _insert(self, type_name, item):
+        item.setdefault('id', binascii.hexlify(os.urandom(12)).decode('ascii'))
+        item.setdefault('slug', (item.get('title') or item.get('name') or item['id']).lower().replace(' ', '-'))
+        item.setdefault('updated_at', time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime()))
+        item.setdefault('created_at', item['updated_at'])
+
+        self.resources[type_name][item['id']] = item
+
+        return item
+
+    def revoke_tokens(self):
+        with self._lock:
+            self.revoked.update(self.tokens)
+
+    def fail_next(self, count, status=503):
+        with self._lock:
+            self.failures.extend([status] * count)
+
+    def _handle(self, handler, method):
+        # records the concurrent requests being handled
+        with self._lock:
+            self.in_flight += 1
+            self.peak_requests = max(self.peak_requests, self.in_flight)
+
+        started = time.time()
+
+        try:
+            return self._handle_request(handler, method)
+
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.spans.append((started, time.time()))
+
+    def _handle_request(self, handler, method):
+        body = handler.rfile.read(int(handler.headers.get('Content-Length') or 0))
+        url = urlparse(handler.path)
+
+        if handler.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+
+        with self._lock:
+            self.encodings.append(handler.headers.get('Content-Encoding'))
+
+        with self._lock:
+            self.requests.append((method, handler.path))
+            failure = self.failures.pop(0) if self.failures else None
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if failure:
+            return self._respond(handler, failure, {'errors': [{'errorType': 'InternalServerError'}]})
+
+        if url.path.startswith('/content/images/'):
+            image = self.images.get(url.path)
+            return self._respond(handler, 200, image) if image else self._respond(handler, 404, None)
+
+        if url.path == '/ghost/api/admin/site/':
+            return self._respond(handler, 200, {'site': {'version': self.version}})
+
+        if not self._authorized(handler.headers.get('Authorization')):
+            return self._respond(handler, 401, {'errors': [{'errorType': 'UnauthorizedError'}]})
+
+        if url.path == '/ghost/api/admin/uploads/':
+            with self._lock:
+                self.uploads.append(body)
+
+            return self._respond(handler, 201, '/content/images/2020/01/upload.png')
+
+        match = self._PATH.match(url.path)
+
+        if not match or match.group('type') not in self.resources:
+            return self._respond(handler, 404, {'errors': [{'errorType': 'NotFoundError'}]})
+
+        type_name = match.group('type')
+        params = dict((k, v[0]) for k, v in parse_qs(url.query).items())
+
+        with self._lock:
+            if method == 'GET' and not (match.group('id') or match.group('slug')):
+                return self._respond(handler, 200, self._list(type_name, params))
+
+            item = self._find(type_name, match.group('id'), match.group('slug'))
+
+            if method == 'POST':
+                created = self._insert(type_name, json.loads(body.decode('utf-8'))[type_name][0])
+
+                return self._respond(handler, 201, {type_name: [created]})
+
+            if item is None:
+                return self._respond(handler, 404, {'errors': [{'errorType': 'NotFoundError'}]})
+
+            if method == 'GET':
+                return self._respond(handler, 200, {type_name: [item]})
+
+            if method == 'PUT':
+                payload = json.loads(body.decode('utf-8'))[type_name][0]
+
+                if payload.get('updated_at') and payload['updated_at'] != item['updated_at']:
+                    return self._respond(handler, 409, {'errors': [{'errorType': 'UpdateCollisionError'}]})
+
+                item.update(payload)
+                item['updated_at'] = time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime())
+
+                return self._respond(handler, 200, {type_name: [item]})
+
+            if method == 'DELETE':
+                del self.resources[type_name][item['id']]
+                return self._respond(handler, 204, None)
+
+    def _list(self, type_name, params):
+        items = sorted(self.resources[type_name].values(), key=lambda i: i['id'])
+
+        if params.get('status') and params['status'] != 'all':
+            items = [i for i in items if i.get('status', 'published') == params['status']]
+
+        if params.get('filter'):
+            condition = _Filter(params['filter']).parse()
+            items = [i for i in items if condition(i)]
+
+        for field in reversed(params.get('order', '').split(',') if params.get('order') else []):
+            name, _, direction = field.strip().partition(' ')
+            items.sort(key=lambda i: (i.get(name) is not None, i.get(name)), reverse=direction == 'desc')
+
+        limit = params.get('limit', '15')
+        limit = (len(items) or 1) if limit == 'all' else int(limit)
+        page = int(params.get('page', '1'))
+        pages = max(1, (len(items) + limit - 1) // limit)
+
+        selected = items[(page - 1) * limit:page * limit]
+
+        if params.get('fields'):
+            fields = params['fields'].split(',')
+            selected = [dict((k, v) for k, v in i.items() if k in fields) for i in selected]
+
+        return {
+            type_name: selected,
+            'meta': {'pagination': {
+                'page': page, 'limit': limit, 'pages': pages, 'total': len(items),
+                'next': page + 1 if page < pages else None,
+                'prev': page - 1 if page > 1 else None
+            }}
+        }
+
+    def _find(self, type_name, id, slug):
+        if id:
+            return self.resources[type_name].get(id)
+
+        for item in self.resources[type_name].values():
+            if item.get('slug') == slug:
+                return item
+
+    def _authorized(self, header):
+        if not header or not header.startswith('Ghost '):
+            return False
+
+        token = header[len('Ghost '):]
+
+        with self._lock:
+            if token in self.revoked:
+                return False
+
+        try:
+            jwt.decode(
+                token, binascii.unhexlify(self.ADMIN_KEY.split(':')[1]),
+                algorithms=['HS256'], audience='/admin/'
+            )
+
+        except jwt.InvalidTokenError:
+            return False
+
+        with self._lock:
+            self.tokens.add(token)
+
+        return True
+
+    def _respond(self, handler, status, data):
+        if isinstance(data, bytes):
+            body = data
+        else:
+            body = json.dumps(data).encode('utf-8') if data is not None else b''
+
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+
+        if self.compress and body and 'gzip' in (handler.headers.get('Accept-Encoding') or ''):
+            body = gzip.compress(body)
+            handler.send_header('Content-Encoding', 'gzip')
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+
+class _Filter(object):
+    """
+    Evaluates the subset of the Ghost filter syntax (NQL) the client sends:
+    `key:value`, `key:'value'`, `key:[value,...]`, the `>`, `>=`, `<` and `<=` comparisons,
+    `+` for AND, `,` for OR, and parentheses.
+    """
+
+    _TOKEN = re.compile(r"\s*(\(|\)|\+|,|[a-z_\.]+:(?:>=|<=|>|<)?(?:'(?:[^'\\]|\\.)*'|\[[^\]]*\]|[^,+()]+))")
+    _CONDITION = re.compile(r"^([a-z_\.]+):(>=|<=|>|<)?(.*)$", re.DOTALL)
+
+    def __init__(self, expression):
+        self.tokens = self._TOKEN.findall(expression)
+        self.position = 0
+
+    def parse(self):
+        condition = self._or()
+
+        if self.position != len(self.tokens):
+            raise ValueError('Unexpected filter token: %s' % self.tokens[self.position])
+
+        return condition
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _or(self):
+        conditions = [self._and()]
+
+        while self._peek() == ',':
+            self.position += 1
+            conditions.append(self._and())
+
+        return lambda item: any(c(item) for c in conditions)
+
+    def _and(self):
+        conditions = [self._term()]
+
+        while self._peek() == '+':
+            self.position += 1
+            conditions.append(self._term())
+
+        return lambda item: all(c(item) for c in conditions)
+
+    def _term(self):
+        token = self._peek()
+        self.position += 1
+
+        if token == '(':
+            condition = self._or()
+            self.position += 1  # the closing parenthesis
+            return condition
+
+        key, operator, value = self._CONDITION.match(token).groups()
+
+        if value.startswith('['):
+            values = set(v.strip().strip("'") for v in value[1:-1].split(','))
+            return lambda item: str(item.get(key)) in values
+
+        if value.startswith("'"):
+            value = value[1:-1].replace("\\'", "'")
+
+        compare = {
+            None: lambda a, b: a == b,
+            '>': lambda a, b: a > b, '>=': lambda a, b: a >= b,
+            '<': lambda a, b: a < b, '<=': lambda a, b: a <= b
+        }[operator]
+
+        return lambda item: item.get(key) is not None and compare(str(item.get(key)), value)
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class LocalHTTP2GhostServer(LocalGhostServer):
+    """
+    The same stand-in for the Ghost Admin API served over HTTP/2
+    with prior knowledge (without TLS), handling each stream in its
+    own thread, to test the multiplexing of concurrent requests.
+    Records the number of connections and the peak number of
+    concurrently handled streams. Responses have to fit in the
+    initial flow control window of the client.
+    """
+
+    def __init__(self, latency=0.0, version='2.0.0', compress=False):
+        super(LocalHTTP2GhostServer, self).__init__(latency=latency, version=version, compress=compress)
+
+        self.connections = 0
+        self.peak_streams = 0
+
+        self._active_streams = 0
+        self._listener = None
+        self._running = False
+        self._sockets = list()
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d' % self._listener.getsockname()[1]
+
+    def start(self):
+        self._listener = socket.socket()
+        self._listener.bind(('127.0.0.1', 0))
+        self._listener.listen(16)
+        self._listener.settimeout(0.1)
+        self._running = True
+
+        self._thread = threading.Thread(target=self._accept)
+        self._thread.daemon = True
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        self._running = False
+        self._thread.join()
+        self._listener.close()
+
+        for sock in self._sockets:
+            sock.close()
+
+    def _accept(self):
+        while self._running:
+            try:
+                sock, _ = self._listener.accept()
+
+            except socket.timeout:
+                continue
+
+            with self._lock:
+                self.connections += 1
+                self._sockets.append(sock)
+
+            thread = threading.Thread(target=self._serve, args=(sock,))
+            thread.daemon = True
+            thread.start()
+
+    def _serve(self, sock):
+        connection = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False, header_encoding='utf-8')
+        )
+        lock = threading.Lock()
+        streams = dict()
+
+        with lock:
+            connection.initiate_connection()
+            sock.sendall(connection.data_to_send())
+
+        while True:
+            try:
+                data = sock.recv(65535)
+
+            except (OSError, socket.error):
+                return
+
+            if not data:
+                return
+
+            with lock:
+                for event in connection.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        streams[event.stream_id] = (dict(event.headers), list())
+
+                    elif isinstance(event, h2.events.DataReceived):
+                        streams[event.stream_id][1].append(event.data)
+                        connection.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+
+                    elif isinstance(event, h2.events.StreamEnded):
+                        headers, body = streams.pop(event.stream_id)
+
+                        thread = threading.Thread(
+                            target=self._handle_stream,
+                            args=(connection, lock, sock, event.stream_id, headers, b''.join(body))
+                        )
+                        thread.daemon = True
+                        thread.start()
+
+                    elif isinstance(event, h2.events.StreamReset):
+                        streams.pop(event.stream_id, None)
+
+                sock.sendall(connection.data_to_send())
+
+    def _handle_stream(self, connection, lock, sock, stream_id, headers, body):
+        with self._lock:
+            self._active_streams += 1
+            self.peak_streams = max(self.peak_streams, self._active_streams)
+
+        try:
+            handler = _StreamHandler(headers, body)
+            self._handle(handler, headers[':method'])
+
+        finally:
+            with self._lock:
+                self._active_streams -= 1
+
+        data = handler.wfile.getvalue()
+
+        with lock:
+            connection.send_headers(
+                stream_id, [(':status', str(handler.status))] + handler.response_headers,
+                end_stream=not data
+            )
+
+            while data:
+                size = min(len(data), connection.max_outbound_frame_size)
+                connection.send_data(stream_id, data[:size], end_stream=size == len(data))
+                data = data[size:]
+
+            sock.sendall(connection.data_to_send())
+
+
+class _StreamHandler(object):
+    """
+    Collects the response to an HTTP/2 stream
+    in the interface of `BaseHTTPRequestHandler`.
+    """
+
+    def __init__(self, headers, body):
+        self.path = headers[':path']
+        self.headers = _Headers((k, v) for k, v in headers.items() if not k.startswith(':'))
+        self.headers['content-length'] = str(len(body))
+        self.rfile = io.BytesIO(body)
+        self.wfile = io.BytesIO()
+
+        self.status = None
+        self.response_headers = list()
+
+    def send_response(self, status):
+        self.status = status
+
+    def send_header(self, name, value):
+        self.response_headers.append((name.lower(), value))
+
+    def end_headers(self):
+        pass
+
+
+class _Headers(dict):
+    def get(self, key, default=None):
+        return super(_Headers, self).get(key.lower(), default)
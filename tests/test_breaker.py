@@ -0,0 +1,122 @@
+import socket
+import time
+import unittest
+
+import requests
+
+from ghost_client import Ghost, CircuitOpenException
+from ghost_client.breaker import CircuitBreaker
+
+
+class _Response(object):
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def test_opens_on_failure_rate(self):
+        breaker = CircuitBreaker('http://testing', failure_rate=0.5, window=4, min_calls=4)
+
+        for status in (200, 500, 200, 502):
+            breaker.call(_Response, status)
+
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertRaises(CircuitOpenException, breaker.call, _Response, 200)
+
+        self.assertEqual(breaker.metrics.counter('circuit_breaker.rejected', url='http://testing'), 1)
+
+    def test_stays_closed_under_threshold(self):
+        breaker = CircuitBreaker('http://testing', failure_rate=0.5, window=4, min_calls=4)
+
+        for status in (200, 404, 200, 503, 200):
+            breaker.call(_Response, status)
+
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_probe(self):
+        breaker = CircuitBreaker('http://testing', window=2, min_calls=2, reset_timeout=0.05)
+
+        for _ in range(2):
+            breaker.call(_Response, 500)
+
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        time.sleep(0.1)
+
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+        breaker.call(_Response, 500)
+
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        time.sleep(0.1)
+
+        breaker.call(_Response, 200)
+
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_requests_sent_while_closed_are_not_probes(self):
+        breaker = CircuitBreaker('http://testing', window=2, min_calls=2, reset_timeout=0.05)
+
+        slow = breaker._before()  # still in flight when the circuit opens
+
+        for _ in range(2):
+            breaker.call(_Response, 500)
+
+        time.sleep(0.1)
+
+        probe = breaker._before()
+        breaker._after(True, slow)
+
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertRaises(CircuitOpenException, breaker.call, _Response, 200)
+
+        breaker._after(True, probe)
+
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_probe_released_on_other_errors(self):
+        breaker = CircuitBreaker('http://testing', window=2, min_calls=2, reset_timeout=0.05)
+
+        for _ in range(2):
+            breaker.call(_Response, 500)
+
+        time.sleep(0.1)
+
+        def interrupted():
+            raise ValueError('not a response')
+
+        self.assertRaises(ValueError, breaker.call, interrupted)
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+        breaker.call(_Response, 200)  # admitted as the next probe
+
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_state_reported_to_each_client(self):
+        url = 'http://testing-%s' % id(self)
+
+        first = Ghost(url, access_token='token', circuit_breaker=True)
+        second = Ghost(url, access_token='token', circuit_breaker=True)
+
+        self.assertIs(first.circuit_breaker, second.circuit_breaker)
+
+        for ghost in (first, second):
+            self.assertEqual(ghost.metrics.snapshot()['circuit_breaker.state{url=%s}' % ghost.base_url], 'closed')
+
+    def test_fail_fast_when_server_is_down(self):
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        port = listener.getsockname()[1]
+        listener.close()  # nothing listens on this port now
+
+        ghost = Ghost('http://127.0.0.1:%d' % port, version='2', circuit_breaker=True)
+
+        for _ in range(ghost.circuit_breaker.min_calls):
+            self.assertRaises(requests.ConnectionError, ghost.tags.list)
+
+        self.assertRaises(CircuitOpenException, ghost.tags.list)
+
+        state = ghost.metrics.snapshot()['circuit_breaker.state{url=%s}' % ghost.base_url]
+
+        self.assertEqual(state, CircuitBreaker.OPEN)
@@ -0,0 +1,91 @@
+import time
+import unittest
+
+import requests
+
+from ghost_client import GhostException
+from ghost_client.cache import ResponseCache, StaleWhileRevalidate
+from ghost_client.models import Controller
+
+
+class _CountingClient(object):
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+
+    def execute_get(self, resource, **kwargs):
+        if self.error:
+            raise self.error
+
+        self.calls += 1
+        return {'tags': [{'id': 't1', 'slug': 'news', 'name': 'Version %d' % self.calls}]}
+
+
+class CacheTests(unittest.TestCase):
+    def test_expiry_and_eviction(self):
+        cache = ResponseCache(ttl=0.05, max_entries=2)
+
+        for idx in range(3):
+            cache.set('tags/%d/' % idx, 'tags/%d/' % idx, '{"tags": []}', {'tags': []})
+
+        self.assertIsNone(cache.get('tags/0/'))
+        self.assertEqual(cache.get('tags/2/'), {'tags': []})
+
+        time.sleep(0.1)
+
+        self.assertIsNone(cache.get('tags/2/'))
+
+    def test_stale_while_revalidate(self):
+        client = _CountingClient()
+        tags = Controller(client, 'tags').with_read_policy(
+            StaleWhileRevalidate(soft_ttl=0.05, hard_ttl=10)
+        )
+
+        self.assertEqual(tags.get('t1').name, 'Version 1')
+        self.assertEqual(tags.get('t1').name, 'Version 1')
+
+        time.sleep(0.1)
+
+        self.assertEqual(tags.get('t1').name, 'Version 1')  # stale, refreshing
+
+        for _ in range(20):
+            if client.calls > 1:
+                break
+
+            time.sleep(0.05)
+
+        self.assertEqual(tags.get('t1').name, 'Version 2')
+
+    def test_serve_stale_on_error(self):
+        client = _CountingClient()
+        tags = Controller(client, 'tags').with_read_policy(
+            StaleWhileRevalidate(soft_ttl=0.05, hard_ttl=10, background=False)
+        )
+
+        self.assertEqual(tags.get('t1').name, 'Version 1')
+
+        time.sleep(0.1)
+
+        client.error = requests.ConnectionError()
+        self.assertEqual(tags.get('t1').name, 'Version 1')
+
+        client.error = GhostException(503, [])
+        self.assertEqual(tags.get('t1').name, 'Version 1')
+
+        client.error = GhostException(404, [])
+        self.assertRaises(GhostException, tags.get, 't1')
+
+    def test_hits_are_not_parsed_again(self):
+        client = _CountingClient()
+        policy = StaleWhileRevalidate(soft_ttl=10, hard_ttl=10)
+        tags = Controller(client, 'tags').with_read_policy(policy)
+
+        tag = tags.get('t1')
+        tag.name = 'Changed'  # on the model, not the cached response
+
+        self.assertEqual(tags.get('t1').name, 'Version 1')
+
+        key = list(policy.cache._entries)[0]
+
+        self.assertIs(policy.cache.get(key), policy.cache.get(key))
+        self.assertEqual(client.calls, 1)
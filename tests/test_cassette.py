@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import requests
+
+try:
+    from .local_ghost import LocalGhostServer
+except:
+    from local_ghost import LocalGhostServer
+
+from ghost_client import Ghost, GhostException
+from ghost_client.cassette import RecordingTransport, ReplayTransport
+
+
+class CassetteTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'session.cassette')
+
+        server = LocalGhostServer(latency=0.05).start()
+
+        try:
+            for idx in range(5):
+                server.add('posts', title='Post #%d' % idx)
+
+            transport = RecordingTransport(self.path)
+            ghost = Ghost(server.url, admin_key=LocalGhostServer.ADMIN_KEY, transport=transport)
+
+            self.recorded = {
+                'version': ghost.version,
+                'posts': [post.title for post in ghost.posts.list(limit='all')],
+                'created': ghost.tags.create(name='Recorded').name,
+                'upload': ghost.upload(name='image.png', data=b'not really a PNG')
+            }
+
+            self.assertRaises(GhostException, ghost.posts.get, 'missing')
+
+        finally:
+            server.stop()
+
+        transport.transport.close()  # drop the kept-alive connections
+        self.assertRaises(requests.ConnectionError, ghost.tags.list)
+
+        transport.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _replay(self, **kwargs):
+        # the server is gone, any base URL works
+        return Ghost('http://replay.invalid', admin_key=LocalGhostServer.ADMIN_KEY,
+                     transport=ReplayTransport(self.path, **kwargs))
+
+    def test_replay(self):
+        ghost = self._replay()
+
+        started = time.time()
+
+        self.assertEqual(ghost.version, self.recorded['version'])
+        self.assertEqual([post.title for post in ghost.posts.list(limit='all')], self.recorded['posts'])
+        self.assertEqual(ghost.tags.create(name='Recorded').name, self.recorded['created'])
+        self.assertEqual(ghost.upload(name='image.png', data=b'not really a PNG'), self.recorded['upload'])
+
+        self.assertRaises(GhostException, ghost.posts.get, 'missing')
+        self.assertRaises(requests.ConnectionError, ghost.tags.list)
+
+        self.assertLess(time.time() - started, 0.1)
+        self.assertGreater(ghost.metrics.counter('transfer.received', stage='wire'), 0)
+
+    def test_recorded_latency(self):
+        ghost = self._replay(latency_scale=1.0)
+
+        started = time.time()
+
+        for _ in range(3):  # the last recorded response is repeated
+            ghost.posts.list(limit='all')
+
+        self.assertGreaterEqual(time.time() - started, 3 * 0.05)
+
+    def test_unknown_request(self):
+        ghost = self._replay()
+
+        self.assertRaises(GhostException, ghost.users.list)
@@ -0,0 +1,70 @@
+import unittest
+
+try:
+    from .local_ghost import LocalGhostServer
+except:
+    from local_ghost import LocalGhostServer
+
+from ghost_client import Ghost
+from ghost_client.compression import accept_encoding, supported_encodings, encode_json
+
+
+class CompressionTests(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalGhostServer(compress=True).start()
+
+        for idx in range(20):
+            self.server.add('posts', title='Post #%d' % idx, slug='post-%d' % idx, html='<p>Lorem ipsum</p>' * 50)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_accept_encoding(self):
+        self.assertIn('gzip', supported_encodings())
+        self.assertEqual(accept_encoding(['br-unknown', 'gzip']), 'gzip')
+        self.assertEqual(accept_encoding('unknown'), 'identity')
+        self.assertEqual(
+            accept_encoding(), ', '.join(e for e in ('zstd', 'br', 'gzip', 'deflate') if e in supported_encodings())
+        )
+
+    def test_compressed_responses(self):
+        ghost = Ghost(self.server.url, admin_key=LocalGhostServer.ADMIN_KEY, version='2.0')
+
+        posts = ghost.posts.list(limit='all')
+
+        self.assertEqual(len(posts), 20)
+        self.assertIn('Lorem ipsum', posts[0].html)
+
+        snapshot = ghost.metrics.snapshot()
+
+        self.assertLess(
+            snapshot['transfer.received{stage=wire}'] * 5,
+            snapshot['transfer.received{stage=body}']
+        )
+
+    def test_uncompressed_responses(self):
+        ghost = Ghost(self.server.url, admin_key=LocalGhostServer.ADMIN_KEY, version='2.0', accept_encoding='identity')
+
+        ghost.posts.list(limit='all')
+
+        snapshot = ghost.metrics.snapshot()
+
+        self.assertEqual(snapshot['transfer.received{stage=wire}'], snapshot['transfer.received{stage=body}'])
+
+    def test_compressed_requests(self):
+        ghost = Ghost(self.server.url, admin_key=LocalGhostServer.ADMIN_KEY, version='2.0', compress_requests=1024)
+
+        small = ghost.tags.create(name='Small')
+        large = ghost.posts.create(title='Large', html='<p>Lorem ipsum</p>' * 200)
+
+        self.assertEqual(small.name, 'Small')
+        self.assertEqual(large.html, '<p>Lorem ipsum</p>' * 200)
+        self.assertEqual([e for e in self.server.encodings if e], ['gzip'])
+
+        snapshot = ghost.metrics.snapshot()
+
+        self.assertLess(snapshot['transfer.sent{stage=wire}'] * 5, snapshot['transfer.sent{stage=body}'])
+
+    def test_encode_json(self):
+        self.assertEqual(encode_json({'a': 1}), (b'{"a": 1}', None, 8))
+        self.assertEqual(encode_json({'a': 1}, threshold=8)[1:], ('gzip', 8))
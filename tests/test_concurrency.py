@@ -0,0 +1,101 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from .local_ghost import LocalGhostServer
+except:
+    from local_ghost import LocalGhostServer
+
+from ghost_client import Ghost
+
+
+class ConcurrencyTests(unittest.TestCase):
+    THREADS = 32
+    CALLS = 10
+
+    def setUp(self):
+        self.server = LocalGhostServer().start()
+
+        for idx in range(30):
+            self.server.add('posts', title='Post #%d' % idx, slug='post-%d' % idx)
+
+        self.ghost = Ghost(self.server.url, admin_key=LocalGhostServer.ADMIN_KEY, pool_size=self.THREADS)
+
+        self.authentications = 0
+        self._count_authentications()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _count_authentications(self):
+        authenticate = self.ghost._authenticate
+        lock = threading.Lock()
+
+        def counting(**kwargs):
+            with lock:
+                self.authentications += 1
+
+            return authenticate(**kwargs)
+
+        self.ghost._authenticate = counting
+
+    def _hammer(self, work):
+        barrier = threading.Barrier(self.THREADS)
+
+        def run(_):
+            barrier.wait()
+            return [work() for _ in range(self.CALLS)]
+
+        with ThreadPoolExecutor(max_workers=self.THREADS) as pool:
+            return list(pool.map(run, range(self.THREADS)))
+
+    def test_single_flight_authentication(self):
+        results = self._hammer(lambda: len(self.ghost.posts.list(limit=5)))
+
+        self.assertTrue(all(count == 5 for calls in results for count in calls))
+        self.assertEqual(self.authentications, 1)
+
+    def test_single_flight_refresh_after_expiry(self):
+        self.ghost.posts.list()
+        self.assertEqual(self.authentications, 1)
+
+        self.server.revoke_tokens()
+
+        time.sleep(1.1)  # make sure the new token differs from the revoked one
+
+        results = self._hammer(lambda: len(self.ghost.posts.list(limit=5)))
+
+        self.assertTrue(all(count == 5 for calls in results for count in calls))
+        self.assertEqual(self.authentications, 2)
+
+    def test_proactive_refresh_before_expiry(self):
+        self.ghost.posts.list()
+
+        self.ghost._token_expires_at = 0  # pretend it is about to expire
+
+        self._hammer(lambda: self.ghost.posts.list(limit=1))
+
+        self.assertEqual(self.authentications, 2)
+
+    def test_version_is_fetched_once(self):
+        self.ghost = Ghost(self.server.url, admin_key=LocalGhostServer.ADMIN_KEY)
+
+        self._hammer(lambda: self.ghost.version)
+
+        site_requests = [r for r in self.server.requests if r[1].endswith('/site/')]
+
+        self.assertEqual(len(site_requests), 1)
+
+    def test_mixed_reads_and_writes(self):
+        def work():
+            post = self.ghost.posts.create(title='Concurrent post')
+            self.ghost.posts.update(post.id, title='Updated concurrently')
+            self.ghost.posts.delete(post.id)
+            return self.ghost.posts.get(slug='post-1').title
+
+        results = self._hammer(work)
+
+        self.assertTrue(all(title == 'Post #1' for calls in results for title in calls))
+        self.assertEqual(len(self.server.resources['posts']), 30)
@@ -0,0 +1,63 @@
+import unittest
+
+try:
+    from .local_ghost import LocalGhostServer
+except:
+    from local_ghost import LocalGhostServer
+
+from ghost_client import Ghost
+
+
+class CountTests(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalGhostServer().start()
+
+        for idx in range(7):
+            self.server.add('posts', title='Post #%d' % idx,
+                            status='draft' if idx % 3 == 0 else 'published',
+                            primary_tag='news' if idx % 2 == 0 else 'releases')
+
+        self.ghost = Ghost(self.server.url, admin_key=LocalGhostServer.ADMIN_KEY, version='2.0')
+        self.ghost.tags.list()  # authenticate first
+
+        del self.server.requests[:]
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_count(self):
+        self.assertEqual(self.ghost.posts.count(), 7)
+        self.assertEqual(self.ghost.posts.count(status='draft'), 3)
+        self.assertEqual(self.ghost.posts.count(filter='primary_tag:news'), 4)
+
+        self.assertTrue(all('limit=1' in path and 'fields=id' in path for _, path in self.server.requests))
+
+    def test_count_grouped(self):
+        groups = [('status', ['draft', 'published']), ('filter', ['primary_tag:news', 'primary_tag:releases'])]
+
+        counts = self.ghost.posts.count_grouped(groups)
+
+        self.assertEqual(counts, {
+            ('draft', 'primary_tag:news'): 2,
+            ('draft', 'primary_tag:releases'): 1,
+            ('published', 'primary_tag:news'): 2,
+            ('published', 'primary_tag:releases'): 2
+        })
+        self.assertEqual(len(self.server.requests), 4)
+
+        self.assertEqual(self.ghost.posts.count_grouped(groups), counts)
+        self.assertEqual(len(self.server.requests), 4)  # reused
+
+        self.ghost.posts.create(title='New', status='draft', primary_tag='news')
+
+        self.assertEqual(self.ghost.posts.count_grouped(groups)[('draft', 'primary_tag:news')], 3)
+        self.assertEqual(len(self.server.requests), 9)
+
+    def test_count_grouped_expiry(self):
+        counts = self.ghost.posts.count_grouped({'status': ['draft']}, ttl=0)
+
+        self.assertEqual(counts, {('draft',): 3})
+
+        self.ghost.posts.count_grouped({'status': ['draft']}, ttl=0)
+
+        self.assertEqual(len(self.server.requests), 2)
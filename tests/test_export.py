@@ -0,0 +1,114 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+try:
+    from .unittest_helper import GhostTestCase
+    from .local_ghost import LocalGhostServer
+except:
+    from unittest_helper import GhostTestCase
+    from local_ghost import LocalGhostServer
+
+from ghost_client import Ghost, GhostException, ndjson
+from ghost_client.exporter import Exporter
+
+
+class ExportTests(GhostTestCase):
+    def _setup_client(self):
+        return self.new_logged_in_client()
+
+    def setUp(self):
+        super(ExportTests, self).setUp()
+
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+        super(ExportTests, self).tearDown()
+
+    def test_export(self):
+        tag = self.create_tag(name='Exported tag')
+
+        posts = [self.create_post(title='Exported post #%d' % idx, tags=[tag]) for idx in range(5)]
+
+        counts = Exporter(self.ghost, self.directory, limit=2).export()
+
+        exported = list(ndjson.read(os.path.join(self.directory, 'posts.ndjson.gz')))
+
+        self.assertEqual(counts['posts'], len(exported))
+        self.assertTrue(set(post.id for post in posts).issubset(item['id'] for item in exported))
+
+        tags = list(ndjson.read(os.path.join(self.directory, 'tags.ndjson.gz')))
+
+        self.assertIn(tag.id, [item['id'] for item in tags])
+
+    def test_resume_from_checkpoint(self):
+        for idx in range(5):
+            self.create_post(title='Resumed post #%d' % idx)
+
+        first = Exporter(self.ghost, self.directory, limit=2).export(resources=('posts',))
+        second = Exporter(self.ghost, self.directory, limit=2).export(resources=('posts',))
+
+        self.assertEqual(first, second)
+
+        exported = list(ndjson.read(os.path.join(self.directory, 'posts.ndjson.gz')))
+
+        self.assertEqual(len(exported), first['posts'])
+
+
+class LocalExportTests(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalGhostServer().start()
+        self.ghost = Ghost(self.server.url, admin_key=LocalGhostServer.ADMIN_KEY, version='2.0')
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.directory)
+
+    def _interrupted(self, exporter):
+        write = exporter._write
+
+        def write_then_fail(*args):
+            write(*args)
+            self.server.fail_next(1, status=400)  # the request of the next page
+
+        exporter._write = write_then_fail
+
+        self.assertRaises(GhostException, exporter.export, resources=('posts',))
+
+    def test_resume_after_deleted_items(self):
+        posts = [self.server.add('posts', title='Post #%d' % idx) for idx in range(5)]
+
+        self._interrupted(Exporter(self.ghost, self.directory, limit=2))
+
+        first = list(ndjson.read(os.path.join(self.directory, 'posts.ndjson.gz')))[0]
+
+        # would shift the next pages with offset pagination
+        del self.server.resources['posts'][first['id']]
+
+        counts = Exporter(self.ghost, self.directory, limit=2).export(resources=('posts',))
+        exported = list(ndjson.read(os.path.join(self.directory, 'posts.ndjson.gz')))
+
+        self.assertEqual(counts['posts'], 5)
+        self.assertEqual(sorted(item['id'] for item in exported), sorted(post['id'] for post in posts))
+
+    def test_resume_pending_images(self):
+        self.server.images['/content/images/first.png'] = b'first'
+        self.server.add('posts', title='First', feature_image='/content/images/first.png')
+        self.server.add('posts', title='Second')
+
+        exporter = Exporter(self.ghost, self.directory, limit=1, images=True)
+        exporter._download_image = lambda url: time.sleep(0.2)  # still downloading when interrupted
+
+        self._interrupted(exporter)
+
+        counts = Exporter(self.ghost, self.directory, limit=1, images=True).export(resources=('posts',))
+
+        self.assertEqual(counts, {'posts': 2, 'images': 1})
+
+        with open(os.path.join(self.directory, 'images', 'content', 'images', 'first.png'), 'rb') as image:
+            self.assertEqual(image.read(), b'first')
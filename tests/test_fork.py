@@ -0,0 +1,115 @@
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from .local_ghost import LocalGhostServer
+except:
+    from local_ghost import LocalGhostServer
+
+from ghost_client import Ghost, ClientConfig
+
+
+def _count_posts(args):
+    ghost, limit = args
+    return len(ghost.posts.list(limit=limit)), ghost._access_token
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+class ForkTests(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalGhostServer().start()
+
+        for idx in range(10):
+            self.server.add('posts', title='Post #%d' % idx, slug='post-%d' % idx)
+
+        self.ghost = Ghost(self.server.url, admin_key=LocalGhostServer.ADMIN_KEY, scheduler=True)
+
+        # authenticate and keep a pooled connection open in the parent
+        self.assertEqual(len(self.ghost.posts.list(limit=5)), 5)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_child_gets_new_connections_and_locks(self):
+        session, lock = self.ghost.transport.session, self.ghost._auth_lock
+        lock.acquire()  # as if held by another thread at the time of the fork
+
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+
+        if pid == 0:
+            try:
+                ok = (
+                    self.ghost.transport.session is not session and
+                    self.ghost._auth_lock.acquire(False) and
+                    len(self.ghost.posts.list(limit=3)) == 3
+                )
+                os.write(write_end, b'ok' if ok else b'failed')
+
+            finally:
+                os._exit(0)
+
+        lock.release()
+        os.close(write_end)
+        os.waitpid(pid, 0)
+
+        self.assertEqual(os.read(read_end, 16), b'ok')
+        self.assertIs(self.ghost.transport.session, session)
+        self.assertEqual(len(self.server.tokens), 1)  # the child kept the token
+
+    def test_config_is_picklable(self):
+        config = pickle.loads(pickle.dumps(self.ghost.config()))
+
+        self.assertIsInstance(config, ClientConfig)
+
+        copy = Ghost.from_config(config)
+
+        self.assertEqual(copy.base_url, self.ghost.base_url)
+        self.assertEqual(copy._access_token, self.ghost._access_token)
+        self.assertIsNotNone(copy.scheduler)
+        self.assertEqual(len(copy.posts.list(limit=2)), 2)
+
+    def test_config_keeps_cache_and_transport_settings(self):
+        from ghost_client.shared_cache import SharedResponseCache
+        from ghost_client.transport import RequestsTransport
+
+        path = os.path.join(tempfile.mkdtemp(), 'cache')
+        cache = SharedResponseCache(path, ttl=30, size=1024 * 1024, slots=64)
+        transport = RequestsTransport(pool_size=3, max_hosts=2)
+
+        try:
+            ghost = Ghost(self.server.url, admin_key=LocalGhostServer.ADMIN_KEY, cache=cache, transport=transport)
+            copy = Ghost.from_config(pickle.loads(pickle.dumps(ghost.config())))
+
+            self.assertIsInstance(copy.cache, SharedResponseCache)
+            self.assertEqual((copy.cache.path, copy.cache.ttl, copy.cache.slots), (path, 30, 64))
+            self.assertIsInstance(copy.transport, RequestsTransport)
+            self.assertEqual((copy.transport.pool_size, copy.transport.max_hosts), (3, 2))
+
+            # both processes read from the same file
+            ghost.posts.list(limit=2)
+            requests = len(self.server.requests)
+
+            self.assertEqual(len(copy.posts.list(limit=2)), 2)
+            self.assertEqual(len(self.server.requests), requests)
+
+            copy.cache.close()
+
+        finally:
+            cache.close()
+            shutil.rmtree(os.path.dirname(path))
+
+    def test_process_pool(self):
+        context = multiprocessing.get_context('fork')
+
+        with ProcessPoolExecutor(max_workers=2, mp_context=context) as pool:
+            results = list(pool.map(_count_posts, [(self.ghost, limit) for limit in (1, 2, 3, 4)]))
+
+        self.assertEqual([count for count, _ in results], [1, 2, 3, 4])
+        self.assertTrue(all(token == self.ghost._access_token for _, token in results))
+        self.assertEqual(len(self.server.tokens), 1)
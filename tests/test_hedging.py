@@ -0,0 +1,97 @@
+import threading
+import time
+import unittest
+
+from ghost_client.hedging import HedgingPolicy
+
+
+class _Response(object):
+    def __init__(self, status_code, source):
+        self.status_code = status_code
+        self.source = source
+
+
+class HedgingTests(unittest.TestCase):
+    def setUp(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def _request(self, slow_first=True, status=200):
+        with self.lock:
+            self.calls += 1
+            number = self.calls
+
+        if slow_first and number == 1:
+            time.sleep(0.5)
+
+        return _Response(status, number)
+
+    def test_fast_response_is_not_hedged(self):
+        policy = HedgingPolicy(initial_delay=0.2, max_ratio=1.0)
+
+        response = policy.call(self._request, slow_first=False)
+
+        self.assertEqual(response.source, 1)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(policy.metrics.counter('hedging.hedged'), 0)
+
+    def test_slow_response_is_hedged(self):
+        policy = HedgingPolicy(initial_delay=0.05, max_ratio=1.0)
+
+        started = time.time()
+        response = policy.call(self._request)
+
+        self.assertLess(time.time() - started, 0.4)
+        self.assertEqual(response.source, 2)
+        self.assertEqual(policy.metrics.counter('hedging.hedged'), 1)
+        self.assertEqual(policy.metrics.counter('hedging.won'), 1)
+
+    def test_hedging_budget(self):
+        policy = HedgingPolicy(initial_delay=0.05, max_ratio=0.5)
+
+        policy.call(self._request)  # 1 request, budget is 0.5
+
+        self.assertEqual(policy.metrics.counter('hedging.hedged'), 0)
+
+    def test_sent_on_the_callers_thread_without_budget(self):
+        policy = HedgingPolicy(initial_delay=0.05, max_ratio=0.0, workers=1)
+        threads = list()
+
+        def request():
+            threads.append(threading.current_thread())
+            return _Response(200, 1)
+
+        for _ in range(3):
+            policy.call(request)
+
+        self.assertEqual(threads, [threading.current_thread()] * 3)
+
+    def test_pool_does_not_limit_throughput(self):
+        policy = HedgingPolicy(initial_delay=1.0, max_ratio=1.0, workers=1)
+        release = threading.Event()
+
+        def slow():
+            release.wait(2)
+            return _Response(200, 1)
+
+        worker = threading.Thread(target=policy.call, args=(slow,))
+        worker.start()
+
+        time.sleep(0.05)
+
+        started = time.time()
+        response = policy.call(self._request, slow_first=False)  # the only pool thread is busy
+
+        self.assertLess(time.time() - started, 0.5)
+        self.assertEqual(response.status_code, 200)
+
+        release.set()
+        worker.join()
+
+    def test_delay_follows_percentile(self):
+        policy = HedgingPolicy(percentile=90, min_delay=0.0)
+
+        for idx in range(100):
+            policy._latencies.append(idx / 100.0)
+
+        self.assertAlmostEqual(policy.delay, 0.9)
@@ -0,0 +1,108 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    from .local_ghost import LocalGhostServer
+except:
+    from local_ghost import LocalGhostServer
+
+from ghost_client import Ghost
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+def _camera_jpeg(width=3000, height=2000):
+    image = Image.effect_noise((width, height), 64).convert('RGB')
+
+    exif = Image.Exif()
+    exif[0x010F] = 'Camera maker'  # Make
+
+    output = io.BytesIO()
+    image.save(output, format='JPEG', quality=98, exif=exif.tobytes())
+
+    return output.getvalue()
+
+
+@unittest.skipIf(Image is None, 'needs Pillow')
+class ImageOptimizerTests(unittest.TestCase):
+    def setUp(self):
+        from ghost_client.images import ImageOptimizer
+
+        self.optimizer = ImageOptimizer(max_width=800, max_height=800, workers=1)
+
+    def tearDown(self):
+        self.optimizer.close()
+
+    def test_resizes_and_strips_metadata(self):
+        source = _camera_jpeg()
+        optimized = self.optimizer.optimize('camera.jpeg', source)
+
+        self.assertLess(len(optimized), len(source))
+
+        image = Image.open(io.BytesIO(optimized))
+
+        self.assertEqual(image.format, 'JPEG')
+        self.assertEqual(image.size, (800, 533))
+        self.assertNotIn('exif', image.info)
+
+    def test_cached_by_source(self):
+        source = _camera_jpeg()
+
+        first = self.optimizer.optimize('first.jpg', source)
+        self.optimizer._executor = None  # encoding it again would fail
+        second = self.optimizer.optimize('second.jpg', source)
+
+        self.assertIs(first, second)
+
+    def test_leaves_other_files_as_they_are(self):
+        text = b'x' * 100000
+        small = _camera_jpeg(100, 100)
+
+        self.assertIs(self.optimizer.optimize('notes.txt', text), text)
+        self.assertIs(self.optimizer.optimize('small.jpeg', small), small)
+        self.assertIs(self.optimizer.optimize('broken.jpeg', text), text)
+
+    def test_upload(self):
+        server = LocalGhostServer().start()
+
+        try:
+            ghost = Ghost(server.url, admin_key=LocalGhostServer.ADMIN_KEY, version='2.0', images=self.optimizer)
+
+            source = _camera_jpeg()
+
+            self.assertEqual(ghost.upload(name='camera.jpeg', data=source), '/content/images/2020/01/upload.png')
+            self.assertLess(len(server.uploads[0]), len(source) // 2)
+
+            self.assertEqual(ghost.metrics.counter('images.bytes', stage='source'), len(source))
+            self.assertLess(ghost.metrics.counter('images.bytes', stage='optimized'), len(source) // 2)
+
+        finally:
+            server.stop()
+
+    def test_upload_from_file_path(self):
+        server = LocalGhostServer().start()
+        directory = tempfile.mkdtemp()
+
+        try:
+            ghost = Ghost(server.url, admin_key=LocalGhostServer.ADMIN_KEY, version='2.0', images=self.optimizer)
+
+            source = _camera_jpeg()
+            path = os.path.join(directory, 'camera.jpeg')
+
+            with open(path, 'wb') as image_file:
+                image_file.write(source)
+
+            # the opened file is closed after sending the optimized copy
+            self.assertEqual(ghost.upload(file_path=path), '/content/images/2020/01/upload.png')
+
+            self.assertLess(len(server.uploads[0]), len(source) // 2)
+
+        finally:
+            server.stop()
+            shutil.rmtree(directory)
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+
+try:
+    from .unittest_helper import GhostTestCase
+except:
+    from unittest_helper import GhostTestCase
+
+from ghost_client import ndjson
+from ghost_client.importer import Importer
+
+
+class ImportTests(GhostTestCase):
+    def _setup_client(self):
+        return self.new_logged_in_client()
+
+    def setUp(self):
+        super(ImportTests, self).setUp()
+
+        self.directory = tempfile.mkdtemp()
+        self.checkpoint = os.path.join(self.directory, 'import.checkpoint')
+
+    def tearDown(self):
+        for post in self.ghost.posts.list(filter='tag:imported-tag', status='all', fields='id'):
+            self._posts_to_delete.append(post.id)
+
+        for tag in self.ghost.tags.list(filter='slug:imported-tag', fields='id'):
+            self._tags_to_delete.append(tag.id)
+
+        shutil.rmtree(self.directory)
+
+        super(ImportTests, self).tearDown()
+
+    def _write(self, items):
+        path = os.path.join(self.directory, ndjson.file_name('posts', 'gzip'))
+
+        with open(path, 'wb') as output:
+            output.write(ndjson.encode(items, 'gzip'))
+
+        return path
+
+    def test_import_posts(self):
+        path = self._write([
+            {'slug': 'imported-post-%d' % idx, 'title': 'Imported #%d' % idx,
+             'markdown': 'Imported content #%d' % idx,
+             'tags': [{'slug': 'imported-tag', 'name': 'Imported tag'}]}
+            for idx in range(5)
+        ])
+
+        result = Importer(self.ghost, self.checkpoint).import_posts(path)
+
+        self.assertEqual(result, {'created': 5, 'skipped': 0, 'failed': []})
+
+        stored = self.ghost.posts.get(slug='imported-post-3', status='all',
+                                      formats='mobiledoc', include='tags')
+
+        self.assertEqual(stored.markdown, 'Imported content #3')
+        self.assertEqual([tag.slug for tag in stored.tags], ['imported-tag'])
+
+        self.assertEqual(len(self.ghost.tags.list(filter='slug:imported-tag')), 1)
+
+    def test_resume_without_duplicates(self):
+        path = self._write([
+            {'slug': 'resumed-import-%d' % idx, 'title': 'Resumed #%d' % idx,
+             'tags': ['imported-tag']}
+            for idx in range(3)
+        ])
+
+        with open(self.checkpoint, 'w') as checkpoint:
+            checkpoint.write('done resumed-import-0\n')
+            checkpoint.write('started resumed-import-1\n')
+
+        self.create_post(slug='resumed-import-1', title='Created before the crash')
+
+        result = Importer(self.ghost, self.checkpoint).import_posts(path)
+
+        self.assertEqual(result, {'created': 1, 'skipped': 2, 'failed': []})
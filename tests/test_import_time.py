@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+import unittest
+
+
+class ImportTimeTests(unittest.TestCase):
+    """
+    Guards the cold-start time of the package,
+    as measured by `python -X importtime`.
+    The budget can be adjusted for slow machines with
+    the `GHOST_CLIENT_IMPORT_BUDGET_MS` environment variable.
+    """
+
+    BUDGET_MS = float(os.environ.get('GHOST_CLIENT_IMPORT_BUDGET_MS', '50'))
+
+    HEAVY_MODULES = ('requests', 'urllib3', 'jwt', 'mimetypes', 'concurrent.futures')
+
+    def _run(self, code):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+        process = subprocess.Popen(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=root
+        )
+        stdout, stderr = process.communicate()
+
+        self.assertEqual(process.returncode, 0, stderr.decode('utf-8'))
+
+        return stdout.decode('utf-8'), stderr.decode('utf-8')
+
+    def test_import_time(self):
+        _, report = self._run('import ghost_client')
+
+        # lines are `import time: <self us> | <cumulative us> | <module>`
+        timings = dict(
+            (parts[2].strip(), int(parts[1]))
+            for parts in (line.split(':', 1)[1].split('|') for line in report.splitlines())
+            if parts[1].strip().isdigit()
+        )
+
+        self.assertIn('ghost_client', timings)
+        self.assertLess(
+            timings['ghost_client'] / 1000.0, self.BUDGET_MS,
+            'Importing ghost_client took %.1f ms' % (timings['ghost_client'] / 1000.0)
+        )
+
+        for module in self.HEAVY_MODULES:
+            self.assertNotIn(module, timings, '%s is imported eagerly' % module)
+
+    def test_lazy_construction(self):
+        output, _ = self._run(
+            'import sys, mimetypes\n'
+            'from ghost_client import Ghost\n'
+            'ghost = Ghost("http://localhost:2368", version="2.0")\n'
+            'print("jwt" in sys.modules, mimetypes.inited, sorted(ghost.__dict__).count("posts"))\n'
+            'ghost.posts\n'
+            'print(sorted(ghost.__dict__).count("posts"), sorted(ghost.__dict__).count("tags"))\n'
+        )
+
+        self.assertEqual(output.split(), ['False', 'False', '0', '1', '0'])
@@ -0,0 +1,63 @@
+import unittest
+
+try:
+    from .local_ghost import LocalGhostServer
+except:
+    from local_ghost import LocalGhostServer
+
+from ghost_client import Ghost, GhostException
+
+
+class KeysetIterationTests(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalGhostServer().start()
+
+        for idx in range(11):
+            draft = idx % 4 == 1
+
+            self.server.add(
+                'posts', title='Post #%d' % idx,
+                status='draft' if draft else 'published',
+                created_at='2020-01-%02dT00:00:00.000Z' % (idx // 2 + 1),  # pairs share a timestamp
+                published_at=None if draft else '2020-02-%02dT00:00:00.000Z' % (idx + 1)
+            )
+
+        self.ghost = Ghost(self.server.url, admin_key=LocalGhostServer.ADMIN_KEY, version='2.0')
+
+        posts = self.server.resources['posts'].values()
+        self.expected = [p['id'] for p in sorted(posts, key=lambda p: (p['created_at'], p['id']), reverse=True)]
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _requests(self):
+        return [path for _, path in self.server.requests if path.startswith('/ghost/api/admin/posts/')]
+
+    def test_includes_drafts(self):
+        walked = [post.id for post in self.ghost.posts.iterate(status='all', limit=2)]
+
+        self.assertEqual(walked, self.expected)
+        self.assertGreaterEqual(len(self._requests()), 6)
+        self.assertTrue(all('page=' not in path for path in self._requests()))
+
+        ascending = [post.id for post in self.ghost.posts.iterate(status='all', limit=3, descending=False)]
+
+        self.assertEqual(ascending, list(reversed(self.expected)))
+
+    def test_with_filter(self):
+        walked = [post.id for post in self.ghost.posts.iterate(status='all', filter='status:draft', limit=2)]
+
+        self.assertEqual(walked, [id for id in self.expected
+                                  if self.server.resources['posts'][id]['status'] == 'draft'])
+
+    def test_null_key(self):
+        # the first page holds the three drafts, without `published_at`
+        walk = self.ghost.posts.iterate(status='all', key='published_at', descending=False, limit=3)
+
+        self.assertRaises(GhostException, list, walk)
+
+    def test_all_at_once(self):
+        walked = [post.id for post in self.ghost.posts.iterate(status='all', limit='all')]
+
+        self.assertEqual(walked, self.expected)
+        self.assertEqual(len(self._requests()), 2)  # including the one authenticating
@@ -0,0 +1,69 @@
+import copy
+import pickle
+import unittest
+
+from ghost_client.models import Model, Post
+
+
+class _Controller(object):
+    def __init__(self):
+        self.saved = list()
+
+    def save(self, model):
+        self.saved.append(model)
+        return model
+
+
+class ModelCopyTests(unittest.TestCase):
+    def _post(self):
+        post = Post({'id': 'p1', 'title': 'Original', 'tags': [{'name': 'News'}]})
+        object.__setattr__(post, '_controller', _Controller())
+        post.title = 'Changed'
+        return post
+
+    def test_copy(self):
+        post = self._post()
+        copied = copy.copy(post)
+
+        self.assertIsInstance(copied, Post)
+        self.assertEqual(copied, post)
+        self.assertEqual(copied.changes(), {'title': 'Changed'})
+
+        copied.save()  # still bound to the controller
+
+        self.assertIs(post._controller.saved[0], copied)
+
+        copied.slug = 'copied'
+
+        self.assertEqual(post.changes(), {'title': 'Changed'})
+
+    def test_deepcopy(self):
+        post = self._post()
+        copied = copy.deepcopy(post)
+
+        self.assertIsInstance(copied, Post)
+        self.assertEqual(copied, post)
+        self.assertIsNot(copied['tags'], post['tags'])
+        self.assertEqual(copied.changes(), {'title': 'Changed'})
+        self.assertIsNone(copied._controller)
+
+    def test_pickle(self):
+        post = self._post()
+        post._controller.lock = __import__('threading').Lock()  # not picklable, and not pickled
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            loaded = pickle.loads(pickle.dumps(post, protocol))
+
+            self.assertIsInstance(loaded, Post)
+            self.assertEqual(loaded, post)
+            self.assertEqual(loaded.tags[0].name, 'News')
+            self.assertEqual(loaded.changes(), {'title': 'Changed'})
+
+        self.assertEqual(pickle.loads(pickle.dumps(Model(id='m1'))).id, 'm1')
+
+    def test_private_attributes(self):
+        model = Model(id='m1')
+
+        self.assertIsNone(model.missing)
+        self.assertRaises(AttributeError, getattr, model, '_missing')
+        self.assertRaises(AttributeError, getattr, model, '__setstate__')
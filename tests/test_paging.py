@@ -0,0 +1,80 @@
+import time
+import unittest
+
+from ghost_client.metrics import Metrics
+from ghost_client.models import Controller
+from ghost_client.paging import AdaptivePageSize
+
+
+class _SlowClient(object):
+    """
+    Serves a listing of tags in the order requested by `iterate`,
+    with a fixed overhead per request and a cost per item.
+    """
+
+    def __init__(self, total, overhead=0.02, per_item=0.0001):
+        self.items = [
+            {'id': '%04d' % idx, 'slug': 'tag-%d' % idx, 'updated_at': '2020-01-01T00:00:00.000Z'}
+            for idx in range(total)
+        ]
+        self.overhead = overhead
+        self.per_item = per_item
+        self.limits = list()
+        self.metrics = Metrics()
+        self._offset = 0
+
+    def execute_get(self, resource, **kwargs):
+        limit = kwargs['limit']
+        self.limits.append(limit)
+
+        page = self.items[self._offset:self._offset + limit]
+        self._offset += len(page)
+
+        time.sleep(self.overhead + self.per_item * len(page))
+
+        return {'tags': page, 'meta': {'pagination': {'limit': limit}}}
+
+
+class AdaptivePageSizeTests(unittest.TestCase):
+    def test_converges_within_the_latency_ceiling(self):
+        sizer = AdaptivePageSize(initial=15, max_latency=0.5)
+
+        def elapsed(size):
+            return 0.1 + 0.001 * size
+
+        for _ in range(20):
+            sizer.record(sizer.size, elapsed(sizer.size))
+
+        self.assertTrue(sizer.converged)
+        self.assertGreater(sizer.size, 200)
+        self.assertLessEqual(elapsed(sizer.size), 0.5)
+
+        sizes = set()
+
+        for _ in range(5):
+            sizes.add(sizer.record(sizer.size, elapsed(sizer.size)))
+
+        self.assertEqual(len(sizes), 1)  # stable
+
+    def test_shrinks_over_the_limits(self):
+        sizer = AdaptivePageSize(initial=400, max_bytes=1000 * 1000)
+
+        self.assertEqual(sizer.record(400, 0.5, size_bytes=4000 * 1000), 100)
+
+        sizer = AdaptivePageSize(initial=400, max_latency=1.0)
+
+        self.assertEqual(sizer.record(400, 4.0), 100)
+
+    def test_auto_limit_for_full_walks(self):
+        client = _SlowClient(total=2000)
+        tags = Controller(client, 'tags')
+
+        walked = [tag.id for tag in tags.iterate(limit='auto')]
+
+        self.assertEqual(walked, [item['id'] for item in client.items])
+        self.assertEqual(client.limits[0], 15)
+        self.assertLess(len(client.limits), 2000 // 15)
+        self.assertGreater(max(client.limits), 100)
+
+        self.assertEqual(client.metrics.snapshot()['paging.limit{resource=tags}'], client.limits[-1])
+        self.assertGreater(tags._auto_limit, 15)  # the next walk starts from it
@@ -0,0 +1,70 @@
+import threading
+import time
+import unittest
+
+from ghost_client import GhostException
+from ghost_client.plan import Plan
+
+
+class PlanTests(unittest.TestCase):
+    def setUp(self):
+        self.plan = Plan(ghost=None, workers=4)
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def _operation(self, value, delay=0.05, fail=False):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+        time.sleep(delay)
+
+        with self.lock:
+            self.active -= 1
+
+        if fail:
+            raise GhostException(500, 'Failed: %s' % value)
+
+        return {'id': 'id-of-%s' % value, 'value': value}
+
+    def test_outputs_flow_into_dependents(self):
+        tag = self.plan.add('tag', self._operation, args=('tag',))
+        image = self.plan.add('image', self._operation, args=('image',))
+        self.plan.add('post', self._operation, kwargs={
+            'value': {'tags': [{'id': tag.id}], 'feature_image': image['value']}
+        })
+
+        result = self.plan.run()
+
+        self.assertTrue(result.succeeded)
+        self.assertEqual(result['post']['value'], {
+            'tags': [{'id': 'id-of-tag'}], 'feature_image': 'image'
+        })
+        self.assertEqual(self.peak, 2)  # tag and image ran concurrently
+        self.assertEqual(set(result.timings), set(['tag', 'image', 'post']))
+
+    def test_partial_failure(self):
+        self.plan.add('tag', self._operation, args=('tag',), kwargs={'fail': True})
+        self.plan.add('post', self._operation, args=(self.plan.ref('tag').id,))
+        self.plan.add('other', self._operation, args=('other',))
+        self.plan.add('last', self._operation, args=('last',), after=('post',))
+
+        result = self.plan.run()
+
+        self.assertFalse(result.succeeded)
+        self.assertEqual(list(result.errors), ['tag'])
+        self.assertEqual(sorted(result.skipped), ['last', 'post'])
+        self.assertEqual(result['other']['value'], 'other')
+
+    def test_invalid_plans(self):
+        self.plan.add('first', self._operation, args=(self.plan.ref('missing'),))
+
+        self.assertRaises(GhostException, self.plan.run)
+
+        cyclic = Plan(ghost=None)
+        cyclic.add('a', self._operation, args=(cyclic.ref('b'),))
+        cyclic.add('b', self._operation, args=(cyclic.ref('a'),))
+
+        self.assertRaises(GhostException, cyclic.run)
+        self.assertRaises(GhostException, cyclic.add, 'a', self._operation)
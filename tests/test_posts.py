@@ -152,6 +152,55 @@ class PostTests(GhostTestCase):
             self.assertGreater(len(posts), 0)
             self.assertIn(created.id, list(p.id for p in posts))
 
+    def test_save_changed_fields(self):
+        post = self.create_post(title='Before save', markdown='Unchanged content')
+
+        stored = self.ghost.posts.get(post.id, formats='mobiledoc,html')
+        stored.title = 'After save'
+
+        self.assertEqual(stored.changes(), {'title': 'After save'})
+
+        saved = stored.save()
+
+        self.assertIs(saved, stored)
+        self.assertEqual(saved.changes(), {})
+
+        reloaded = self.ghost.posts.get(post.id, formats='mobiledoc')
+
+        self.assertEqual(reloaded.title, 'After save')
+        self.assertEqual(reloaded.markdown, 'Unchanged content')
+
+    def test_upsert(self):
+        created = self.ghost.posts.upsert('upserted-post', title='Upserted', markdown='Version 1')
+        self._posts_to_delete.append(created.item.id)
+
+        self.assertEqual(created.action, 'created')
+
+        skipped = self.ghost.posts.upsert('upserted-post', title='Upserted', markdown='Version 1')
+
+        self.assertEqual(skipped.action, 'skipped')
+        self.assertEqual(skipped.item.id, created.item.id)
+
+        updated = self.ghost.posts.upsert('upserted-post', title='Upserted', markdown='Version 2')
+
+        self.assertEqual(updated.action, 'updated')
+        self.assertEqual(self.ghost.posts.get(created.item.id, formats='mobiledoc').markdown, 'Version 2')
+
+    def test_upsert_many(self):
+        items = [{'slug': 'upserted-many-%d' % idx, 'title': 'Upserted #%d' % idx} for idx in range(3)]
+
+        report = self.ghost.posts.upsert_many(items)
+        self._posts_to_delete.extend(post.id for post in report['created'])
+
+        self.assertEqual(len(report['created']), 3)
+
+        items[1]['title'] = 'Changed'
+
+        report = self.ghost.posts.upsert_many(items)
+
+        self.assertEqual(len(report['skipped']), 2)
+        self.assertEqual([post.title for post in report['updated']], ['Changed'])
+
     def test_invalid_post(self):
         self.assertRaises(GhostException, self.ghost.posts.create, uuid='xyz')
 
@@ -0,0 +1,106 @@
+import unittest
+
+try:
+    from .local_ghost import LocalGhostServer
+except:
+    from local_ghost import LocalGhostServer
+
+from ghost_client import Ghost
+
+
+class ProjectionTests(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalGhostServer().start()
+
+        for idx in range(5):
+            self.server.add(
+                'posts', title='Post #%d' % idx, slug='post-%d' % idx,
+                html='<p>Lorem ipsum</p>' * 100, custom_excerpt='Excerpt #%d' % idx
+            )
+
+        self.ghost = Ghost(self.server.url, admin_key=LocalGhostServer.ADMIN_KEY, version='2.0', projection=True)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _titles(self):
+        return [post.title for post in self.ghost.posts.list(limit='all')]
+
+    def test_projects_to_fields_read(self):
+        for _ in range(3):
+            self.assertEqual(len(self._titles()), 5)
+
+        fields = [path for method, path in self.server.requests if 'fields=' in path]
+
+        self.assertEqual(len(fields), 2)  # learned on the first call
+        self.assertIn('fields=created_at,id,slug,title,updated_at', fields[0])
+
+        report = list(self.ghost.projection.report().values())
+
+        self.assertEqual(len(report), 1)
+        self.assertEqual(report[0]['calls'], 3)
+        self.assertEqual(report[0]['projected_calls'], 2)
+        self.assertGreater(report[0]['reduction'], 0.8)
+
+    def test_lazy_backfill(self):
+        def listing():
+            return self.ghost.posts.list(limit='all')
+
+        self.assertEqual(len([post['title'] for post in listing()]), 5)
+
+        requests = len(self.server.requests)
+        projected = listing()
+
+        self.assertNotIn('html', projected[0])
+        self.assertEqual([post.html for post in projected], ['<p>Lorem ipsum</p>' * 100] * 5)  # fetched on access
+        self.assertEqual(len(self.server.requests), requests + 2)  # for all items at once
+
+        self.assertEqual(projected[0].custom_excerpt, self.server.resources['posts'][projected[0].id]['custom_excerpt'])
+        self.assertEqual(len(self.server.requests), requests + 3)
+
+        self.assertIsNone(projected[0].no_such_field)  # not a field of posts
+        self.assertEqual(len(self.server.requests), requests + 3)
+
+        # requested from then on
+        self.assertEqual(set(post['html'] for post in listing()), {'<p>Lorem ipsum</p>' * 100})
+        self.assertEqual(len(self.server.requests), requests + 4)
+        self.assertNotIn('no_such_field', self.server.requests[-1][1])
+
+        report = list(self.ghost.projection.report().values())[0]
+
+        self.assertEqual(report['backfills'], 2)
+        self.assertNotIn('no_such_field', report['fields'])
+
+    def test_backfill_in_chunks(self):
+        def listing():
+            return self.ghost.posts.list(limit='all')
+
+        self.ghost.projection.BACKFILL_IDS = 2
+
+        self.assertEqual(len([post['title'] for post in listing()]), 5)
+
+        projected = listing()
+        requests = len(self.server.requests)
+
+        excerpts = [post.custom_excerpt for post in projected]
+
+        self.assertEqual(len(self.server.requests), requests + 3)  # for 2, 2 and 1 items
+        self.assertEqual(sorted(excerpts), ['Excerpt #%d' % idx for idx in range(5)])
+        self.assertEqual(excerpts[0], self.server.resources['posts'][projected[0].id]['custom_excerpt'])
+
+    def test_internal_reads_are_not_learned(self):
+        for _ in range(2):
+            for post in self.ghost.posts.iterate(limit=2):
+                post.title = post.title.upper()
+                post.save()
+
+        report = list(self.ghost.projection.report().values())[0]
+
+        self.assertEqual(report['fields'], ['title'])
+
+    def test_explicit_fields_are_kept(self):
+        for _ in range(2):
+            posts = self.ghost.posts.list(fields='title', limit='all')
+            self.assertEqual(sorted(posts[0].keys()), ['title'])
+
+        self.assertEqual(self.ghost.projection.report(), {})
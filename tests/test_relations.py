@@ -0,0 +1,102 @@
+import unittest
+
+from ghost_client import GhostException
+from ghost_client.relations import RelationIndex
+
+
+class _FakePosts(object):
+    def __init__(self):
+        self.items = dict()
+        self.iterated = list()
+
+    def iterate(self, **kwargs):
+        self.iterated.append(kwargs)
+        since = kwargs.get('filter', "updated_at:>=''").split("'")[1]
+
+        return iter(sorted(
+            (post for post in self.items.values() if post['updated_at'] >= since),
+            key=lambda post: post['updated_at']
+        ))
+
+    def list(self, **kwargs):
+        return [_Item(id=id) for id in self.items]
+
+    def get(self, id, **kwargs):
+        if id not in self.items:
+            raise GhostException(404, [{'errorType': 'NotFoundError'}])
+
+        return self.items[id]
+
+
+class _Item(dict):
+    def __getattr__(self, item):
+        return self[item]
+
+
+class _FakeClient(object):
+    def __init__(self):
+        self.posts = _FakePosts()
+
+    def save(self, id, day, tags=(), author='jane', status='published'):
+        self.posts.items[id] = _Item(
+            id=id, slug=id, status=status,
+            published_at='2020-01-%02dT00:00:00.000Z' % day,
+            updated_at='2020-02-%02dT00:00:00.000Z' % len(self.posts.items),
+            tags=[{'id': 'tag-%s' % tag, 'slug': tag} for tag in tags],
+            authors=[{'id': 'user-%s' % author, 'slug': author}]
+        )
+
+
+class RelationIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.ghost = _FakeClient()
+
+        for day in range(1, 26):
+            tags = ['news'] + (['releases'] if day % 5 == 0 else [])
+            self.ghost.save('p%02d' % day, day, tags=tags, author='jane' if day % 2 else 'john')
+
+        self.ghost.save('draft', 26, tags=['news'], status='draft')
+
+        self.index = RelationIndex(self.ghost)
+
+    def _ids(self, posts):
+        return [post['id'] for post in posts]
+
+    def test_pages(self):
+        self.assertEqual(self.index.refresh(), 25)
+
+        self.assertEqual(self._ids(self.index.posts(tag='news', limit=10)), ['p%02d' % d for d in range(25, 15, -1)])
+        self.assertEqual(self._ids(self.index.posts(tag='tag-news', page=3, limit=10)), ['p%02d' % d for d in range(5, 0, -1)])
+        self.assertEqual(self.index.posts(tag='news', page=4, limit=10), [])
+
+        self.assertEqual(self._ids(self.index.posts(tag='releases')), ['p25', 'p20', 'p15', 'p10', 'p05'])
+        self.assertEqual(self.index.total(author='jane'), 13)
+        self.assertEqual(self.index.total(author='user-john'), 12)
+        self.assertEqual(self.index.total(tag='unknown'), 0)
+
+        self.assertRaises(GhostException, self.index.posts)
+        self.assertRaises(GhostException, self.index.posts, tag='news', author='jane')
+
+    def test_incremental_updates(self):
+        self.index.refresh()
+
+        self.ghost.save('p05', 5, tags=['news'])  # untagged from releases
+        self.ghost.save('draft', 27, tags=['releases'], status='published')
+
+        self.assertEqual(self.index.refresh(), 2)
+        self.assertEqual(self.ghost.posts.iterated[-1]['filter'], "updated_at:>='2020-02-25T00:00:00.000Z'")
+
+        self.assertEqual(self._ids(self.index.posts(tag='releases')), ['draft', 'p25', 'p20', 'p15', 'p10'])
+
+        self.ghost.save('p25', 25, tags=['news'], status='draft')
+        self.index.invalidate('posts', 'p25')
+
+        self.assertEqual(self._ids(self.index.posts(tag='releases')), ['draft', 'p20', 'p15', 'p10'])
+
+        del self.ghost.posts.items['p20']
+        self.index.invalidate('posts', 'p20')
+        del self.ghost.posts.items['p15']
+
+        self.assertEqual(self.index.prune(), 1)
+        self.assertEqual(self._ids(self.index.posts(tag='releases')), ['draft', 'p10'])
+        self.assertEqual(len(self.index), 23)
@@ -0,0 +1,151 @@
+import threading
+import time
+import unittest
+
+from ghost_client import GhostException
+from ghost_client.scheduler import Scheduler
+
+
+class SchedulerTests(unittest.TestCase):
+    def test_interactive_jumps_the_queue(self):
+        scheduler = Scheduler(classes=(('interactive', 1), ('background', 1)), max_concurrency=1)
+        order = list()
+        blocker = threading.Event()
+
+        def request(label):
+            order.append(label)
+
+            if label == 'first':
+                blocker.wait()
+
+        def send(priority, label):
+            with scheduler.priority(priority):
+                scheduler.call(request, label)
+
+        threads = [threading.Thread(target=send, args=('background', 'first'))]
+        threads[0].start()
+        time.sleep(0.05)
+
+        for idx in range(3):
+            threads.append(threading.Thread(target=send, args=('background', 'background-%d' % idx)))
+            threads[-1].start()
+
+        time.sleep(0.05)
+
+        threads.append(threading.Thread(target=send, args=('interactive', 'interactive')))
+        threads[-1].start()
+        time.sleep(0.05)
+
+        blocker.set()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(order[:2], ['first', 'interactive'])
+        self.assertEqual(len(order), 5)
+
+        wait = scheduler.metrics.timing('scheduler.wait', priority='background')
+
+        self.assertEqual(wait['count'], 4)
+        self.assertGreater(wait['max'], 0.05)
+
+    def test_concurrency_per_class(self):
+        scheduler = Scheduler(classes=(('interactive', 4), ('background', 2)))
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+
+        def request():
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+
+            time.sleep(0.02)
+
+            with lock:
+                state['running'] -= 1
+
+        def send():
+            with scheduler.priority('background'):
+                scheduler.call(request)
+
+        threads = [threading.Thread(target=send) for _ in range(8)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(state['peak'], 2)
+
+    def test_waiting_requests_in_order(self):
+        scheduler = Scheduler(classes=(('interactive', 1), ('background', 1)), max_concurrency=1)
+        order = list()
+        blocker = threading.Event()
+
+        def request(label):
+            order.append(label)
+
+            if label == 'first':
+                blocker.wait()
+
+        threads = [threading.Thread(target=scheduler.call, args=(request, 'first'))]
+        threads[0].start()
+        time.sleep(0.05)
+
+        for idx in range(10):
+            threads.append(threading.Thread(target=scheduler.call, args=(request, idx)))
+            threads[-1].start()
+            time.sleep(0.01)
+
+        self.assertEqual(scheduler.metrics.snapshot()['scheduler.queued{priority=interactive}'], 10)
+
+        blocker.set()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(order, ['first'] + list(range(10)))
+        self.assertEqual(scheduler.metrics.snapshot()['scheduler.queued{priority=interactive}'], 0)
+
+    def test_unknown_priority(self):
+        scheduler = Scheduler()
+
+        with self.assertRaises(GhostException):
+            with scheduler.priority('urgent'):
+                pass
+
+    def test_per_host_limit(self):
+        scheduler = Scheduler(per_host=1)
+        running = {'slow': 0, 'fast': 0}
+        peak = {'slow': 0, 'fast': 0}
+        lock = threading.Lock()
+
+        def request(host):
+            with lock:
+                running[host] += 1
+                peak[host] = max(peak[host], running[host])
+
+            time.sleep(0.05)
+
+            with lock:
+                running[host] -= 1
+
+        threads = [
+            threading.Thread(target=scheduler.host(host).call, args=(request, host))
+            for host in ('slow', 'slow', 'slow', 'fast')
+        ]
+
+        started = time.time()
+
+        for thread in threads:
+            thread.start()
+
+        threads[-1].join()
+        fast_done = time.time() - started
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(peak, {'slow': 1, 'fast': 1})
+        self.assertLess(fast_done, 0.1)  # not queued behind the slow host
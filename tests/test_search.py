@@ -0,0 +1,108 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from ghost_client import GhostException
+from ghost_client.search import SearchIndex
+
+
+class _FakePosts(object):
+    def __init__(self):
+        self.items = dict()
+        self.iterated = list()
+
+    def iterate(self, **kwargs):
+        self.iterated.append(kwargs)
+        since = kwargs.get('filter', "updated_at:>=''").split("'")[1]
+
+        return iter(sorted(
+            (post for post in self.items.values() if post['updated_at'] >= since),
+            key=lambda post: post['updated_at']
+        ))
+
+    def list(self, **kwargs):
+        return [_Item(id=id) for id in self.items]
+
+    def get(self, id, **kwargs):
+        if id not in self.items:
+            raise GhostException(404, [{'errorType': 'NotFoundError'}])
+
+        return self.items[id]
+
+
+class _Item(dict):
+    def __getattr__(self, item):
+        return self[item]
+
+
+class _FakeClient(object):
+    def __init__(self):
+        self.posts = _FakePosts()
+
+    def save(self, id, updated_at, **post):
+        post.update(id=id, slug=id, updated_at=updated_at)
+        post.setdefault('status', 'published')
+        self.posts.items[id] = post
+
+
+class SearchIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.ghost = _FakeClient()
+
+        self.ghost.save('p1', '2020-01-01T00:00:00.000Z', title='Release notes for 2.0',
+                        plaintext='Many bug fixes', tags=[{'name': 'Releases'}])
+        self.ghost.save('p2', '2020-01-02T00:00:00.000Z', title='Hiring',
+                        plaintext='We are looking for release engineers')
+        self.ghost.save('p3', '2020-01-03T00:00:00.000Z', title='Draft release', status='draft')
+
+        self.index = SearchIndex(self.ghost, os.path.join(self.directory, 'search.db'))
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.directory)
+
+    def test_ranked_search(self):
+        self.assertEqual(self.index.refresh(), 3)
+
+        hits = self.index.search('release')
+
+        self.assertEqual([hit.id for hit in hits], ['p1', 'p2'])  # title first, no drafts
+        self.assertIn('[release]', hits[1].snippet)
+
+        self.assertEqual([hit.id for hit in self.index.search('rel')], ['p1', 'p2'])  # prefix
+        self.assertEqual([hit.id for hit in self.index.search('releases bug')], ['p1'])
+        self.assertEqual(self.index.search('"; DROP TABLE'), [])
+        self.assertEqual(self.index.search('  '), [])
+
+    def test_incremental_updates(self):
+        self.index.refresh()
+
+        self.ghost.save('p2', '2020-01-05T00:00:00.000Z', title='Hiring', plaintext='Now hiring designers')
+
+        self.assertEqual(self.index.refresh(), 2)  # p2 and p3 updated at the last cursor
+        self.assertEqual(self.ghost.posts.iterated[-1]['filter'], "updated_at:>='2020-01-03T00:00:00.000Z'")
+        self.assertEqual([hit.id for hit in self.index.search('release')], ['p1'])
+        self.assertEqual([hit.id for hit in self.index.search('designers')], ['p2'])
+
+    def test_deletions(self):
+        self.index.refresh()
+
+        del self.ghost.posts.items['p1']
+        self.index.invalidate('posts', id='p1')
+
+        self.assertEqual([hit.id for hit in self.index.search('release')], ['p2'])
+
+        del self.ghost.posts.items['p2']
+
+        self.assertEqual(self.index.prune(), 1)
+        self.assertEqual(len(self.index), 1)
+
+    def test_persistent(self):
+        self.index.add(self.ghost.posts.get('p1'))
+        self.index.close()
+
+        self.index = SearchIndex(self.ghost, os.path.join(self.directory, 'search.db'))
+
+        self.assertEqual([hit.id for hit in self.index.search('notes')], ['p1'])
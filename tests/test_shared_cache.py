@@ -0,0 +1,164 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+try:
+    from .local_ghost import LocalGhostServer
+except:
+    from local_ghost import LocalGhostServer
+
+from ghost_client import Ghost, GhostException
+from ghost_client.shared_cache import SharedResponseCache
+
+
+def _response(type_name, *items):
+    data = {type_name: list(items)}
+    return json.dumps(data), data
+
+
+class SharedResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _cache(self, **kwargs):
+        kwargs.setdefault('size', 64 * 1024)
+        kwargs.setdefault('slots', 64)
+
+        cache = SharedResponseCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+
+        return cache
+
+    def test_shared_between_instances(self):
+        first, second = self._cache(), self._cache()
+
+        body, data = _response('posts', {'id': 'p1', 'slug': 'first', 'tags': [{'id': 't1'}]})
+        first.set('url-1', 'posts/', body, data)
+
+        self.assertEqual(second.get('url-1'), data)
+        self.assertIsNone(second.get('url-2'))
+        self.assertEqual(len(second), 1)
+
+        second.invalidate('tags', id='t1')  # a related resource changed
+
+        self.assertIsNone(first.get('url-1'))
+
+        self.assertRaises(GhostException, SharedResponseCache, self.path, size=128 * 1024, slots=64)
+
+    def test_invalidate_from_the_table(self):
+        cache = self._cache()
+
+        cache.set('post', 'posts/p1/', *_response('posts', {'id': 'p1', 'slug': 'first'}))
+        cache.set('tags', 'tags/', *_response('tags', {'id': 't1', 'slug': 'news'}))
+        cache.set('other', 'posts/slug/second/', *_response('posts', {'id': 'p2', 'slug': 'second'}))
+
+        def fail(*args, **kwargs):
+            raise AssertionError('read a response')
+
+        cache._read_record = fail  # the responses are never read
+        cache.invalidate('posts', id='p1')
+        del cache._read_record
+
+        self.assertIsNone(cache.get('post'))
+        self.assertIsNotNone(cache.get('tags'))
+        self.assertIsNotNone(cache.get('other'))
+
+        cache.invalidate('tags', slug='news')
+
+        self.assertIsNone(cache.get('tags'))
+        self.assertIsNotNone(cache.get('other'))
+
+    def test_shared_between_processes(self):
+        cache = self._cache()
+        body, data = _response('tags', {'id': 't1', 'name': 'From the child'})
+
+        pid = os.fork()
+
+        if pid == 0:  # pragma: no cover
+            try:
+                cache.set('url', 'tags/', body, data)
+            finally:
+                os._exit(0)
+
+        os.waitpid(pid, 0)
+
+        self.assertEqual(cache.get('url'), data)
+
+    def test_expiry_and_eviction(self):
+        cache = self._cache(ttl=0)
+        cache.set('url', 'tags/', *_response('tags', {'id': 't1'}))
+
+        self.assertIsNone(cache.get('url'))
+
+        cache = SharedResponseCache(os.path.join(self.directory, 'small'), size=8 * 1024, slots=8)
+        self.addCleanup(cache.close)
+
+        for idx in range(8):
+            cache.set('url-%d' % idx, 'tags/', *_response('tags', {'id': 't%d' % idx}))
+
+        cache.get('url-0')  # recently used
+        cache.set('url-8', 'tags/', *_response('tags', {'id': 't8'}))
+
+        self.assertIsNotNone(cache.get('url-0'))
+        self.assertIsNone(cache.get('url-1'))  # the least recently used one
+        self.assertEqual(len(cache), 8)
+
+        for idx in range(9, 40):  # overwrites the oldest responses in the ring
+            cache.set('url-%d' % idx, 'tags/', *_response('tags', {'id': 't%d' % idx, 'name': 'x' * 400}))
+
+        self.assertIsNone(cache.get('url-0'))
+        self.assertIsNotNone(cache.get('url-39'))
+
+    def test_concurrent_reads_and_writes(self):
+        cache = self._cache(size=16 * 1024, slots=16)
+        errors = list()
+
+        def write(worker):
+            for idx in range(300):
+                cache.set('url-%d' % (idx % 20), 'tags/',
+                          *_response('tags', {'id': 't%d' % (idx % 20), 'name': str(worker) * (idx % 50)}))
+
+        def read():
+            for idx in range(3000):
+                data = cache.get('url-%d' % (idx % 20))
+
+                if data is not None and data['tags'][0]['id'] != 't%d' % (idx % 20):
+                    errors.append(data)
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(2)]
+        threads += [threading.Thread(target=read) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+
+    def test_clients_share_responses(self):
+        server = LocalGhostServer().start()
+
+        try:
+            server.add('tags', name='Shared')
+
+            clients = [
+                Ghost(server.url, admin_key=LocalGhostServer.ADMIN_KEY, version='2.0', cache=self._cache())
+                for _ in range(2)
+            ]
+
+            self.assertEqual(clients[0].tags.list()[0].name, 'Shared')
+            requests = len(server.requests)
+
+            self.assertEqual(clients[1].tags.list()[0].name, 'Shared')
+            self.assertEqual(len(server.requests), requests)
+
+        finally:
+            server.stop()
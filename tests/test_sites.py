@@ -0,0 +1,102 @@
+import threading
+import unittest
+
+try:
+    from .local_ghost import LocalGhostServer
+except:
+    from local_ghost import LocalGhostServer
+
+from ghost_client import GhostException
+from ghost_client.sites import SiteManager
+
+
+class SiteManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.fast = LocalGhostServer().start()
+        self.slow = LocalGhostServer(latency=0.2).start()
+
+        for server in (self.fast, self.slow):
+            for idx in range(3):
+                server.add('posts', title='Post #%d' % idx, slug='post-%d' % idx)
+
+        self.sites = SiteManager(per_host=1)
+        self.sites.add('fast', self.fast.url, admin_key=LocalGhostServer.ADMIN_KEY)
+        self.sites.add('slow', self.slow.url, admin_key=LocalGhostServer.ADMIN_KEY)
+
+    def tearDown(self):
+        self.fast.stop()
+        self.slow.stop()
+
+    def test_clients_are_created_lazily(self):
+        self.assertEqual(len(self.sites), 2)
+        self.assertEqual(self.fast.requests, [])
+
+        client = self.sites['fast']
+
+        self.assertIs(client, self.sites.get('fast'))
+        self.assertIs(client.transport, self.sites['slow'].transport)
+        self.assertEqual(len(client.posts.list()), 3)
+
+        with self.assertRaises(GhostException) as context:
+            self.sites.get('unknown')
+
+        self.assertEqual(context.exception.code, 404)
+
+    def test_fan_out_streams_results(self):
+        self.sites.add('broken', 'http://127.0.0.1:1', admin_key=LocalGhostServer.ADMIN_KEY)
+
+        results = list(self.sites.fan_out('posts.list', kwargs={'limit': 2}))
+
+        self.assertEqual(set(r.site for r in results), {'fast', 'slow', 'broken'})
+        self.assertEqual(results[-1].site, 'slow')  # arrived last
+
+        by_site = dict((r.site, r) for r in results)
+
+        self.assertEqual(len(by_site['fast'].result), 2)
+        self.assertIsNone(by_site['fast'].error)
+        self.assertIsNotNone(by_site['broken'].error)
+
+        titles = list(self.sites.fan_out(
+            lambda ghost, slug: ghost.posts.get(slug=slug).title, args=('post-1',), sites=('fast', 'slow')
+        ))
+
+        self.assertEqual(set(r.result for r in titles), {'Post #1'})
+
+    def test_per_host_cap(self):
+        self.sites['slow'].posts.list()  # authenticate first
+
+        threads = [threading.Thread(target=self.sites['slow'].posts.list) for _ in range(3)]
+
+        for thread in threads:
+            thread.start()
+
+        self.assertEqual(len(self.sites['fast'].posts.list()), 3)
+        self.assertTrue(any(thread.is_alive() for thread in threads))  # not queued behind the slow site
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.slow.peak_requests, 1)  # one request at a time
+
+    def test_fan_out_is_not_capped_globally(self):
+        servers = [LocalGhostServer(latency=0.1).start() for _ in range(12)]
+
+        try:
+            sites = SiteManager(per_host=2, workers=16)
+
+            for idx, server in enumerate(servers):
+                sites.add('site-%d' % idx, server.url, admin_key=LocalGhostServer.ADMIN_KEY)
+
+            results = list(sites.fan_out('posts.list'))
+
+            self.assertEqual([r.error for r in results], [None] * 12)
+
+            spans = [span for server in servers for span in server.spans]
+            peak = max(sum(1 for s, e in spans if s <= started < e) for started, _ in spans)
+
+            self.assertGreater(peak, 8)  # the default interactive class limit of a `Scheduler`
+            self.assertLessEqual(max(server.peak_requests for server in servers), 2)
+
+        finally:
+            for server in servers:
+                server.stop()
@@ -104,5 +104,20 @@ class TagTests(GhostTestCase):
 
         self.assertIsNone(last.next_page())
 
+    def test_keyset_iteration(self):
+        created = set()
+
+        for idx in range(10):
+            created.add(self.create_tag(name='Iterated tag #%d' % idx).id)
+
+        seen = [tag.id for tag in self.ghost.tags.iterate(limit=3, fields='id')]
+
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertTrue(created.issubset(seen))
+
+        ascending = [tag.id for tag in self.ghost.tags.iterate(limit=4, descending=False)]
+
+        self.assertEqual(list(reversed(ascending)), seen)
+
     def test_invalid_tag(self):
         self.assertRaises(GhostException, self.ghost.tags.create, uuid='xyz', created_at='xyz', name='Invalid Tag')
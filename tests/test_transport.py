@@ -0,0 +1,89 @@
+import socket
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+try:
+    from .local_ghost import LocalGhostServer, LocalHTTP2GhostServer, h2
+except:
+    from local_ghost import LocalGhostServer, LocalHTTP2GhostServer, h2
+
+from ghost_client import Ghost
+from ghost_client.transport import RequestsTransport
+
+
+@unittest.skipIf(h2 is None, 'needs httpx[http2]')
+class HTTP2TransportTests(unittest.TestCase):
+    def setUp(self):
+        from ghost_client.transport import HTTPXTransport
+
+        self.server = LocalHTTP2GhostServer(latency=0.2).start()
+
+        for idx in range(16):
+            self.server.add('posts', title='Post #%d' % idx, slug='post-%d' % idx)
+
+        self.ghost = Ghost(
+            self.server.url, admin_key=LocalGhostServer.ADMIN_KEY, version='2.0',
+            transport=HTTPXTransport(http1=False)
+        )
+
+    def tearDown(self):
+        self.ghost.transport.close()
+        self.server.stop()
+
+    def test_multiplexed_requests(self):
+        self.assertEqual(len(self.ghost.posts.list(limit=2)), 2)  # authenticate first
+
+        started = time.time()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            pages = list(pool.map(lambda page: self.ghost.posts.list(limit=2, page=page), range(1, 9)))
+
+        elapsed = time.time() - started
+
+        self.assertEqual(sorted(post.slug for page in pages for post in page),
+                         sorted('post-%d' % idx for idx in range(16)))
+        self.assertEqual(self.server.connections, 1)
+        self.assertGreaterEqual(self.server.peak_streams, 4)
+        self.assertLess(elapsed, 0.2 * 4)
+
+    def test_writes_and_metrics(self):
+        post = self.ghost.posts.create(title='Over HTTP/2', markdown='Hello')
+        updated = self.ghost.posts.update(post.id, title='Updated over HTTP/2')
+        self.ghost.posts.delete(post.id)
+
+        self.assertEqual(updated.title, 'Updated over HTTP/2')
+        self.assertGreater(self.ghost.metrics.counter('transfer.sent', stage='wire'), 0)
+        self.assertGreater(self.ghost.metrics.counter('transfer.received', stage='wire'), 0)
+
+    def test_connection_errors(self):
+        from ghost_client.transport import HTTPXTransport
+
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        port = listener.getsockname()[1]
+        listener.close()
+
+        ghost = Ghost('http://127.0.0.1:%d' % port, version='2', transport=HTTPXTransport())
+
+        self.assertRaises(requests.ConnectionError, ghost.tags.list)
+
+
+class DefaultTransportTests(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalGhostServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_requests_by_default(self):
+        ghost = Ghost(self.server.url, admin_key=LocalGhostServer.ADMIN_KEY, version='2.0', pool_size=3)
+
+        self.assertIsInstance(ghost.transport, RequestsTransport)
+        self.assertEqual(ghost.transport.pool_size, 3)
+
+        tag = ghost.tags.create(name='Default transport')
+
+        self.assertEqual(ghost.tags.get(tag.id).name, 'Default transport')
@@ -0,0 +1,97 @@
+import hashlib
+import hmac
+import json
+import unittest
+
+from six.moves.urllib.request import Request, urlopen
+from six.moves.urllib.error import HTTPError
+
+from ghost_client.cache import ResponseCache
+from ghost_client.webhooks import WebhookReceiver
+
+
+class WebhookTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache(ttl=3600)
+        self.received = list()
+
+        self.receiver = WebhookReceiver(secret='testing')
+        self.receiver.subscribe(self.cache.invalidate)
+        self.receiver.subscribe(lambda *args, **kwargs: self.received.append((args, kwargs)))
+        self.receiver.start()
+
+        self._store('posts/', {'posts': [
+            {'id': 'p1', 'slug': 'first', 'tags': [{'id': 't1', 'slug': 'news'}]},
+            {'id': 'p2', 'slug': 'second'}
+        ]})
+        self._store('posts/p1/', {'posts': [{'id': 'p1', 'slug': 'first'}]})
+        self._store('posts/slug/second/', {'posts': [{'id': 'p2', 'slug': 'second'}]})
+        self._store('tags/', {'tags': [{'id': 't1', 'slug': 'news'}]})
+
+    def tearDown(self):
+        self.receiver.stop()
+
+    def _store(self, resource, data):
+        self.cache.set(resource, resource, json.dumps(data), data)
+
+    def _send(self, event, payload, secret='testing'):
+        body = json.dumps(payload).encode('utf-8')
+        signature = hmac.new(secret.encode('utf-8'), body + b'1234', hashlib.sha256).hexdigest()
+
+        request = Request(
+            '%s/%s' % (self.receiver.url, event), data=body,
+            headers={'Content-Type': 'application/json',
+                     'X-Ghost-Signature': 'sha256=%s, t=1234' % signature}
+        )
+
+        try:
+            return urlopen(request).getcode()
+
+        except HTTPError as ex:
+            return ex.code
+
+    def test_post_edited(self):
+        status = self._send('post.edited', {'post': {
+            'current': {'id': 'p2', 'slug': 'second', 'title': 'Changed'},
+            'previous': {'title': 'Original'}
+        }})
+
+        self.assertEqual(status, 204)
+        self.assertEqual(self.received, [(('posts',), {'id': 'p2', 'slug': 'second'})])
+
+        self.assertIsNone(self.cache.get('posts/'))
+        self.assertIsNone(self.cache.get('posts/slug/second/'))
+        self.assertIsNotNone(self.cache.get('posts/p1/'))
+        self.assertIsNotNone(self.cache.get('tags/'))
+
+    def test_changed_slug(self):
+        self._send('post.edited', {'post': {
+            'current': {'id': 'p3', 'slug': 'renamed'},
+            'previous': {'slug': 'second'}
+        }})
+
+        self.assertIsNone(self.cache.get('posts/slug/second/'))
+        self.assertIsNotNone(self.cache.get('posts/p1/'))
+
+    def test_tag_deleted(self):
+        self._send('tag.deleted', {'tag': {
+            'current': {},
+            'previous': {'id': 't1', 'slug': 'news'}
+        }})
+
+        self.assertIsNone(self.cache.get('tags/'))
+        self.assertIsNone(self.cache.get('posts/'))  # included the tag
+        self.assertIsNotNone(self.cache.get('posts/p1/'))
+
+    def test_site_changed(self):
+        self._send('site.changed', {})
+
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.received, [((), {})])
+
+    def test_invalid_signature(self):
+        status = self._send('post.edited', {'post': {'current': {'id': 'p1'}}}, secret='wrong')
+
+        self.assertEqual(status, 401)
+        self.assertEqual(self.received, [])
+        self.assertEqual(len(self.cache), 4)